@@ -0,0 +1,65 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import typing
+from timeit import Timer
+
+from dmmd.client import CHUNK_SIZE, json_loads
+from dmmd.streaming import ArrayScanner
+from dmmd.icdn._typing import DATA_MODEL, DATA_MODELS, RECORD_FIELDS, DataModel, DataRecord
+
+from benchmarks.server import make_items
+
+# Synthetic payloads
+def make_payload(size: int, seed: int = 0) -> bytes:
+    return json.dumps(make_items(size, seed)).encode()
+
+# The body is fed in network-sized chunks, the way BuiltCallable.stream() receives it
+def streamed(body: bytes) -> typing.Iterator[DataModel]:
+    scanner = ArrayScanner()
+    for offset in range(0, len(body), CHUNK_SIZE):
+        for element in scanner.feed(body[offset:offset + CHUNK_SIZE]):
+            yield DATA_MODEL.validate_python(element)
+
+    scanner.close()
+
+# Decoders
+DECODERS = {
+    "per-item (baseline)": lambda body: [DataModel(**item) for item in json.loads(body)],
+    "type adapter":        lambda body: DATA_MODELS.validate_json(body),
+    "raw records":         lambda body: [DataRecord(*RECORD_FIELDS(item)) for item in json_loads(body)],
+    "streamed":            lambda body: [*streamed(body)],
+}
+
+# Whole-body decoders can't hand anything out until they're done, streaming only needs the first chunk
+def first_item(body: bytes) -> tuple[float, float]:
+    whole, stream = Timer(lambda: DATA_MODELS.validate_json(body)), Timer(lambda: next(streamed(body)))
+    return min(whole.repeat(5, 1)), min(stream.repeat(5, 1))
+
+def measure(body: bytes, decoder: str) -> float:
+    timer = Timer(lambda: DECODERS[decoder](body))
+    loops, _ = timer.autorange()
+    return min(timer.repeat(5, loops)) / loops
+
+def run(sizes: list[int] = [100, 1_000, 10_000]) -> list[dict]:
+    results = []
+    for size in sizes:
+        body = make_payload(size)
+        baseline = measure(body, "per-item (baseline)")
+        for decoder in DECODERS:
+            seconds = baseline if decoder == "per-item (baseline)" else measure(body, decoder)
+            results.append({"items": size, "decoder": decoder, "seconds": seconds, "speedup": baseline / seconds})
+
+    return results
+
+if __name__ == "__main__":
+    print(f"JSON decoder: {json_loads.__module__}\n")
+    print(f"{'items':>7}  {'decoder':<20} {'ms/page':>10} {'speedup':>8}")
+    for result in run():
+        print(f"{result['items']:>7}  {result['decoder']:<20} {result['seconds'] * 1000:>10.3f} {result['speedup']:>7.2f}x")
+
+    print(f"\n{'items':>7}  {'first item, whole page':>22} {'first item, streamed':>21}")
+    for size in [100, 1_000, 10_000]:
+        whole, stream = first_item(make_payload(size))
+        print(f"{size:>7}  {whole * 1000:>20.3f}ms {stream * 1000:>19.3f}ms")
@@ -0,0 +1,50 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from statistics import median
+
+# Modules the CLI must not import before a command actually needs them
+DEFERRED = ["aiohttp", "pydantic", "humanize", "mimetypes", "yarl", "dmmd.client", "dmmd.icdn._service"]
+
+def measure(module: str) -> tuple[int, list[str]]:
+    script = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output = True, text = True, check = True,
+        cwd = Path(__file__).parent.parent
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in process.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative), process.stdout.split()
+
+    raise RuntimeError(f"{module} did not show up in -X importtime output!")
+
+def check(module: str, budget: float, runs: int) -> bool:
+    timings, loaded = [], []
+    for _ in range(runs):
+        microseconds, loaded = measure(module)
+        timings.append(microseconds / 1000)
+
+    eager = [name for name in DEFERRED if name in loaded]
+    took = median(timings)
+    print(f"{module}: {took:.1f}ms median over {runs} runs (budget {budget:.1f}ms)")
+    for name in eager:
+        print(f"  {name} is imported eagerly")
+
+    return took <= budget and not eager
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Fail if importing the CLI exceeds its startup budget.")
+    parser.add_argument("--module", default = "dmmd.icdn.cli.__main__")
+    parser.add_argument("--budget", type = float, default = 75.0, help = "milliseconds of cumulative import time allowed")
+    parser.add_argument("--runs", type = int, default = 5)
+    options = parser.parse_args()
+
+    sys.exit(0 if check(options.module, options.budget, options.runs) else 1)
@@ -0,0 +1,207 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import random
+import asyncio
+import argparse
+from uuid import uuid4
+from time import time
+
+from aiohttp import web
+
+# Synthetic datasets
+def make_items(size: int, seed: int = 0) -> list[dict]:
+    generator = random.Random(seed)
+    return [
+        {
+            "data": {"source": f"https://example.com/{index}", "index": index},
+            "mime": generator.choice(["image/png", "image/jpeg", "video/mp4", "text/plain"]),
+            "name": f"item {index}",
+            "size": generator.randrange(1, 50_000_000),
+            "tags": generator.sample(["anime", "game", "2024", "2025", "nsfw", "music", "art"], 3),
+            "time": 1_700_000_000_000 + index * 1000,
+            "uuid": f"{index:08x}-0000-4000-8000-000000000000"
+        }
+        for index in range(size)
+    ]
+
+def make_data(size: int, seed: int = 0) -> dict[str, list[dict]]:
+    generator = random.Random(seed)
+    anime = [
+        {
+            "begin": "2020-01-01", "comment": None, "end": None, "id": f"a{index}", "name": f"anime {index}",
+            "rating": generator.randrange(0, 100) / 10, "tags": generator.sample([f"t{n}" for n in range(20)], 4),
+            "title": f"Anime {index}", "wiki": f"https://example.com/wiki/{index}"
+        }
+        for index in range(size)
+    ]
+    return {
+        "tags": [{"id": f"t{index}", "name": f"tag {index}"} for index in range(20)],
+        "anime": anime,
+        "games": [item | {"id": f"g{index}", "users": ["someone"]} for index, item in enumerate(anime)]
+    }
+
+# Stand-in server, mimicking the iCDN, Static and Data APIs closely enough to benchmark against
+def build_app(items: int = 10_000, file_size: int = 1024 ** 2, latency: float = 0.0, seed: int = 0) -> web.Application:
+    dataset = {item["uuid"]: item for item in make_items(items, seed)}
+    data = {name: json.dumps(values).encode() for name, values in make_data(max(items // 10, 1), seed).items()}
+    body = random.Random(seed).randbytes(file_size)
+    etag = f'"{seed}-{file_size}"'
+
+    @web.middleware
+    async def delay(request: web.Request, handler) -> web.StreamResponse:
+        if latency:
+            await asyncio.sleep(latency)
+
+        return await handler(request)
+
+    def error(code: str, message: str) -> web.Response:
+        return web.json_response({"code": code, "message": message}, status = 400)
+
+    def page(request: web.Request, values: list[dict]) -> web.Response:
+        count, number = int(request.query.get("count", 25)), int(request.query.get("page", 0))
+        values = values[count * number:count * (number + 1)]
+        return web.json_response(values if request.query.get("query") == "true" else [item["uuid"] for item in values])
+
+    # Range and conditional requests are answered like a static file server would, for segmented downloads and revalidation
+    def body_response(request: web.Request) -> web.Response:
+        headers = {"Accept-Ranges": "bytes", "ETag": etag}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status = 304, headers = headers)
+
+        try:
+            window = request.http_range
+
+        except ValueError:
+            window = slice(len(body), None)
+
+        if window.start is None and window.stop is None or request.headers.get("If-Range", etag) != etag:
+            return web.Response(body = body, content_type = "application/octet-stream", headers = headers)
+
+        start, stop, _ = window.indices(len(body))
+        if start >= len(body) or start >= stop:
+            return web.Response(status = 416, headers = headers | {"Content-Range": f"bytes */{len(body)}"})
+
+        return web.Response(
+            status = 206, body = body[start:stop], content_type = "application/octet-stream",
+            headers = headers | {"Content-Range": f"bytes {start}-{stop - 1}/{len(body)}"}
+        )
+
+    async def query(request: web.Request) -> web.Response:
+        item = dataset.get(request.match_info["uuid"])
+        return web.json_response(item) if item else error("INVALID_UUID", "The specified UUID does not exist.")
+
+    async def file(request: web.Request) -> web.Response:
+        if request.match_info["uuid"] not in dataset:
+            return error("INVALID_UUID", "The specified UUID does not exist.")
+
+        return body_response(request)
+
+    async def listing(request: web.Request) -> web.Response:
+        return page(request, [*dataset.values()])
+
+    async def search(request: web.Request) -> web.Response:
+        tags = [tag for tag in request.query.get("tags", "").split(",") if tag]
+        begin, end = int(request.query.get("begin", 0)), int(request.query.get("end", 2 ** 63))
+        values = [item for item in dataset.values() if all(tag in item["tags"] for tag in tags) and begin <= item["time"] <= end]
+        values.sort(key = lambda item: item[request.query.get("sort", "time")], reverse = request.query.get("order") != "ascending")
+        return page(request, values)
+
+    async def write(request: web.Request, update: bool) -> web.Response:
+        received, fields = None, {}
+        if request.content_type != "multipart/form-data":
+            fields = json.loads((await request.post()).get("json", "{}"))  # type: ignore  # Forms without a file aren't multipart
+
+        else:
+            async for part in await request.multipart():
+                if part.name == "file":
+                    received = 0
+                    while chunk := await part.read_chunk(1024 ** 2):  # type: ignore
+                        received += len(chunk)
+
+                else:
+                    fields = json.loads(await part.text())  # type: ignore
+
+        uuid = fields.get("uuid") if update else str(uuid4())
+        if uuid not in dataset and update:
+            return error("INVALID_UUID", "The specified UUID does not exist.")
+
+        item = dataset.get(uuid, {"data": {}, "mime": "application/octet-stream", "name": "", "size": 0, "tags": [], "uuid": uuid})
+        item = item | {key: fields[key] for key in ["data", "name", "tags"] if key in fields} | {
+            "size": item["size"] if received is None else received,
+            "time": fields.get("time", round(time() * 1000))
+        }
+        dataset[uuid] = item
+        return web.json_response(item)
+
+    async def add(request: web.Request) -> web.Response:
+        return await write(request, False)
+
+    async def update(request: web.Request) -> web.Response:
+        return await write(request, True)
+
+    async def remove(request: web.Request) -> web.Response:
+        fields = json.loads((await request.post()).get("json", "{}"))  # type: ignore
+        item = dataset.pop(fields.get("uuid", ""), None)
+        return web.json_response(item) if item else error("INVALID_UUID", "The specified UUID does not exist.")
+
+    async def details(request: web.Request) -> web.Response:
+        return web.json_response({
+            "fileLimit": 1024 ** 3, "storeLimit": 1024 ** 4, "storeLength": len(dataset),
+            "storeSize": sum(item["size"] for item in dataset.values()), "protected": False
+        })
+
+    async def directory(request: web.Request) -> web.Response:
+        return web.json_response([f"file-{index}.bin" for index in range(100)])
+
+    async def static(request: web.Request) -> web.Response:
+        return body_response(request)
+
+    async def dataset_file(request: web.Request) -> web.Response:
+        return web.Response(body = data[request.match_info["name"]], content_type = "application/json")
+
+    app = web.Application(middlewares = [delay], client_max_size = 1024 ** 4)
+    app.router.add_get("/query/{uuid}", query)
+    app.router.add_get("/file/{uuid}", file)
+    app.router.add_get("/list", listing)
+    app.router.add_get("/search", search)
+    app.router.add_post("/add", add)
+    app.router.add_post("/update", update)
+    app.router.add_post("/remove", remove)
+    app.router.add_get("/details", details)
+    app.router.add_get("/d/{path:.*}", directory)
+    app.router.add_get("/f/{path:.*}", static)
+    app.router.add_get("/api/data/{name:tags|anime|games}", dataset_file)
+    return app
+
+async def serve(host: str, port: int, **options) -> None:
+    runner = web.AppRunner(build_app(**options), access_log = None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+
+    # The bound address is announced on stdout, so the suite can use port 0
+    host, port = runner.addresses[0][:2]
+    print(f"http://{host}:{port}", flush = True)
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Local stand-in for the iCDN, Static and Data APIs.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 0)
+    parser.add_argument("--items", type = int, default = 10_000, help = "number of synthetic iCDN items")
+    parser.add_argument("--file-size", type = int, default = 1024 ** 2, help = "size of every file body in bytes")
+    parser.add_argument("--latency", type = float, default = 0.0, help = "seconds added to every response")
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, items = args.items, file_size = args.file_size, latency = args.latency, seed = args.seed))
+
+    except KeyboardInterrupt:
+        pass
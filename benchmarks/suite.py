@@ -0,0 +1,253 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import sys
+import json
+import typing
+import asyncio
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from time import perf_counter
+from dataclasses import dataclass, field
+
+import aiohttp
+import pydantic
+
+from dmmd import __version__
+from dmmd.pool import SessionPool
+from dmmd.data import Data
+from dmmd.icdn import iCDN
+from dmmd.static import Static
+from dmmd.client import json_loads
+
+from benchmarks import decoding
+
+# Results
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered) + 0.5) - 1))] if ordered else 0.0
+
+@dataclass
+class Result:
+    scenario:   str
+    operations: int
+    seconds:    float
+    latencies:  list[float] = field(default_factory = list, repr = False)
+    bytes:      int         = 0
+
+    def summary(self) -> dict:
+        return {
+            "scenario":         self.scenario,
+            "operations":       self.operations,
+            "seconds":          self.seconds,
+            "throughput":       self.operations / self.seconds if self.seconds else 0.0,
+            "bytes_per_second": self.bytes / self.seconds if self.seconds else 0.0,
+            "p50":              percentile(self.latencies, 0.50),
+            "p99":              percentile(self.latencies, 0.99),
+            "mean":             sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+        }
+
+@dataclass
+class Services:
+    cdn:    iCDN
+    static: Static
+    data:   Data
+    uuids:  list[str]
+    file:   Path
+
+async def timed(call: typing.Callable[[], typing.Awaitable[typing.Any]], latencies: list[float]) -> typing.Any:
+    start = perf_counter()
+    result = await call()
+    latencies.append(perf_counter() - start)
+    return result
+
+async def measure(scenario: str, calls: list[typing.Callable[[], typing.Awaitable[typing.Any]]], concurrency: int = 1) -> Result:
+    result, semaphore = Result(scenario, len(calls), 0.0), asyncio.Semaphore(concurrency)
+
+    async def run(call: typing.Callable[[], typing.Awaitable[typing.Any]]) -> None:
+        async with semaphore:
+            value = await timed(call, result.latencies)
+            result.bytes += len(value) if isinstance(value, bytes) else 0
+
+    start = perf_counter()
+    await asyncio.gather(*(run(call) for call in calls))
+    result.seconds = perf_counter() - start
+    return result
+
+# Scenarios
+async def single(services: Services, options: argparse.Namespace) -> list[Result]:
+    uuids = services.uuids[:options.operations]
+    return [
+        await measure("icdn.query (sequential)", [lambda uuid = uuid: services.cdn.query(uuid) for uuid in uuids]),
+        await measure("icdn.details (sequential)", [services.cdn.details] * len(uuids)),
+        await measure("static.directory (sequential)", [lambda: services.static.directory("")] * len(uuids))
+    ]
+
+async def concurrent(services: Services, options: argparse.Namespace) -> list[Result]:
+    uuids = services.uuids[:options.operations]  # Distinct UUIDs, so nothing is coalesced
+    return [
+        await measure(
+            f"icdn.query (concurrency {options.concurrency})",
+            [lambda uuid = uuid: services.cdn.query(uuid) for uuid in uuids],
+            options.concurrency
+        )
+    ]
+
+async def paginated(services: Services, options: argparse.Namespace) -> list[Result]:
+    results = []
+    for scenario, callable in [
+        ("icdn.list walk", services.cdn.list(options.page_size)),
+        ("icdn.search walk", services.cdn.search(tags = ["anime"], count = options.page_size))
+    ]:
+        for raw in [False, True]:
+            result, start, last = Result(f"{scenario}{' (raw)' if raw else ''}", 0, 0.0), perf_counter(), perf_counter()
+            async for index, _ in aenumerate(callable.walk(query = True, raw = raw)):
+                if index % options.page_size == 0:
+                    now = perf_counter()
+                    result.latencies.append(now - last)
+                    last = now
+
+                result.operations += 1
+
+            result.seconds = perf_counter() - start
+            results.append(result)
+
+    return results
+
+async def aenumerate[T](iterator: typing.AsyncIterator[T]) -> typing.AsyncIterator[tuple[int, T]]:
+    index = 0
+    async for item in iterator:
+        yield index, item
+        index += 1
+
+async def transfers(services: Services, options: argparse.Namespace) -> list[Result]:
+    with tempfile.TemporaryDirectory() as directory:
+        download = await measure("icdn.download_to", [
+            lambda index = index: services.cdn.download_to(services.uuids[index], Path(directory) / str(index))
+            for index in range(options.transfers)
+        ])
+        download.bytes = sum(path.stat().st_size for path in Path(directory).iterdir())
+
+    with tempfile.TemporaryDirectory() as directory:
+        batch = await services.cdn.download_many(
+            {uuid: Path(directory) / uuid for uuid in services.uuids[:options.transfers]},
+            segment_size = max(options.file_size // 4, 1)
+        )
+        segmented = Result("icdn.download_many (segmented)", len(batch.downloaded), batch.seconds, bytes = batch.transferred)
+
+    upload = await measure("icdn.add", [
+        lambda: services.cdn.add(services.file, "benchmark") for _ in range(options.transfers)
+    ])
+    upload.bytes = services.file.stat().st_size * options.transfers
+
+    return [
+        download,
+        segmented,
+        upload,
+        await measure("static.file", [lambda: services.static.file("benchmark.bin")] * options.transfers)
+    ]
+
+async def datasets(services: Services, options: argparse.Namespace) -> list[Result]:
+    return [
+        await measure(f"data.{name}", [getattr(services.data, name)] * max(options.operations // 10, 1))
+        for name in ["tags", "anime", "games"]
+    ]
+
+SCENARIOS = {
+    "single":     single,
+    "concurrent": concurrent,
+    "paginated":  paginated,
+    "transfers":  transfers,
+    "data":       datasets
+}
+
+# Runner
+async def start_server(options: argparse.Namespace) -> tuple[asyncio.subprocess.Process, str]:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.server",
+        "--items", str(options.items),
+        "--file-size", str(options.file_size),
+        "--latency", str(options.latency),
+        stdout = asyncio.subprocess.PIPE,
+        cwd = Path(__file__).parent.parent
+    )
+    line = await process.stdout.readline()  # type: ignore
+    if not line:
+        raise RuntimeError("Stand-in server exited before announcing its address!")
+
+    return process, line.decode().strip()
+
+async def run(options: argparse.Namespace) -> dict:
+    started = datetime.now().isoformat(timespec = "seconds")
+    process, url = (None, options.url) if options.url else await start_server(options)
+    try:
+        with tempfile.NamedTemporaryFile(suffix = ".bin") as upload:
+            upload.write(bytes(options.file_size))
+            upload.flush()
+
+            async with SessionPool() as pool:
+                cdn, static, data = iCDN(url, pool = pool), Static(url, pool = pool), Data(url, pool = pool)
+                services = Services(cdn, static, data, await cdn.list(max(options.operations, options.transfers)).fetch(), Path(upload.name))
+
+                results = []
+                for name in options.scenarios:
+                    results += [result.summary() for result in await SCENARIOS[name](services, options)]
+                    print(f"  finished {name}", file = sys.stderr)
+
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+
+    return {
+        "started":     started,
+        "environment": {
+            "python":   platform.python_version(),
+            "platform": platform.platform(),
+            "dmmd":     __version__,
+            "aiohttp":  aiohttp.__version__,
+            "pydantic": pydantic.__version__,
+            "json":     json_loads.__module__
+        },
+        "options":     {key: value for key, value in vars(options).items() if key not in ("output", "compare")},
+        "results":     results,
+        "decoding":    decoding.run(options.decoding_sizes) if options.decoding_sizes else []
+    }
+
+def compare(current: dict, previous: dict) -> None:
+    before = {result["scenario"]: result for result in previous["results"]}
+    print(f"{'scenario':<36} {'ops/s':>10} {'change':>8} {'p50 ms':>9} {'change':>8} {'p99 ms':>9} {'change':>8}")
+    for result in current["results"]:
+        old = before.get(result["scenario"])
+
+        def change(key: str) -> str:
+            return f"{(result[key] / old[key] - 1) * 100:+7.1f}%" if old and old[key] else f"{'-':>8}"
+
+        print(
+            f"{result['scenario']:<36} {result['throughput']:>10.1f} {change('throughput')} " +
+            f"{result['p50'] * 1000:>9.3f} {change('p50')} {result['p99'] * 1000:>9.3f} {change('p99')}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark dmmd against a local stand-in server.")
+    parser.add_argument("--url", help = "benchmark an already running server instead of starting the stand-in")
+    parser.add_argument("--scenarios", nargs = "+", choices = [*SCENARIOS], default = [*SCENARIOS])
+    parser.add_argument("--items", type = int, default = 10_000)
+    parser.add_argument("--file-size", type = int, default = 8 * 1024 ** 2)
+    parser.add_argument("--latency", type = float, default = 0.0, help = "seconds the stand-in adds to every response")
+    parser.add_argument("--operations", type = int, default = 500)
+    parser.add_argument("--concurrency", type = int, default = 32)
+    parser.add_argument("--page-size", type = int, default = 500)
+    parser.add_argument("--transfers", type = int, default = 5)
+    parser.add_argument("--decoding-sizes", type = int, nargs = "*", default = [1_000, 10_000])
+    parser.add_argument("--output", type = Path, default = Path(f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json"))
+    parser.add_argument("--compare", type = Path, help = "previous results file to compare against")
+    options = parser.parse_args()
+
+    report = asyncio.run(run(options))
+    options.output.write_text(json.dumps(report, indent = 4))
+    print(f"Results written to {options.output}\n", file = sys.stderr)
+    compare(report, json.loads(options.compare.read_text()) if options.compare else {"results": []})
@@ -0,0 +1,194 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import os
+import re
+import json
+import typing
+import hashlib
+import tempfile
+from time import monotonic
+from pathlib import Path
+from dataclasses import asdict, dataclass
+from collections import OrderedDict
+
+# Statistics
+@dataclass
+class CacheStats:
+    hits:          int = 0
+    misses:        int = 0
+    evictions:     int = 0
+    expirations:   int = 0
+    revalidations: int = 0
+
+    @property
+    def ratio(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+# Cache keys are tuples whose first item is the kind of entry ("query", "page", ...),
+# so TTLs can be configured per kind and whole kinds can be invalidated at once.
+type CacheKey = tuple[typing.Hashable, ...]
+
+class MetadataCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, ttls: typing.Optional[dict[str, float]] = None) -> None:
+        self.maxsize, self.ttl, self.ttls = maxsize, ttl, ttls or {}
+        self.stats = CacheStats()
+
+        self._entries: OrderedDict[CacheKey, tuple[float, typing.Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> typing.Optional[typing.Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry[0] <= monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[1]
+
+    def set(self, key: CacheKey, value: typing.Any, ttl: typing.Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttls.get(str(key[0]), self.ttl)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last = False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_kind(self, kind: str) -> None:
+        for key in [key for key in self._entries if key[0] == kind]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+# Content caching
+@dataclass
+class CachedBody:
+    key:           str
+    size:          int
+    content_type:  str
+    etag:          typing.Optional[str] = None
+    last_modified: typing.Optional[str] = None
+
+    def validators(self) -> dict[str, str]:
+        return ({"If-None-Match": self.etag} if self.etag else {}) | \
+            ({"If-Modified-Since": self.last_modified} if self.last_modified else {})
+
+DIGEST = re.compile(r"[0-9a-f]{64}")
+
+# Bodies are stored as <directory>/<sha256 of key> next to a .json file holding
+# their CachedBody; both are written to a temporary file and renamed into place.
+# The metadata goes in first, so a crash in between leaves metadata without a body
+# (a miss, dropped on load) rather than a body that nothing counts towards the size.
+class ContentCache:
+    def __init__(self, directory: Path | str, max_size: int = 1024 ** 3) -> None:
+        self.directory, self.max_size = Path(directory), max_size
+        self.directory.mkdir(parents = True, exist_ok = True)
+        self.stats = CacheStats()
+
+        self._entries: OrderedDict[str, CachedBody] = OrderedDict()
+        self.size = 0  # Bytes of every stored body, kept up to date by every change to the entries
+        self._load()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _load(self) -> None:
+        for leftover in self.directory.glob(".tmp-*"):
+            leftover.unlink(missing_ok = True)
+
+        entries = []
+        for meta in self.directory.glob("*.json"):
+            body = meta.with_suffix("")
+            try:
+                entries.append((body.stat().st_mtime, body.name, CachedBody(**json.loads(meta.read_text()))))
+
+            except (OSError, ValueError, TypeError):
+                meta.unlink(missing_ok = True)
+                body.unlink(missing_ok = True)
+
+        for _, digest, entry in sorted(entries, key = lambda item: item[0]):
+            self._entries[digest] = entry
+            self.size += entry.size
+
+        # Bodies without metadata, left by a crash while removing an entry
+        for body in self.directory.iterdir():
+            if DIGEST.fullmatch(body.name) and body.name not in self._entries:
+                body.unlink(missing_ok = True)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        with tempfile.NamedTemporaryFile(dir = self.directory, prefix = ".tmp-", delete = False) as handle:
+            handle.write(data)
+
+        os.replace(handle.name, path)
+
+    def get(self, key: str) -> typing.Optional[CachedBody]:
+        digest = self._digest(key)
+        if digest not in self._entries:
+            self.stats.misses += 1
+            return None
+
+        try:
+            os.utime(self.directory / digest)  # Keeps LRU order across restarts
+
+        except FileNotFoundError:
+            self._drop(digest)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.stats.hits += 1
+        return self._entries[digest]
+
+    def read(self, entry: CachedBody) -> bytes:
+        return (self.directory / self._digest(entry.key)).read_bytes()
+
+    def put(self, key: str, body: bytes, content_type: str, etag: typing.Optional[str] = None, last_modified: typing.Optional[str] = None) -> None:
+        if len(body) > self.max_size:
+            return
+
+        digest, entry = self._digest(key), CachedBody(key, len(body), content_type, etag, last_modified)
+        self._write(self.directory / f"{digest}.json", json.dumps(asdict(entry)).encode())
+        self._write(self.directory / digest, body)
+        if (previous := self._entries.get(digest)) is not None:
+            self.size -= previous.size
+
+        self._entries[digest] = entry
+        self._entries.move_to_end(digest)
+        self.size += entry.size
+        while self.size > self.max_size:
+            self._drop(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _remove(self, digest: str) -> None:
+        (self.directory / digest).unlink(missing_ok = True)
+        (self.directory / f"{digest}.json").unlink(missing_ok = True)
+
+    def _drop(self, digest: str) -> None:
+        self.size -= self._entries.pop(digest).size
+        self._remove(digest)
+
+    def invalidate(self, key: str) -> None:
+        digest = self._digest(key)
+        if digest in self._entries:
+            self._drop(digest)
+
+    def clear(self) -> None:
+        for digest in [*self._entries]:
+            self._drop(digest)
@@ -2,51 +2,421 @@
 
 # Modules
 import typing
-import atexit
 import asyncio
+from pathlib import Path
+from time import perf_counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager, nullcontext
 
-from aiohttp import ClientSession
+from aiohttp import ClientConnectorError, ClientError, ClientResponse, ClientSession, ClientTimeout
 
-from dmmd.exceptions import EXCEPTION_MAP, ServerException
+# orjson is used for decoding when it's installed
+try:
+    from orjson import loads as json_loads
+
+except ImportError:
+    from json import loads as json_loads
+
+from dmmd.pool import DEFAULT_POOL, SessionPool
+from dmmd.cache import ContentCache
+from dmmd.streaming import iter_array
+from dmmd.transfer import CHUNK_SIZE, TransferState, content_range, state_path, validator
+from dmmd.endpoints import DEFAULT_FAILOVER, Endpoints, FailoverPolicy
+from dmmd.scheduler import PRIORITY, Priority, Scheduler, classify, priority
+from dmmd.metrics import Metrics, RequestEvent, route_of
+from dmmd.resilience import DEFAULT_POLICY, ResiliencePolicy
+from dmmd.exceptions import EXCEPTION_MAP, DmmDException, ServerException
+
+# Batching, a call that fails with one of these is reported in place of its result
+TRANSPORT_EXCEPTIONS = (ClientError, asyncio.TimeoutError, OSError)
+
+type BatchError = DmmDException | ClientError | asyncio.TimeoutError | OSError
+
+async def gather_bounded[T](
+    calls:       typing.Iterable[typing.Callable[[], typing.Awaitable[T]]],
+    concurrency: int = 16
+) -> list[T | BatchError]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Batches go in the low priority lane unless the caller picked one, so a scheduler lets
+    # interactive requests made in the meantime skip ahead of them.
+    async def run(call: typing.Callable[[], typing.Awaitable[T]]) -> T | BatchError:
+        async with semaphore:
+            try:
+                with priority(lane if (lane := PRIORITY.get()) is not None else Priority.LOW):
+                    return await call()
+
+            except (DmmDException, *TRANSPORT_EXCEPTIONS) as e:
+                return e
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+# Single-flight coalescing
+@dataclass
+class CoalesceStats:
+    requests:  int = 0  # GETs that went through the coalescing layer
+    coalesced: int = 0  # ... of which joined a call that was already in flight
+
+type FlightKey = tuple[typing.Hashable, ...]
+
+class Flight:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task, self.waiters = task, 0
+
+    async def join(self) -> typing.Any:
+        self.waiters += 1
+        try:
+            return await asyncio.shield(self.task)
+
+        except asyncio.CancelledError:
+            if self.waiters == 1 and not self.task.done():
+                self.task.cancel()  # Nobody is left waiting on the result
+
+            raise
+
+        finally:
+            self.waiters -= 1
 
 # Singleton
 class Client:
-    def __init__(self, base_url: str) -> None:
-        self._base_url = base_url
+    def __init__(
+        self,
+        base_url:  str | typing.Sequence[str],
+        pool:      typing.Optional[SessionPool]      = None,
+        policy:    typing.Optional[ResiliencePolicy] = None,
+        coalesce:  bool                              = True,
+        metrics:   typing.Optional[Metrics]          = None,
+        failover:  typing.Optional[FailoverPolicy]   = None,
+        scheduler: typing.Optional[Scheduler]        = None
+    ) -> None:
+        self.endpoints = Endpoints([base_url] if isinstance(base_url, str) else [*base_url], failover or DEFAULT_FAILOVER, self._probe)
+        self._base_url = self.endpoints.primary  # Cache keys always use the first URL, whichever endpoint answered
+        self.pool, self.policy, self.coalesce = pool or DEFAULT_POOL, policy or DEFAULT_POLICY, coalesce
+        self.coalescing, self.scheduler = CoalesceStats(), scheduler
+
+        self.metrics = metrics
+
+        self._flights: dict[FlightKey, Flight] = {}
+
+    def url(self, endpoint: str) -> str:
+        return self._base_url.rstrip("/") + endpoint
+
+    def _session(self, base_url: str) -> ClientSession:
+        return self.pool.acquire(base_url, self, self.metrics is not None)
+
+    async def close(self) -> None:
+        await self.endpoints.close()
+        await self.pool.release(self)
+
+    async def __aenter__(self) -> typing.Self:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @staticmethod
+    def _raise_for(json: dict, response: ClientResponse) -> typing.NoReturn:
+        if json["code"] in EXCEPTION_MAP:
+            error = EXCEPTION_MAP[json["code"]](json["message"])
+
+        else:
+            message = f"Received unknown error from server! {json['code']}: {json['message']}"
+            error = (ServerException if response.status >= 500 or response.status == 429 else DmmDException)(message)
+
+        raise Client._with_retry_after(error, response)
+
+    @staticmethod
+    def _with_retry_after(error: DmmDException, response: ClientResponse) -> DmmDException:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            setattr(error, "retry_after", float(retry_after))
+
+        elif retry_after:
+            try:
+                date = parsedate_to_datetime(retry_after)
+                if date.tzinfo is None:
+                    date = date.replace(tzinfo = timezone.utc)  # "-0000" means UTC as well
+
+                setattr(error, "retry_after", max((date - datetime.now(timezone.utc)).total_seconds(), 0.0))
+
+            except (TypeError, ValueError):
+                pass
+
+        return error
+
+    @staticmethod
+    def _is_json(response: ClientResponse) -> bool:
+        return response.headers.get("Content-Type", "").split(";")[0] == "application/json"
+
+    # Every attempt takes its own scheduler slot, so retries and failovers count against the
+    # limits too; it's handed to `held` and given back once the response has been released.
+    async def _send(self, base_url: str, method: str, endpoint: str, held: list[typing.Callable[[], None]], **kwargs) -> ClientResponse:
+        event, release, response = kwargs.get("trace_request_ctx"), None, None
+        try:
+            if self.scheduler is not None:
+                waited, release = await self.scheduler.acquire(base_url, classify(endpoint))
+                if event is not None:
+                    event.scheduled = (event.scheduled or 0.0) + waited
+
+            response = await self._session(base_url).request(method, endpoint, **kwargs)
+            if event is not None:
+                event.status = response.status
+
+            if self._is_json(response) and response.status != 200 and method != "HEAD":
+                self._raise_for(await response.json(loads = json_loads), response)
+
+            if response.status >= 500 or response.status == 429:
+                raise self._with_retry_after(ServerException(f"Received HTTP {response.status} from server!"), response)
+
+        except BaseException:
+            if response is not None:
+                response.release()
+
+            if release is not None:
+                release()
+
+            raise
+
+        if release is not None:
+            held.append(release)
+
+        return response
+
+    # Each attempt goes to the best endpoint, moving on to the next one straight away if it
+    # can't be reached; the policy's backoff only kicks in once every endpoint has failed.
+    async def _send_any(self, method: str, endpoint: str, held: list[typing.Callable[[], None]], **kwargs) -> ClientResponse:
+        error = None
+        for candidate in self.endpoints.candidates():
+            start = perf_counter()
+            try:
+                response = await self._send(candidate.url, method, endpoint, held, **kwargs)
+
+            except Exception as e:
+                if not self.policy.retryable(e):
+                    self.endpoints.success(candidate)  # It answered, just not with what we wanted
+                    raise
+
+                self.endpoints.failure(candidate)
+                if method not in ("GET", "HEAD") and not isinstance(e, ClientConnectorError):
+                    raise  # The server may have received it, so it's not sent anywhere else
+
+                error = e
+                continue
 
-        # This is manually typed so I only have to ignore it once
-        # rather then on every endpoint because pyright is retarded.
-        self._client: ClientSession = None  # type: ignore
+            self.endpoints.success(candidate, perf_counter() - start if method == "GET" else None)
+            return response
 
-    async def _close_client(self) -> None:
-        if self._client is not None:
-            await self._client.close()
+        raise typing.cast(Exception, error)
 
-    async def _ensure_client(self) -> None:
-        def cleanup() -> None:
-            asyncio.run(self._close_client())
+    async def _probe(self, base_url: str) -> None:
+        async with self.scheduler.slot(base_url, "metadata") if self.scheduler is not None else nullcontext():
+            async with self._session(base_url).get(
+                self.endpoints.policy.probe_path,
+                timeout = ClientTimeout(total = self.endpoints.policy.probe_timeout)
+            ) as response:
+                if response.status >= 500 or response.status == 429:
+                    raise ServerException(f"Received HTTP {response.status} from {base_url} while probing!")
 
-        if self._client is None:
-            self._client = ClientSession(self._base_url)
-            atexit.register(cleanup)
+    @asynccontextmanager
+    async def _open(self, endpoint: str, **kwargs) -> typing.AsyncIterator[ClientResponse]:
+        method, held = kwargs.pop("method", "POST" if "data" in kwargs else "GET"), []
+        try:
+            if self.metrics is None:
+                async with await self.policy.call(
+                    self.endpoints.key,
+                    lambda: self._send_any(method, endpoint, held, **kwargs),
+                    idempotent = method in ("GET", "HEAD")
+                ) as response:
+                    yield response
 
+                return
+
+            async with self._measure(method, endpoint) as event:
+                async with await self.policy.call(
+                    self.endpoints.key,
+                    lambda: self._send_any(method, endpoint, held, trace_request_ctx = event, **kwargs),
+                    idempotent = method in ("GET", "HEAD")
+                ) as response:
+                    try:
+                        yield response
+
+                    finally:
+                        event.received = response.content.total_bytes
+
+        finally:
+            for release in held:
+                release()
+
+    @asynccontextmanager
+    async def _measure(self, method: str, endpoint: str) -> typing.AsyncIterator[RequestEvent]:
+        metrics = typing.cast(Metrics, self.metrics)
+        event, start = RequestEvent(method, endpoint, route_of(endpoint)), perf_counter()
+        metrics.in_flight += 1
+        try:
+            yield event
+
+        except BaseException as e:
+            event.error = type(e).__name__
+            raise
+
+        finally:
+            metrics.in_flight -= 1
+            event.duration = perf_counter() - start
+            metrics.record(event)
+
+    async def _read(self, endpoint: str, **kwargs) -> tuple[bytes, bool]:
+        async with self._open(endpoint, **kwargs) as response:
+            return await response.read(), self._is_json(response)
+
+    # Identical plain GETs running at the same time share one underlying call;
+    # anything with a body or custom headers always goes out on its own.
+    def _flight_key(self, kind: str, endpoint: str, kwargs: dict) -> typing.Optional[FlightKey]:
+        if not self.coalesce or set(kwargs) - {"params"}:
+            return None
+
+        params = kwargs.get("params") or {}
+        return (asyncio.get_running_loop(), kind, endpoint, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+    async def _coalesced[T](self, key: typing.Optional[FlightKey], call: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        if key is None:
+            return await call()
+
+        self.coalescing.requests += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalescing.coalesced += 1
+
+        else:
+            flight = self._flights[key] = Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda task: self._settle(key, flight))
+
+        return await flight.join()
+
+    def _settle(self, key: FlightKey, flight: Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+        if not flight.task.cancelled():
+            flight.task.exception()  # Marks the exception as retrieved if every waiter left
+
+    async def _request(self, endpoint: str, **kwargs) -> tuple[bytes, bool]:
+        if self.policy.hedge_after is None or "data" in kwargs:
+            return await self._read(endpoint, **kwargs)
+
+        return await self.policy.hedge(lambda: self._read(endpoint, **kwargs))
+
+    # Coalesced callers share the body, but each decodes its own copy, so none of them can change what another sees
     async def request(self, endpoint: str, **kwargs) -> typing.Any:
-        await self._ensure_client()
-        async with self._client.request(
-            "POST" if "data" in kwargs else "GET", endpoint,
-            **kwargs
-        ) as response:
-            if response.headers.get("Content-Type", "").split(";")[0] == "application/json":
-                json = await response.json()
-                if response.status != 200:
-                    if json["code"] in EXCEPTION_MAP:
-                        raise EXCEPTION_MAP[json["code"]](json["message"])
-
-                    raise ServerException(
-                        "Received unknown error from server! " +
-                        f"{json['code']}: {json['message']}"
-                    )
-
-                return json
-
-            return await response.read()  # Bytes
+        body, is_json = await self._coalesced(self._flight_key("read", endpoint, kwargs), lambda: self._request(endpoint, **kwargs))
+        return json_loads(body) if is_json else body
+
+    async def _request_bytes(self, endpoint: str, **kwargs) -> bytes:
+        async with self._open(endpoint, **kwargs) as response:
+            return await response.read()
+
+    async def request_bytes(self, endpoint: str, **kwargs) -> bytes:
+        return await self._coalesced(self._flight_key("bytes", endpoint, kwargs), lambda: self._request_bytes(endpoint, **kwargs))
+
+    # Yields every element of a JSON array body, decoded as soon as it has fully arrived,
+    # so only one element (plus whatever is in flight) is ever held in memory.
+    async def stream_array(self, endpoint: str, **kwargs) -> typing.AsyncIterator[typing.Any]:
+        async with self._open(endpoint, **kwargs) as response:
+            try:
+                async for element in iter_array(response.content.iter_any()):
+                    yield element
+
+            except ValueError as e:
+                raise ServerException(f"Received a malformed JSON array from {endpoint}: {e}") from e
+
+    async def cached_request(self, endpoint: str, cache: ContentCache, immutable: bool = False) -> typing.Any:
+        def decode(body: bytes, content_type: str) -> typing.Any:
+            return json_loads(body) if content_type == "application/json" else body
+
+        key = self.url(endpoint)
+        entry = cache.get(key)
+        if entry is not None and immutable:
+            return decode(cache.read(entry), entry.content_type)
+
+        async with self._open_body(endpoint, headers = entry.validators() if entry is not None else {}) as response:
+            if response.status == 304 and entry is not None:
+                cache.stats.revalidations += 1
+                return decode(cache.read(entry), entry.content_type)
+
+            body, content_type = await response.read(), response.headers.get("Content-Type", "").split(";")[0]
+            if response.status == 200:
+                cache.put(key, body, content_type, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+            return decode(body, content_type)
+
+    @asynccontextmanager
+    async def _open_body(self, endpoint: str, **kwargs) -> typing.AsyncIterator[ClientResponse]:
+        async with self._open(endpoint, **kwargs) as response:
+            if response.status >= 400 and response.status != 416:
+                raise ServerException(f"Received HTTP {response.status} from server while streaming {endpoint}!")
+
+            yield response
+
+    # For callers that need the status and headers, not just the body
+    def response(self, endpoint: str, **kwargs) -> typing.AsyncContextManager[ClientResponse]:
+        return self._open_body(endpoint, **kwargs)
+
+    async def stream(self, endpoint: str, chunk_size: int = CHUNK_SIZE, **kwargs) -> typing.AsyncIterator[bytes]:
+        async with self._open_body(endpoint, **kwargs) as response:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+    # Partial files are only resumed while the server confirms, through If-Range, that the
+    # file is still the one they were started from; otherwise the download starts over.
+    async def download(self, endpoint: str, path: Path, chunk_size: int = CHUNK_SIZE) -> Path:
+        partial = path.with_name(f"{path.name}.part")
+        state_file = state_path(partial)
+        state = TransferState.load(state_file) if partial.is_file() else None
+        offset = partial.stat().st_size if state is not None else 0
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        if offset and state is not None and state.validator:
+            headers["If-Range"] = state.validator
+
+        async with self._open_body(endpoint, headers = headers) as response:
+            start, size = content_range(response)
+            if response.status == 416:
+
+                # Either the partial file is already complete, or it no longer
+                # matches the remote file and has to be fetched from scratch.
+                if state is None or size != offset or size != state.size:
+                    partial.unlink(missing_ok = True)
+                    state_file.unlink(missing_ok = True)
+                    return await self.download(endpoint, path, chunk_size)
+
+            else:
+                if response.status != 206 or start != offset or (state is not None and size != state.size):
+                    offset = 0  # Server ignored the range, or the file changed upstream
+
+                if not offset:
+                    total = size if size is not None else response.content_length
+                    TransferState(total or 0, validator(response), []).save(state_file)  # The partial file's size is the progress
+
+                with partial.open("r+b" if offset else "wb") as handle:
+                    handle.seek(offset)
+                    handle.truncate()
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        handle.write(chunk)
+
+        partial.replace(path)
+        state_file.unlink(missing_ok = True)
+        return path
+
+# Base for the API wrappers
+class Service:
+    client: Client
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def __aenter__(self) -> typing.Self:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -1,20 +1,49 @@
 # Copyright (c) 2025 iiPython
 
 # Modules
-from dmmd.client import Client
-from dmmd.data._typing import Anime, Game, Tag
+import typing
+
+from dmmd.pool import SessionPool
+from dmmd.endpoints import FailoverPolicy
+from dmmd.scheduler import Scheduler
+from dmmd.metrics import Metrics
+from dmmd.resilience import ResiliencePolicy
+from dmmd.client import Client, Service
+from dmmd.data._typing import ANIME, GAMES, TAGS, Anime, Game, Tag
 
 # Main class
-class Data:
-    def __init__(self, base_url: str = "https://dmmdgm.dev") -> None:
-        self.client = Client(base_url)
+class Data(Service):
+    def __init__(
+        self,
+        base_url:  str | typing.Sequence[str]        = "https://dmmdgm.dev",
+        pool:      typing.Optional[SessionPool]      = None,
+        policy:    typing.Optional[ResiliencePolicy] = None,
+        metrics:   typing.Optional[Metrics]          = None,
+        failover:  typing.Optional[FailoverPolicy]   = None,
+        scheduler: typing.Optional[Scheduler]        = None
+    ) -> None:
+        self.client = Client(base_url, pool, policy, metrics = metrics, failover = failover, scheduler = scheduler)
 
-    # Endpoint handlersanime
+    # Endpoint handlers
     async def tags(self) -> list[Tag]:
-        return [Tag(**tag) for tag in await self.client.request("/api/data/tags")]
+        return TAGS.validate_json(await self.client.request_bytes("/api/data/tags"))
 
     async def anime(self) -> list[Anime]:
-        return [Anime(**tag) for tag in await self.client.request("/api/data/anime")]
+        return ANIME.validate_json(await self.client.request_bytes("/api/data/anime"))
 
     async def games(self) -> list[Game]:
-        return [Game(**tag) for tag in await self.client.request("/api/data/games")]
+        return GAMES.validate_json(await self.client.request_bytes("/api/data/games"))
+
+    # Streaming, each entry is validated as soon as it arrives instead of once the whole dump has
+    async def _stream[T: Tag | Anime](self, endpoint: str, model: type[T]) -> typing.AsyncIterator[T]:
+        async for element in self.client.stream_array(endpoint):
+            yield model.model_validate(element)
+
+    def stream_tags(self) -> typing.AsyncIterator[Tag]:
+        return self._stream("/api/data/tags", Tag)
+
+    def stream_anime(self) -> typing.AsyncIterator[Anime]:
+        return self._stream("/api/data/anime", Anime)
+
+    def stream_games(self) -> typing.AsyncIterator[Game]:
+        return self._stream("/api/data/games", Game)
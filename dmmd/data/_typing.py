@@ -1,7 +1,7 @@
 # Copyright (c) 2025 iiPython
 
 import typing
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 class Tag(BaseModel):
     id:   str
@@ -20,3 +20,7 @@ class Anime(BaseModel):
 
 class Game(Anime):
     users: list[str]
+
+TAGS  = TypeAdapter(list[Tag])
+ANIME = TypeAdapter(list[Anime])
+GAMES = TypeAdapter(list[Game])
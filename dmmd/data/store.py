@@ -0,0 +1,197 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import typing
+import asyncio
+import hashlib
+from time import monotonic
+from dataclasses import dataclass, field
+
+from aiohttp import ClientError
+from pydantic import TypeAdapter
+
+from dmmd.exceptions import DmmDException
+from dmmd.data._typing import ANIME, GAMES, TAGS, Anime, Game, Tag
+
+if typing.TYPE_CHECKING:
+    from dmmd.data import Data
+
+# Snapshots are built once and never modified afterwards, so readers can hold on to one
+# while a refresh builds its replacement.
+def _by_rating[T: Anime](items: typing.Iterable[T]) -> tuple[T, ...]:
+    return tuple(sorted(items, key = lambda item: (item.rating is None, -(item.rating or 0))))
+
+def _group[T: Anime](items: typing.Iterable[T], keys: typing.Callable[[T], typing.Iterable[str]]) -> dict[str, tuple[T, ...]]:
+    groups: dict[str, list[T]] = {}
+    for item in items:
+        for key in keys(item):
+            groups.setdefault(key, []).append(item)
+
+    return {key: tuple(values) for key, values in groups.items()}
+
+@dataclass(frozen = True)
+class Snapshot:
+    tags:  dict[str, Tag]
+    anime: dict[str, Anime]
+    games: dict[str, Game]
+
+    anime_by_tag:    dict[str, tuple[Anime, ...]] = field(repr = False)
+    games_by_tag:    dict[str, tuple[Game, ...]]  = field(repr = False)
+    games_by_user:   dict[str, tuple[Game, ...]]  = field(repr = False)
+    anime_by_rating: tuple[Anime, ...]            = field(repr = False)  # Highest first, unrated last
+    games_by_rating: tuple[Game, ...]             = field(repr = False)
+
+    loaded: float = field(default_factory = monotonic)
+
+    @classmethod
+    def build(cls, tags: list[Tag], anime: list[Anime], games: list[Game]) -> typing.Self:
+        return cls(
+            {tag.id: tag for tag in tags},
+            {item.id: item for item in anime},
+            {item.id: item for item in games},
+            _group(anime, lambda item: item.tags),
+            _group(games, lambda item: item.tags),
+            _group(games, lambda item: item.users),
+            _by_rating(anime),
+            _by_rating(games)
+        )
+
+    def tag_names(self, ids: typing.Iterable[str]) -> list[str]:
+        return [self.tags[id].name if id in self.tags else id for id in ids]
+
+# Store
+DATASETS: dict[str, tuple[str, TypeAdapter]] = {
+    "tags":  ("/api/data/tags", TAGS),
+    "anime": ("/api/data/anime", ANIME),
+    "games": ("/api/data/games", GAMES)
+}
+
+@dataclass
+class Validators:
+    digest:        bytes
+    etag:          typing.Optional[str] = None
+    last_modified: typing.Optional[str] = None
+
+    def headers(self) -> dict[str, str]:
+        return ({"If-None-Match": self.etag} if self.etag else {}) | \
+            ({"If-Modified-Since": self.last_modified} if self.last_modified else {})
+
+class DataStore:
+    def __init__(self, data: "Data", ttl: typing.Optional[float] = 300.0) -> None:
+        self.data, self.ttl = data, ttl
+        self.error: typing.Optional[Exception] = None  # Set when the last background refresh failed
+
+        self._snapshot: typing.Optional[Snapshot] = None
+        self._validators: dict[str, Validators] = {}
+        self._refreshing: typing.Optional[asyncio.Task[bool]] = None
+        self._task: typing.Optional[asyncio.Task[None]] = None
+
+    @property
+    def snapshot(self) -> Snapshot:
+        if self._snapshot is None:
+            raise RuntimeError("DataStore hasn't been loaded yet, call load() or use it with async with!")
+
+        return self._snapshot
+
+    # Lookups, all answered from the current snapshot without awaiting anything
+    def tag(self, id: str) -> typing.Optional[Tag]:
+        return self.snapshot.tags.get(id)
+
+    def anime(self, id: str) -> typing.Optional[Anime]:
+        return self.snapshot.anime.get(id)
+
+    def game(self, id: str) -> typing.Optional[Game]:
+        return self.snapshot.games.get(id)
+
+    def anime_with_tag(self, tag: str) -> tuple[Anime, ...]:
+        return self.snapshot.anime_by_tag.get(tag, ())
+
+    def games_with_tag(self, tag: str) -> tuple[Game, ...]:
+        return self.snapshot.games_by_tag.get(tag, ())
+
+    def games_for_user(self, user: str) -> tuple[Game, ...]:
+        return self.snapshot.games_by_user.get(user, ())
+
+    def top_anime(self, limit: int = 10) -> tuple[Anime, ...]:
+        return self.snapshot.anime_by_rating[:limit]
+
+    def top_games(self, limit: int = 10) -> tuple[Game, ...]:
+        return self.snapshot.games_by_rating[:limit]
+
+    def tag_names(self, ids: typing.Iterable[str]) -> list[str]:
+        return self.snapshot.tag_names(ids)
+
+    # Loading, datasets are revalidated and unchanged ones (304 or an identical body) are reused.
+    # Validators are only kept once a snapshot was built, so a failed refresh never skips data.
+    async def _fetch(self, name: str) -> tuple[typing.Optional[list], Validators]:
+        endpoint, adapter = DATASETS[name]
+        previous = self._validators.get(name) if self._snapshot is not None else None
+        async with self.data.client.response(endpoint, headers = previous.headers() if previous else {}) as response:
+            if response.status == 304 and previous is not None:
+                return None, previous
+
+            body = await response.read()
+            validators = Validators(hashlib.sha256(body).digest(), response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+        if previous is not None and previous.digest == validators.digest:
+            return None, validators
+
+        return adapter.validate_json(body), validators
+
+    async def _refresh(self) -> bool:
+        results = dict(zip(DATASETS, await asyncio.gather(*(self._fetch(name) for name in DATASETS))))
+        self._validators = {name: validators for name, (_, validators) in results.items()}
+
+        current = self._snapshot
+        if current is not None and all(items is None for items, _ in results.values()):
+            return False
+
+        def pick(name: str, previous: typing.Callable[[Snapshot], dict]) -> list:
+            items = results[name][0]
+            return items if items is not None else [*previous(typing.cast(Snapshot, current)).values()]
+
+        self._snapshot = Snapshot.build(
+            pick("tags", lambda snapshot: snapshot.tags),
+            pick("anime", lambda snapshot: snapshot.anime),
+            pick("games", lambda snapshot: snapshot.games)
+        )
+        return True
+
+    async def refresh(self) -> bool:
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh())
+
+        return await asyncio.shield(self._refreshing)
+
+    async def load(self) -> Snapshot:
+        await self.refresh()
+        return self.snapshot
+
+    # Background refreshing
+    async def _refresh_forever(self, ttl: float) -> None:
+        while True:
+            await asyncio.sleep(ttl)
+            try:
+                await self.refresh()
+                self.error = None
+
+            except (DmmDException, ClientError, asyncio.TimeoutError, ValueError) as e:
+                self.error = e  # Keep serving the previous snapshot
+
+    def start(self) -> None:
+        if self.ttl is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._refresh_forever(self.ttl))
+
+    async def close(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions = True)
+
+    async def __aenter__(self) -> typing.Self:
+        await self.load()
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
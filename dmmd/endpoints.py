@@ -0,0 +1,133 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import typing
+import asyncio
+from time import monotonic, perf_counter
+from dataclasses import dataclass, replace
+
+from yarl import URL
+
+# Configuration
+@dataclass
+class FailoverPolicy:
+    smoothing:      float = 0.3   # Weight of the newest sample in the moving averages
+    error_penalty:  float = 1.0   # Seconds added to an endpoint's score at a 100% error rate
+    half_life:      float = 30.0  # Seconds for an unused endpoint's score to halve, so it gets measured again
+    down_after:     int   = 1     # Consecutive failures before an endpoint is taken out of rotation
+    probe_interval: float = 10.0  # Seconds between background checks of an endpoint that's down
+    probe_timeout:  float = 5.0
+    probe_path:     str   = "/"
+
+# Per-endpoint state, latency and errors are exponentially weighted moving averages,
+# so recent requests count for more than a long history.
+@dataclass
+class EndpointStats:
+    url:        str
+    latency:    typing.Optional[float] = None  # Seconds until response headers arrived, GETs only
+    errors:     float                  = 0.0   # 0 when nothing failed lately, up to 1 when everything did
+    requests:   int                    = 0
+    failures:   int                    = 0
+    streak:     int                    = 0     # Consecutive failures
+    probes:     int                    = 0     # Background checks sent while down
+    down_since: typing.Optional[float] = None  # Monotonic time it was taken out of rotation
+    used:       float                  = 0.0   # Monotonic time of the last request or probe
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_since is None
+
+type ProbeCallable = typing.Callable[[str], typing.Awaitable[None]]
+
+class Endpoints:
+    def __init__(self, urls: typing.Sequence[str], policy: FailoverPolicy, probe: ProbeCallable) -> None:
+        if not urls:
+            raise ValueError("At least one base URL is required.")
+
+        self.policy, self.probe = policy, probe
+        self.endpoints = [EndpointStats(url) for url in urls]
+        self._probes: dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def primary(self) -> str:
+        return self.endpoints[0].url
+
+    # Circuit breaker key; with several endpoints the circuit only opens once all of them keep failing
+    @property
+    def key(self) -> str:
+        return ",".join(str(URL(endpoint.url).origin()) for endpoint in self.endpoints)
+
+    def score(self, endpoint: EndpointStats) -> float:
+        decay = 0.5 ** ((monotonic() - endpoint.used) / self.policy.half_life)
+        return ((endpoint.latency or 0.0) + endpoint.errors * self.policy.error_penalty) * decay
+
+    # Healthy endpoints by score (unmeasured ones first, so they get measured, and ties keep
+    # the given order), then the ones that are down, longest down first as a last resort.
+    def candidates(self) -> list[EndpointStats]:
+        if len(self.endpoints) == 1:
+            return self.endpoints
+
+        return sorted(
+            (endpoint for endpoint in self.endpoints if endpoint.healthy),
+            key = self.score
+        ) + sorted(
+            (endpoint for endpoint in self.endpoints if not endpoint.healthy),
+            key = lambda endpoint: typing.cast(float, endpoint.down_since)
+        )
+
+    def success(self, endpoint: EndpointStats, latency: typing.Optional[float] = None) -> None:
+        endpoint.requests += 1
+        self._recovered(endpoint, latency)
+
+    def _recovered(self, endpoint: EndpointStats, latency: typing.Optional[float]) -> None:
+        weight = self.policy.smoothing
+        endpoint.streak, endpoint.down_since, endpoint.used = 0, None, monotonic()
+        endpoint.errors *= 1 - weight
+        if latency is not None:
+            endpoint.latency = latency if endpoint.latency is None else endpoint.latency + weight * (latency - endpoint.latency)
+
+    def failure(self, endpoint: EndpointStats) -> None:
+        endpoint.requests += 1
+        endpoint.failures += 1
+        endpoint.streak += 1
+        endpoint.used = monotonic()
+        endpoint.errors += self.policy.smoothing * (1 - endpoint.errors)
+        if len(self.endpoints) > 1 and endpoint.healthy and endpoint.streak >= self.policy.down_after:
+            endpoint.down_since = monotonic()
+            if endpoint.url not in self._probes:
+                self._probes[endpoint.url] = asyncio.ensure_future(self._recover(endpoint))
+
+    # Endpoints that are down get no traffic, so a background probe checks on them instead
+    async def _recover(self, endpoint: EndpointStats) -> None:
+        try:
+            while not endpoint.healthy:
+                await asyncio.sleep(self.policy.probe_interval)
+                if endpoint.healthy:
+                    break  # A request made while every endpoint was down got through
+
+                endpoint.probes += 1
+                start = perf_counter()
+                try:
+                    await self.probe(endpoint.url)
+
+                except Exception:
+                    continue
+
+                self._recovered(endpoint, perf_counter() - start)
+
+        finally:
+            del self._probes[endpoint.url]
+
+    def stats(self) -> list[EndpointStats]:
+        return [replace(endpoint) for endpoint in self.endpoints]
+
+    async def close(self) -> None:
+        tasks = [*self._probes.values()]
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions = True)
+        self._probes.clear()  # Probes cancelled before they started never removed themselves
+
+# Shared default
+DEFAULT_FAILOVER = FailoverPolicy()
@@ -17,6 +17,12 @@ class ServerException(DmmDException):
 class UnknownException(DmmDException):
     pass
 
+class CircuitOpen(DmmDException):
+    pass
+
+class InvalidQuery(DmmDException):
+    pass
+
 # Exceptions / iCDN
 class BadFile(DmmDException):
     pass
@@ -91,3 +97,10 @@ EXCEPTION_MAP = {
     "ROUTE_ABORT"       : RouteAbort,
     "SERVER_FAILURE"    : ServerFailure,
 }
+
+# Errors worth retrying, everything else is the server rejecting the request itself
+RETRYABLE_EXCEPTIONS = tuple(EXCEPTION_MAP[code] for code in [
+    "SERVER_EXCEPTION",
+    "UNKNOWN_EXCEPTION",
+    "SERVER_FAILURE",
+])
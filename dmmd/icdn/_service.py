@@ -0,0 +1,261 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import typing
+from functools import partial
+from pathlib import Path
+from datetime import datetime
+
+from dmmd.pool import SessionPool
+from dmmd.endpoints import FailoverPolicy
+from dmmd.scheduler import Scheduler
+from dmmd.metrics import Metrics
+from dmmd.resilience import ResiliencePolicy
+from dmmd.cache import ContentCache, MetadataCache
+from dmmd.client import CHUNK_SIZE, BatchError, Client, Service, gather_bounded
+from dmmd.icdn._typing import BuiltCallable, DataModel, DataRecord, SortOrder, SortType, StoreModel
+from dmmd.icdn.upload import Progress, ProgressCallback, build_form
+from dmmd.icdn.mirror import LocalCallable, Mirror
+from dmmd.icdn.sync import SyncResult, sync
+from dmmd.icdn.push import HashIndex, PushCallback, PushItem, PushResult, load_items, push
+from dmmd.icdn.query import Expression, PlannedCallable, parse
+from dmmd.icdn.download import SEGMENT_SIZE, DownloadCallback, DownloadResult, download_many
+from dmmd.icdn.watch import WatchCursor, WatchEvent, watch
+
+# Main class
+class iCDN(Service):
+    def __init__(
+        self,
+        base_url:      str | typing.Sequence[str]        = "https://dmmdgm.dev",
+        pool:          typing.Optional[SessionPool]      = None,
+        policy:        typing.Optional[ResiliencePolicy] = None,
+        cache:         typing.Optional[MetadataCache]    = None,
+        content_cache: typing.Optional[ContentCache]     = None,
+        mirror:        typing.Optional[Mirror]           = None,
+        metrics:       typing.Optional[Metrics]          = None,
+        failover:      typing.Optional[FailoverPolicy]   = None,
+        scheduler:     typing.Optional[Scheduler]        = None
+    ) -> None:
+        self.client = Client(base_url, pool, policy, metrics = metrics, failover = failover, scheduler = scheduler)
+        self.cache, self.content_cache, self.mirror = cache, content_cache, mirror
+
+    # Cache handling
+    def _written(self, model: DataModel, removed: bool = False, changed_file: bool = False) -> DataModel:
+        if self.content_cache is not None and (removed or changed_file):
+            self.content_cache.invalidate(self.client.url(f"/file/{model.uuid}"))
+
+        if self.mirror is not None:
+            self.mirror.forget(model.uuid) if removed else self.mirror.store([model])
+
+        if self.cache is not None:
+            self.cache.invalidate_kind("page")
+            self.cache.invalidate(("details",))
+            if removed:
+                self.cache.invalidate(("query", model.uuid))
+
+            else:
+                self.cache.set(("query", model.uuid), model)
+
+        return model
+
+    # Endpoint handlers
+    async def file(self, uuid: str) -> bytes:
+        if self.content_cache is not None:
+            return await self.client.cached_request(f"/file/{uuid}", self.content_cache, immutable = True)
+
+        return await self.client.request(f"/file/{uuid}")
+
+    def stream(self, uuid: str, chunk_size: int = CHUNK_SIZE) -> typing.AsyncIterator[bytes]:
+        return self.client.stream(f"/file/{uuid}", chunk_size)
+
+    async def download_to(self, uuid: str, path: Path, chunk_size: int = CHUNK_SIZE) -> Path:
+        return await self.client.download(f"/file/{uuid}", path, chunk_size)
+
+    # Many files at once over a shared connection budget, large ones split into parallel Range segments
+    async def download_many(
+        self,
+        targets:      typing.Mapping[str, Path] | typing.Iterable[tuple[str, Path]],
+        connections:  int                               = 8,
+        segment_size: int                               = SEGMENT_SIZE,
+        chunk_size:   int                               = CHUNK_SIZE,
+        progress:     typing.Optional[DownloadCallback] = None
+    ) -> DownloadResult:
+        pairs = targets.items() if isinstance(targets, typing.Mapping) else targets
+        return await download_many(self, pairs, connections, segment_size, chunk_size, progress)
+
+    async def query(self, uuid: str) -> DataModel:
+        if self.cache is not None and (cached := self.cache.get(("query", uuid))) is not None:
+            return cached
+
+        model = DataModel(**await self.client.request(f"/query/{uuid}"))
+        if self.cache is not None:
+            self.cache.set(("query", uuid), model)
+
+        return model
+
+    async def query_many(self, uuids: typing.Iterable[str], concurrency: int = 16) -> list[DataModel | BatchError]:
+        return await gather_bounded([partial(self.query, uuid) for uuid in uuids], concurrency)
+
+    def search(
+        self,
+        name:      typing.Optional[str]       = None                ,
+        begin:     typing.Optional[int]       = None                ,
+        end:       typing.Optional[int]       = None                ,
+        maximum:   typing.Optional[int]       = None                ,
+        minimum:   typing.Optional[int]       = None                ,
+        uuid:      typing.Optional[str]       = None                ,
+        mime:      typing.Optional[str]       = None                ,
+        extension: typing.Optional[str]       = None                ,
+        count:     typing.Optional[int]       = 25                  ,
+        loose:     typing.Optional[bool]      = False               ,
+        page:      typing.Optional[int]       = 0                   ,
+        tags:      typing.Optional[list[str]] = []                  ,
+        order:     SortOrder                  = SortOrder.DESCENDING,
+        sort:      SortType                   = SortType.TIME       ,
+        remote:    bool                       = False               ,
+    ) -> BuiltCallable:
+        params = {
+            "begin":     begin,
+            "end":       end,
+            "maximum":   maximum,
+            "minimum":   minimum,
+            "name":      name,
+            "uuid":      uuid,
+            "mime":      mime,
+            "extension": extension,
+            "count":     count,
+            "loose":     str(loose).lower(),
+            "order":     order.value,
+            "page":      page,
+            "sort":      sort.value,
+            "tags":      ",".join(tags) if tags else None
+        }
+        if self.mirror is not None and not remote:
+            return LocalCallable(self.mirror, params)
+
+        return BuiltCallable(self.client, "/search", params, self.cache)
+
+    # Boolean tag/name/range expressions, planned into as few concurrent searches as possible
+    def find(
+        self,
+        expression: str | Expression,
+        count:      int       = 25,
+        page:       int       = 0,
+        order:      SortOrder = SortOrder.DESCENDING,
+        sort:       SortType  = SortType.TIME,
+        remote:     bool      = False
+    ) -> PlannedCallable:
+        return PlannedCallable(self, parse(expression) if isinstance(expression, str) else expression, count, page, order, sort, remote)
+
+    async def add(
+        self,
+        file:       Path,
+        name:       str,
+        data:       dict[str, typing.Any]             = {},
+        tags:       list[str]                         = [],
+        time:       typing.Optional[datetime]         = None,
+        token:      typing.Optional[str]              = None,
+        chunk_size: int                               = CHUNK_SIZE,
+        progress:   typing.Optional[ProgressCallback] = None,
+        use_mmap:   bool                              = False
+     ) -> DataModel:
+        return self._written(DataModel(**await self.client.request("/add", data = build_form(
+            json.dumps({
+                "data": data,
+                "name": name,
+                "tags": tags,
+                "time": round((time or datetime.now()).timestamp() * 1000)
+            } | ({"token": token} if token is not None else {})),
+            file, chunk_size, progress, use_mmap
+        ))))
+
+    async def update(
+        self,
+        uuid:       str,
+        file:       typing.Optional[Path]                  = None,
+        name:       typing.Optional[str]                   = None,
+        data:       typing.Optional[dict[str, typing.Any]] = None,
+        tags:       typing.Optional[list[str]]             = None,
+        time:       typing.Optional[datetime]              = None,
+        token:      typing.Optional[str]                   = None,
+        chunk_size: int                                    = CHUNK_SIZE,
+        progress:   typing.Optional[ProgressCallback]      = None,
+        use_mmap:   bool                                   = False
+    ) -> DataModel:
+        return self._written(DataModel(**await self.client.request("/update", data = build_form(
+            json.dumps({
+                key: value for key, value in {
+                    "uuid": uuid,
+                    "data": data,
+                    "name": name,
+                    "tags": tags,
+                    "time": round(time.timestamp() * 1000) if time else None
+                }.items() if value is not None
+            } | ({"token": token} if token is not None else {})),
+            file, chunk_size, progress, use_mmap
+        ))), changed_file = file is not None)
+
+    async def remove(self, uuid: str, token: typing.Optional[str] = None) -> DataModel:
+        return self._written(DataModel(**await self.client.request("/remove", data = {
+            "json": json.dumps({"uuid": uuid} | ({"token": token} if token is not None else {}))
+        })), removed = True)
+
+    async def remove_many(
+        self,
+        uuids:       typing.Iterable[str],
+        token:       typing.Optional[str] = None,
+        concurrency: int                  = 16
+    ) -> list[DataModel | BatchError]:
+        return await gather_bounded([partial(self.remove, uuid, token) for uuid in uuids], concurrency)
+
+    # Handle listing
+    def list(self, count: int = 25, page: int = 0) -> BuiltCallable:
+        return BuiltCallable(
+            self.client,
+            "/list",
+            {
+                "count": count,
+                "page": page
+            },
+            self.cache
+        )
+
+    # Directory syncing
+    async def sync(self, directory: Path, concurrency: int = 8, count: int = 500, prune: bool = False) -> SyncResult:
+        return await sync(self, directory, concurrency, count, prune)
+
+    # Change feed, polling for content past a time high-water mark
+    def watch(
+        self,
+        cursor:       typing.Optional[WatchCursor] = None,
+        interval:     float                        = 5.0,
+        min_interval: float                        = 1.0,
+        max_interval: float                        = 60.0,
+        reconcile:    typing.Optional[float]       = 600.0,
+        replay:       bool                         = False,
+        count:        int                          = 100,
+        checkpoint:   typing.Optional[Path]        = None
+    ) -> typing.AsyncIterator[WatchEvent]:
+        return watch(self, cursor, interval, min_interval, max_interval, reconcile, replay, count, checkpoint)
+
+    # Batch uploading, from a directory, a JSONL/CSV manifest or a list of PushItems
+    async def push(
+        self,
+        source:      Path | typing.Iterable[PushItem],
+        index:       typing.Optional[HashIndex]    = None,
+        concurrency: int                           = 4,
+        token:       typing.Optional[str]          = None,
+        progress:    typing.Optional[PushCallback] = None
+    ) -> PushResult:
+        return await push(self, load_items(source) if isinstance(source, Path) else source, index, concurrency, token, progress)
+
+    async def details(self) -> StoreModel:
+        if self.cache is not None and (cached := self.cache.get(("details",))) is not None:
+            return cached
+
+        store = StoreModel(**await self.client.request("/details"))
+        if self.cache is not None:
+            self.cache.set(("details",), store)
+
+        return store
@@ -1,12 +1,17 @@
 # Copyright (c) 2025 iiPython
 
 import typing
+import asyncio
+import mimetypes
 from enum import Enum
+from contextlib import aclosing
+from operator import itemgetter
 from datetime import datetime
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
-from dmmd.client import Client
+from dmmd.cache import MetadataCache
+from dmmd.client import Client, json_loads
 
 class SortOrder(Enum):
     ASCENDING  = "ascending"
@@ -31,6 +36,28 @@ class DataModel(BaseModel):
     def convert_timestamp(cls, value: int) -> datetime:
         return datetime.fromtimestamp(value / 1000)
 
+# Extensions aren't part of DataModel, so they're derived from the mimetype
+def extension_of(mime: str) -> typing.Optional[str]:
+    extension = mimetypes.guess_extension(mime)
+    return extension[1:] if extension else None
+
+# Lightweight record used by raw queries, skipping validation entirely
+class DataRecord:
+    __slots__ = ("data", "mime", "name", "size", "tags", "time", "uuid")
+
+    def __init__(self, data: dict, mime: str, name: str, size: int, tags: list[str], time: int, uuid: str) -> None:
+        self.data, self.mime, self.name, self.size, self.tags, self.time, self.uuid = data, mime, name, size, tags, time, uuid
+
+    def __repr__(self) -> str:
+        return f"DataRecord(uuid={self.uuid!r}, name={self.name!r}, mime={self.mime!r}, size={self.size})"
+
+    def model(self) -> DataModel:
+        return DataModel(data = self.data, mime = self.mime, name = self.name, size = self.size, tags = self.tags, time = self.time, uuid = self.uuid)
+
+DATA_MODEL  = TypeAdapter(DataModel)
+DATA_MODELS = TypeAdapter(list[DataModel])
+RECORD_FIELDS = itemgetter(*DataRecord.__slots__)
+
 class StoreModel(BaseModel):
     file_limit:   int = Field(alias = "fileLimit")
     store_limit:  int = Field(alias = "storeLimit")
@@ -41,21 +68,133 @@ class StoreModel(BaseModel):
 type UUID = str
 
 class BuiltCallable:
-    def __init__(self, client: Client, endpoint: str, params: dict) -> None:
+    def __init__(self, client: Client, endpoint: str, params: dict, cache: typing.Optional[MetadataCache] = None) -> None:
         self.client, self.endpoint, self.params = client, endpoint, {k :v for k, v in params.items() if v is not None}
+        self.cache = cache
+
+    @typing.overload
+    async def _perform(self, query: typing.Literal[True], page: typing.Optional[int] = None, raw: typing.Literal[False] = False) -> list[DataModel]: ...
+
+    @typing.overload
+    async def _perform(self, query: typing.Literal[True], page: typing.Optional[int] = None, raw: typing.Literal[True] = True) -> list[DataRecord]: ...
+
+    @typing.overload
+    async def _perform(self, query: typing.Literal[False], page: typing.Optional[int] = None, raw: bool = False) -> list[UUID]: ...
+
+    def _page(self, query: bool, page: typing.Optional[int], raw: bool) -> tuple[dict, tuple]:
+        params = self.params | {"query": str(query).lower()} | ({"page": page} if page is not None else {})
+        return params, ("page", self.endpoint, raw, *sorted(params.items()))
+
+    async def _perform(self, query: bool, page: typing.Optional[int] = None, raw: bool = False) -> list[DataModel] | list[DataRecord] | list[UUID]:
+        params, key = self._page(query, page, raw)
+        if self.cache is not None and (cached := self.cache.get(key)) is not None:
+            return [*cached]
+
+        # Models are validated straight from the response body in one pass,
+        # rather than decoding it first and unpacking every item separately.
+        body = await self.client.request_bytes(self.endpoint, params = params)
+        if not query:
+            results = json_loads(body)
+
+        elif raw:
+            results = [DataRecord(*RECORD_FIELDS(item)) for item in json_loads(body)]
+
+        else:
+            results = DATA_MODELS.validate_json(body)
+
+        if self.cache is not None:
+            self.cache.set(key, [*results])
+
+        return results
+
+    # Streaming, each item is decoded as soon as it arrives instead of once the whole page has.
+    # Streamed pages aren't added to the cache, since that would mean holding on to all of them.
+    async def _stream(self, query: bool, page: typing.Optional[int] = None, raw: bool = False) -> typing.AsyncIterator[DataModel | DataRecord | UUID]:
+        params, key = self._page(query, page, raw)
+        if self.cache is not None and (cached := self.cache.get(key)) is not None:
+            for item in cached:
+                yield item
+
+            return
+
+        async for element in self.client.stream_array(self.endpoint, params = params):
+            yield element if not query else DataRecord(*RECORD_FIELDS(element)) if raw else DATA_MODEL.validate_python(element)
+
+    @typing.overload
+    def stream(self, query: typing.Literal[True] = True, page: typing.Optional[int] = None, raw: typing.Literal[False] = False) -> typing.AsyncIterator[DataModel]: ...
 
     @typing.overload
-    async def _perform(self, query: typing.Literal[True]) -> list[DataModel]: ...
+    def stream(self, query: typing.Literal[True] = True, page: typing.Optional[int] = None, raw: typing.Literal[True] = True) -> typing.AsyncIterator[DataRecord]: ...
 
     @typing.overload
-    async def _perform(self, query: typing.Literal[False]) -> list[UUID]: ...
+    def stream(self, query: typing.Literal[False], page: typing.Optional[int] = None, raw: bool = False) -> typing.AsyncIterator[UUID]: ...
 
-    async def _perform(self, query: bool) -> list[DataModel] | list[UUID]:
-        payload = await self.client.request(self.endpoint, params = self.params | {"query": str(query).lower()})
-        return [DataModel(**item) for item in payload] if query else payload
+    def stream(self, query: bool = True, page: typing.Optional[int] = None, raw: bool = False) -> typing.AsyncIterator[DataModel | DataRecord | UUID]:
+        return self._stream(query, page, raw)
 
     async def fetch(self) -> list[UUID]:
         return await self._perform(query = False)
 
-    async def query(self) -> list[DataModel]:
-        return await self._perform(query = True)
+    @typing.overload
+    async def query(self, raw: typing.Literal[False] = False) -> list[DataModel]: ...
+
+    @typing.overload
+    async def query(self, raw: typing.Literal[True]) -> list[DataRecord]: ...
+
+    async def query(self, raw: bool = False) -> list[DataModel] | list[DataRecord]:
+        return await self._perform(query = True, raw = raw)
+
+    # Pagination
+    @typing.overload
+    def walk(self, query: typing.Literal[True], limit: typing.Optional[int] = None, raw: bool = False, stream: bool = False) -> typing.AsyncIterator[DataModel]: ...
+
+    @typing.overload
+    def walk(self, query: typing.Literal[False] = False, limit: typing.Optional[int] = None, raw: bool = False, stream: bool = False) -> typing.AsyncIterator[UUID]: ...
+
+    async def walk(self, query: bool = False, limit: typing.Optional[int] = None, raw: bool = False, stream: bool = False) -> typing.AsyncIterator[DataModel | DataRecord | UUID]:
+        count, page, seen = self.params.get("count", 25), self.params.get("page", 0), 0
+        if stream:
+
+            # Pages are streamed one after another, the next one is only requested once
+            # the current one has ended, since that's when it's known to be full.
+            while limit is None or seen < limit:
+                received = 0
+                async with aclosing(self._stream(query, page, raw)) as items:
+                    async for item in items:
+                        yield item
+                        received += 1
+                        if limit is not None and seen + received >= limit:
+                            return
+
+                seen += received
+                if received < count:
+                    return
+
+                page += 1
+
+            return
+
+        # The next page is requested as soon as the current one arrives,
+        # so it downloads while the caller is still consuming this one.
+        pending = asyncio.ensure_future(self._perform(query, page, raw))
+        try:
+            while True:
+                items = await pending
+                last = len(items) < count or (limit is not None and seen + len(items) >= limit)
+                if not last:
+                    page += 1
+                    pending = asyncio.ensure_future(self._perform(query, page, raw))
+
+                for item in items[:None if limit is None else limit - seen]:
+                    yield item
+
+                seen += len(items)
+                if last:
+                    return
+
+        finally:
+            pending.cancel()
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())  # A prefetch failing instead of cancelling isn't logged as never retrieved
+
+    def __aiter__(self) -> typing.AsyncIterator[UUID]:
+        return self.walk()
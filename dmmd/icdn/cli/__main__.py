@@ -2,38 +2,72 @@
 
 # Modules
 import os
+import re
+import sys
 import typing
-import mimetypes
 from time import time as take_time
 from pathlib import Path
 from datetime import datetime
+from contextlib import asynccontextmanager
 
 import asyncclick
-from humanize import precisedelta, naturalsize
 
 from dmmd.exceptions import DmmDException
-from dmmd.icdn import DataModel, SortOrder, SortType, iCDN
+from dmmd.transfer import CHUNK_SIZE
 from dmmd.icdn.cli.parameters import attach, search_params, generic_add
 
+# Heavy modules (aiohttp, pydantic, humanize, ...) are only imported by the commands
+# that need them, keeping startup fast for --help and shell pipelines.
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import BuiltCallable, DataModel, Mirror, PlannedCallable, Progress, ProgressCallback, iCDN
+
 # Initialization
-def get_cdn() -> iCDN:
-    return iCDN(os.environ.get("ICDN_URL", "https://dmmdgm.dev"))
+def get_cdn(local: bool = False) -> "iCDN":
+    from dmmd.icdn import iCDN
+    from dmmd.scheduler import RateLimit, Scheduler, SchedulerOptions
+
+    urls = [url.strip() for url in os.environ.get("ICDN_URL", "https://dmmdgm.dev").split(",") if url.strip()]
+    rate = asyncclick.get_current_context().meta.get("rate")
+    return iCDN(
+        urls,
+        mirror = get_mirror() if local else None,
+        scheduler = Scheduler(SchedulerOptions(RateLimit(rate))) if rate else None
+    )
+
+def get_mirror() -> "Mirror":
+    from dmmd.icdn import Mirror
+    local = Mirror(os.environ.get("ICDN_MIRROR", Path.home() / ".cache" / "dmmd" / "icdn.db"))
+    asyncclick.get_current_context().call_on_close(local.close)
+    return local
+
+@asynccontextmanager
+async def pooled_connections() -> typing.AsyncIterator[None]:
+    try:
+        yield
+
+    finally:
+        if (pool := sys.modules.get("dmmd.pool")) is not None:
+            await pool.DEFAULT_POOL.close()
 
 @asyncclick.group(epilog = "Copyright (c) 2025 iiPython")
-def icdn() -> None:
+@asyncclick.option("--rate", type = float, required = False, default = None, help = "Maximum number of requests sent to the server per second.")
+@asyncclick.pass_context
+async def icdn(ctx: asyncclick.Context, rate: typing.Optional[float]) -> None:
     """A Python-based CLI for DmmD's iCDN.
 
     \b
     Source code       : https://github.com/iiPythonx/dmmd-py
     API documentation : https://github.com/DmmDGM/dmmd-icdn
     """
-    return
+    ctx.meta["rate"] = rate
+    await ctx.with_async_resource(pooled_connections())  # Close pooled connections once the command finishes
 
 # Generic UI
 def field(title: str, value: str) -> None:
     print(f"\n  \033[34m{title}:\n    \033[33m{value}")
 
-def full_view(response: DataModel) -> None:
+def full_view(response: "DataModel") -> None:
+    from humanize import precisedelta
     print(f"\033[90m* \033[36m{response.name}\033[0m \033[90m(\033[33m{response.uuid}\033[0m\033[90m, {response.mime})")
     field("File tags", ", ".join(f"\033[32m{tag}\033[90m" for tag in response.tags))
     field("Added at", response.time.strftime("%D %I:%M:%S %p (Local)"))
@@ -47,71 +81,323 @@ def full_view(response: DataModel) -> None:
 
     print()
 
+async def results(endpoint: "BuiltCallable | PlannedCallable", query: bool, all: bool, limit: typing.Optional[int]) -> typing.AsyncIterator[typing.Any]:
+    if all:
+        async for item in endpoint.walk(query, limit):
+            yield item
+
+    else:
+        for item in await (endpoint.query() if query else endpoint.fetch()):
+            yield item
+
+UUID_SHAPE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+def read_uuids(uuids: tuple[str]) -> list[str]:
+    if not uuids or uuids == ("-",):
+        return [line.strip() for line in sys.stdin if line.strip()]
+
+    return [*uuids]
+
+def progress_bar(width: int = 30) -> "ProgressCallback":
+    from humanize import naturalsize
+    last_draw = 0.0
+
+    async def draw(progress: "Progress") -> None:
+        nonlocal last_draw
+        if progress.sent != progress.total and take_time() - last_draw < .1:
+            return
+
+        last_draw = take_time()
+        filled = round(width * (progress.sent / progress.total)) if progress.total else width
+        eta = f"{round(progress.eta)}s" if progress.eta is not None else "--"
+        print(
+            f"\r\033[2K\033[36m[{'#' * filled}\033[90m{'-' * (width - filled)}\033[36m] " +
+            f"\033[33m{naturalsize(progress.sent)}\033[90m / \033[33m{naturalsize(progress.total)} " +
+            f"\033[90m@ \033[36m{naturalsize(progress.rate)}/s\033[90m, ETA \033[36m{eta}\033[0m",
+            end = "", flush = True
+        )
+
+    return draw
+
 # Commands
 @icdn.command()
-@asyncclick.argument("uuid")
-@asyncclick.argument("file", type = asyncclick.Path(dir_okay = False, path_type = Path), required = False)
-async def download(uuid: str, file: typing.Optional[Path] = None) -> None:
+@asyncclick.argument("uuids", nargs = -1, required = False)
+@asyncclick.option("--output", "-o", type = asyncclick.Path(path_type = Path), required = False, help = "Directory to download into, or the file name when downloading a single UUID.")
+@asyncclick.option("--connections", type = int, required = False, default = 8, help = "Maximum number of connections open at once, across all files.")
+@asyncclick.option("--segment-size", type = int, required = False, default = 8 * 1024 ** 2, help = "Files larger than this are split into parallel Range requests of this many bytes.")
+@asyncclick.option("--search", type = bool, is_flag = True, required = False, default = False, help = "Treat the arguments as a search name and download every match.")
+@asyncclick.option("--expression", type = bool, is_flag = True, required = False, default = False, help = "Treat the arguments as a find expression and download every match.")
+async def download(uuids: tuple[str], output: typing.Optional[Path], connections: int, segment_size: int, search: bool, expression: bool, limit: typing.Optional[int], local: bool, **kwargs) -> None:
+    """Download one or more UUIDs (or every result of a search), resuming partial downloads."""
+    import mimetypes
+    from humanize import naturalsize
+    from dmmd.icdn import DownloadResult, SortOrder, SortType
+
+    # `icdn download UUID FILE` predates --output and keeps working
+    if not (search or expression):
+        if len(uuids) == 2 and output is None and not UUID_SHAPE.fullmatch(uuids[1]):
+            uuids, output = uuids[:1], Path(uuids[1])
+
+        for argument in uuids:
+            if argument != "-" and not UUID_SHAPE.fullmatch(argument):
+                raise asyncclick.UsageError(f"{argument} isn't a UUID, pass where to save files with --output.")
+
+    cdn = get_cdn(local)
+    order = {"ASC": SortOrder.ASCENDING, "DSC": SortOrder.DESCENDING}[kwargs["order"].upper()]
+    sort = {"NAME": SortType.NAME, "TIME": SortType.TIME, "UUID": SortType.UUID, "SIZE": SortType.SIZE}[kwargs["sort"].upper()]
     try:
-        cdn = get_cdn()
+        if search:
+            endpoint = cdn.search(**kwargs | {
+                "name": " ".join(uuids) if uuids else None,
+                "order": order,
+                "sort": sort,
+                "tags": kwargs["tags"].split(",") if kwargs["tags"] is not None else None
+            })
+            items = [item async for item in endpoint.walk(query = True, limit = limit)]
+
+        elif expression:
+            items = [item async for item in cdn.find(" ".join(uuids), kwargs["count"], order = order, sort = sort).walk(query = True, limit = limit)]
+
+        else:
+            items = []
+            for uuid, item in zip(requested := read_uuids(uuids), await cdn.query_many(requested, connections)):
+                if isinstance(item, Exception):
+                    print(f"\033[31mFailed to query \033[33m{uuid}\033[31m:\n  > {item}\033[0m")
+                    continue
+
+                items.append(item)
 
-        # Calculate output file
-        data = await cdn.query(uuid)
-        path = file or Path(f"{data.name}{mimetypes.guess_extension(data.mime)}")
+    except DmmDException as e:
+        return print(f"\033[2K\r\033[31mFailed to download:\n  > {e}")
 
-        path.write_bytes(await cdn.file(uuid))
-        print(f"\033[32m✓ Download complete as \033[34m{path.name}\033[32m.\033[0m")
+    # Names come from the server, so only their last component is used, and clashes get the UUID appended
+    targets, taken = {}, set()
+    for item in items:
+        name = f"{Path(item.name).name or item.uuid}{mimetypes.guess_extension(item.mime) or ''}"
+        if name in taken:
+            name = f"{Path(name).stem} ({item.uuid}){Path(name).suffix}"
 
-    except DmmDException as e:
-        print(f"\033[2K\r\033[31mFailed to download:\n  > {e}")
+        taken.add(name)
+        targets[item.uuid] = (output / name) if output is not None and (len(items) > 1 or output.is_dir()) else (output or Path(name))
+
+    last_draw = 0.0
+
+    def report(result: DownloadResult) -> None:
+        nonlocal last_draw
+        finished = len(result.downloaded) + len(result.failed)
+        if finished != len(targets) and take_time() - last_draw < .1:
+            return
+
+        last_draw = take_time()
+        print(
+            f"\r\033[2K\033[36m[{finished}/{len(targets)}] \033[33m{naturalsize(result.transferred + result.resumed)}\033[90m / " +
+            f"\033[33m{naturalsize(result.total)} \033[90m@ \033[36m{naturalsize(result.throughput)}/s\033[0m",
+            end = "", flush = True
+        )
+
+    result = await cdn.download_many(targets, connections, segment_size, progress = report)
+    print()
+    for uuid, error in result.failed.items():
+        print(f"\033[31mFailed to download \033[33m{uuid}\033[31m:\n  > {error}\033[0m")
+
+    print(
+        f"\033[32m✓ Download complete \033[90min \033[36m{round(result.seconds, 1)}s\033[90m " +
+        f"(\033[36m{naturalsize(result.throughput)}/s\033[90m). Downloaded \033[33m{len(result.downloaded)}\033[90m, " +
+        f"failed \033[33m{len(result.failed)}\033[90m.\033[0m"
+    )
+
+attach([param for param in search_params if param[0] not in ("--query", "--all", "--uuid")], download)
 
 @icdn.command()
-@asyncclick.argument("uuid")
-async def query(uuid: str) -> None:
-    try:
-        full_view(await get_cdn().query(uuid))
+@asyncclick.option("--concurrency", type = int, required = False, default = 16, help = "Maximum number of UUIDs queried at once.")
+@asyncclick.argument("uuids", nargs = -1, required = False)
+async def query(uuids: tuple[str], concurrency: int) -> None:
+    for uuid, result in zip(uuids := read_uuids(uuids), await get_cdn().query_many(uuids, concurrency)):
+        if isinstance(result, Exception):
+            print(f"\033[2K\r\033[31mFailed to perform query on \033[33m{uuid}\033[31m:\n  > {result}\033[0m")
+            continue
 
-    except DmmDException as e:
-        print(f"\033[2K\r\033[31mFailed to perform query:\n  > {e}")
+        full_view(result)
 
 @icdn.command()
 @asyncclick.argument("name", nargs = -1, required = False)
-async def search(name: tuple[str], query: bool, **kwargs) -> None:
-    response = await getattr(get_cdn().search(**kwargs | {
+async def search(name: tuple[str], query: bool, all: bool, limit: typing.Optional[int], local: bool, **kwargs) -> None:
+    from dmmd.icdn import SortOrder, SortType
+    endpoint = get_cdn(local).search(**kwargs | {
         "name": " ".join(name) if name else None,
         "order": {"ASC": SortOrder.ASCENDING, "DSC": SortOrder.DESCENDING}[kwargs["order"].upper()],
         "sort": {"NAME": SortType.NAME, "TIME": SortType.TIME, "UUID": SortType.UUID, "SIZE": SortType.SIZE}[kwargs["sort"].upper()],
         "tags": kwargs["tags"].split(",") if kwargs["tags"] is not None else None
-    }), "query" if query else "fetch")()
-    if not query:
-        [print(f"* \033[32m{uuid}\033[0m") for uuid in response]
+    })
+    async for item in results(endpoint, query, all, limit):
+        if not query:
+            print(f"* \033[32m{item}\033[0m")
 
-    else:
-        [full_view(summary) for summary in response]
+        else:
+            full_view(item)
 
 attach(search_params, search)
 
+@icdn.command()
+@asyncclick.argument("expression", nargs = -1, required = True)
+async def find(expression: tuple[str], query: bool, all: bool, limit: typing.Optional[int], local: bool, count: int, page: typing.Optional[int], order: str, sort: str) -> None:
+    """Search with a boolean expression, e.g. (anime AND 2024) OR (game AND NOT nsfw).
+
+    \b
+    Bare words are tags, other fields are written as name:, mime:, ext: and uuid:,
+    and sizes or millisecond timestamps are compared with size>=N or time<N.
+    """
+    from dmmd.icdn import SortOrder, SortType
+    try:
+        endpoint = get_cdn(local).find(
+            " ".join(expression), count, page or 0,
+            {"ASC": SortOrder.ASCENDING, "DSC": SortOrder.DESCENDING}[order.upper()],
+            {"NAME": SortType.NAME, "TIME": SortType.TIME, "UUID": SortType.UUID, "SIZE": SortType.SIZE}[sort.upper()]
+        )
+        async for item in results(endpoint, query, all, limit):
+            if not query:
+                print(f"* \033[32m{item}\033[0m")
+
+            else:
+                full_view(item)
+
+    except DmmDException as e:
+        print(f"\033[2K\r\033[31mFailed to search:\n  > {e}")
+
+attach([param for param in search_params if param[0] in ("--count", "--order", "--page", "--sort", "--query", "--all", "--limit", "--local")], find)
+
+@icdn.command("sync")
+@asyncclick.argument("directory", type = asyncclick.Path(file_okay = False, path_type = Path))
+@asyncclick.option("--concurrency", type = int, required = False, default = 8, help = "Maximum number of files downloaded at once.")
+@asyncclick.option("--prune", type = bool, is_flag = True, required = False, default = False, help = "Remove local files whose content was removed upstream, rather than only reporting them.")
+async def sync_directory(directory: Path, concurrency: int, prune: bool) -> None:
+    try:
+        start_time = take_time()
+        result = await get_cdn().sync(directory, concurrency, prune = prune)
+        for uuid, error in result.failed.items():
+            print(f"\033[31mFailed to download \033[33m{uuid}\033[31m:\n  > {error}\033[0m")
+
+        print(
+            f"\033[32m✓ Sync complete \033[90min \033[36m{round(take_time() - start_time, 1)}s\033[90m. " +
+            f"Downloaded \033[33m{len(result.downloaded)}\033[90m, unchanged \033[33m{result.skipped}\033[90m, " +
+            f"pruned \033[33m{len(result.pruned)}\033[90m, failed \033[33m{len(result.failed)}\033[90m.\033[0m"
+        )
+        if result.stale:
+            print(f"\033[33m{len(result.stale)}\033[90m local files were removed upstream, rerun with \033[36m--prune\033[90m to delete them.\033[0m")
+
+    except DmmDException as e:
+        print(f"\033[2K\r\033[31mFailed to sync:\n  > {e}")
+
+@icdn.command()
+@asyncclick.option("--cursor", type = asyncclick.Path(dir_okay = False, path_type = Path), required = False, help = "File the position is kept in, so a restarted watch continues where it stopped.")
+@asyncclick.option("--interval", type = float, required = False, default = 5.0, help = "Seconds between polls to start with.")
+@asyncclick.option("--min-interval", type = float, required = False, default = 1.0, help = "Shortest time between polls while content keeps changing.")
+@asyncclick.option("--max-interval", type = float, required = False, default = 60.0, help = "Longest time between polls while nothing changes.")
+@asyncclick.option("--reconcile", type = float, required = False, default = 600.0, help = "Seconds between full listings used to notice removals, 0 to disable.")
+@asyncclick.option("--replay", type = bool, is_flag = True, required = False, default = False, help = "Report all existing content as added before watching for changes.")
+async def watch(cursor: typing.Optional[Path], interval: float, min_interval: float, max_interval: float, reconcile: float, replay: bool) -> None:
+    """Print added, updated and removed content as JSON lines."""
+    import json
+    from dmmd.icdn import WatchCursor
+
+    position = WatchCursor.load(cursor) if cursor is not None else WatchCursor()
+    try:
+        async for event in get_cdn().watch(position, interval, min_interval, max_interval, reconcile or None, replay, checkpoint = cursor):
+            print(json.dumps(event.json()), flush = True)
+
+    except DmmDException as e:
+        print(f"\033[2K\r\033[31mFailed to watch:\n  > {e}", file = sys.stderr)
+
+@icdn.command()
+@asyncclick.argument("source", type = asyncclick.Path(exists = True, path_type = Path))
+@asyncclick.option("--concurrency", type = int, required = False, default = 4, help = "Maximum number of files uploaded at once.")
+@asyncclick.option("--token", type = str, required = False, help = "Token to use for uploading.")
+@asyncclick.option("--index", type = asyncclick.Path(dir_okay = False, path_type = Path), required = False, help = "Hash index used to skip content that was already uploaded.")
+@asyncclick.option("--no-index", type = bool, is_flag = True, required = False, default = False, help = "Upload everything, without checking or updating the hash index.")
+async def push(source: Path, concurrency: int, token: typing.Optional[str], index: typing.Optional[Path], no_index: bool) -> None:
+    """Upload a directory, or a JSONL/CSV manifest of files, without prompting."""
+    from dmmd.icdn import HashIndex, PushItem
+    from dmmd.icdn.push import load_items
+
+    hashes = None
+    if not no_index:
+        hashes = HashIndex(index or os.environ.get("ICDN_PUSH_INDEX", Path.home() / ".cache" / "dmmd" / "push.db"))
+        asyncclick.get_current_context().call_on_close(hashes.close)
+
+    items = [*load_items(source)]
+    counts, start_time, last_draw = {"uploaded": 0, "skipped": 0, "failed": 0}, take_time(), 0.0
+
+    def report(item: PushItem, status: str) -> None:
+        nonlocal last_draw
+        counts[status] += 1
+        if sum(counts.values()) != len(items) and take_time() - last_draw < .1:
+            return
+
+        last_draw = take_time()
+        print(
+            f"\r\033[2K\033[36m[{sum(counts.values())}/{len(items)}] \033[90mUploaded \033[33m{counts['uploaded']}\033[90m, " +
+            f"skipped \033[33m{counts['skipped']}\033[90m, failed \033[33m{counts['failed']}\033[0m",
+            end = "", flush = True
+        )
+
+    try:
+        result = await get_cdn().push(items, hashes, concurrency, token, report)
+        print()
+        for path, error in result.failed.items():
+            print(f"\033[31mFailed to upload \033[33m{path}\033[31m:\n  > {error}\033[0m")
+
+        print(f"\033[32m✓ Push complete \033[90min \033[36m{round(take_time() - start_time, 1)}s\033[90m.\033[0m")
+
+    except DmmDException as e:
+        print(f"\033[2K\r\033[31mFailed to push:\n  > {e}")
+
+@icdn.group()
+def mirror() -> None:
+    """Manage the local SQLite mirror used by `search --local`."""
+    return
+
+@mirror.command()
+@asyncclick.option("--incremental", type = bool, is_flag = True, required = False, default = False, help = "Only pull content newer than the latest mirrored item.")
+@asyncclick.option("--count", type = int, required = False, default = 500, help = "The number of items fetched per page.")
+async def refresh(incremental: bool, count: int) -> None:
+    try:
+        local, start_time = get_mirror(), take_time()
+        stored, removed = await local.refresh(get_cdn(), not incremental, count)
+        print(
+            f"\033[32m✓ Mirror refreshed \033[90min \033[36m{round(take_time() - start_time, 1)}s\033[90m. " +
+            f"Stored \033[33m{stored}\033[90m, removed \033[33m{removed}\033[90m, total \033[33m{len(local)}\033[90m.\033[0m"
+        )
+
+    except DmmDException as e:
+        print(f"\033[2K\r\033[31mFailed to refresh mirror:\n  > {e}")
+
 @icdn.command()
 @asyncclick.option("--count", type = int, required = False, default = 25, help = "The number of UUIDs returned per page.")
 @asyncclick.option("--page", type = int, required = False, default = 1, help = "Page offset.")
 @asyncclick.option("--query", type = bool, is_flag = True, required = False, default = False, help = "Show entire summaries instead of just UUIDs.")
-async def list(count: int, page: int, query: bool) -> None:
-    response = await getattr(get_cdn().list(count, page - 1), "query" if query else "fetch")()
-    if not response:
-        return print("\033[31mNo items were returned.\033[0m")
+@asyncclick.option("--all", type = bool, is_flag = True, required = False, default = False, help = "Keep fetching pages until the end of the store is reached.")
+@asyncclick.option("--limit", type = int, required = False, default = None, help = "Maximum number of items returned when using --all.")
+async def list(count: int, page: int, query: bool, all: bool, limit: typing.Optional[int]) -> None:
+    empty = True
+    async for item in results(get_cdn().list(count, page - 1), query, all, limit):
+        empty = False
+        if not query:
+            print(f"  * \033[32m{item}\033[0m")
 
-    if not query:
-        print("\n".join(f"  * \033[32m{uuid}\033[0m" for uuid in response))
+        else:
+            full_view(item)
 
-    else:
-        [full_view(summary) for summary in response]
+    if empty:
+        print("\033[31mNo items were returned.\033[0m")
 
 async def upload(
     file: typing.Optional[Path] = None,
     token: typing.Optional[str] = None,
     time: typing.Optional[int] = None,
     name: typing.Optional[tuple[str]] = None,
-    uuid: typing.Optional[str] = None
+    uuid: typing.Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    mmap: bool = False
 ) -> None:
     if file and not file.is_file():
         return print("\033[31m--file must be a valid file that \033[4mactually exists\033[24m.")
@@ -151,12 +437,15 @@ async def upload(
             "data": data,
             "tags": tags,
             "time": datetime.fromtimestamp(time / 1000) if time is not None else datetime.now(),
-            "token": token
+            "token": token,
+            "chunk_size": chunk_size,
+            "progress": progress_bar() if file is not None else None,
+            "use_mmap": mmap
         } | ({"uuid": uuid} if uuid is not None else {}) | ({"file": file} if file is not None else {})
         response = await getattr(get_cdn(), "add" if uuid is None else "update")(**kwargs)
 
         print(
-            f"\r\033[32m✓ Upload complete \033[90min \033[36m{round(take_time() - start_time, 1)}s\033[90m. " +
+            f"\r\033[2K\033[32m✓ Upload complete \033[90min \033[36m{round(take_time() - start_time, 1)}s\033[90m. " +
             f"{'New ' if uuid is None else ''}UUID: \033[33m{response.uuid}\033[90m."
         )
 
@@ -166,8 +455,15 @@ async def upload(
 @icdn.command()
 @asyncclick.option("--file", type = asyncclick.Path(path_type = Path, exists = True, dir_okay = False), required = True, help = "File to upload to the iCDN.")
 @asyncclick.argument("name", nargs = -1, required = False)
-async def add(file: Path, token: typing.Optional[str] = None, time: typing.Optional[int] = None, name: typing.Optional[tuple[str]] = None) -> None:
-    await upload(file, token, time, name)
+async def add(
+    file: Path,
+    token: typing.Optional[str] = None,
+    time: typing.Optional[int] = None,
+    name: typing.Optional[tuple[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    mmap: bool = False
+) -> None:
+    await upload(file, token, time, name, chunk_size = chunk_size, mmap = mmap)
 
 attach(generic_add, add)
 
@@ -180,25 +476,29 @@ async def update(
     file: typing.Optional[Path] = None,
     token: typing.Optional[str] = None,
     time: typing.Optional[int] = None,
-    name: typing.Optional[tuple[str]] = None
+    name: typing.Optional[tuple[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    mmap: bool = False
 ) -> None:
-    await upload(file, token, time, name, uuid)
+    await upload(file, token, time, name, uuid, chunk_size, mmap)
 
 attach(generic_add, update)
 
 @icdn.command()
 @asyncclick.option("--token", type = str, required = False, help = "Token to use for uploading.")
-@asyncclick.argument("uuid")
-async def remove(uuid: str, token: typing.Optional[str] = None) -> None:
-    try:
-        await get_cdn().remove(uuid, token)
-        print(f"\033[32m✓ Removed \033[33{uuid}\033[32m without issues.")
+@asyncclick.option("--concurrency", type = int, required = False, default = 16, help = "Maximum number of UUIDs removed at once.")
+@asyncclick.argument("uuids", nargs = -1, required = False)
+async def remove(uuids: tuple[str], concurrency: int, token: typing.Optional[str] = None) -> None:
+    for uuid, result in zip(uuids := read_uuids(uuids), await get_cdn().remove_many(uuids, token, concurrency)):
+        if isinstance(result, Exception):
+            print(f"\033[2K\r\033[31mFailed to remove \033[33m{uuid}\033[31m:\n  > {result}\033[0m")
+            continue
 
-    except DmmDException as e:
-        print(f"\033[2K\r\033[31mFailed to remove:\n  > {e}")
+        print(f"\033[32m✓ Removed \033[33m{uuid}\033[32m without issues.\033[0m")
 
 @icdn.command()
 async def details() -> None:
+    from humanize import naturalsize
     store = await get_cdn().details()
     print(f"\033[90mCurrent usage: \033[36m{naturalsize(store.store_size)} \033[90m/ \033[36m{naturalsize(store.store_limit)} \033[90m(\033[36m{round((store.store_size / store.store_limit) * 100, 1)}%\033[90m)")
     print(f"\033[90mFile size limit: \033[36m{naturalsize(store.file_limit)}\033[90m, Current files: \033[36m{store.store_length}\033[90m, Protected: {'\033[31myes' if store.protected else '\033[32mno'}")
@@ -3,13 +3,15 @@
 import asyncclick
 from typing import Callable
 
+from dmmd.transfer import CHUNK_SIZE
+
 # Actual parameter lists
 search_params = [
     ("--begin",     int,                                                                         False, None,   "All content must have an associated time after the specified timestamp."),
     ("--end",       int,                                                                         False, None,   "All content must have an associated time before the specified timestamp."),
     ("--minimum",   int,                                                                         False, None,   "Content must have have a size in bytes greater then or equal to this."),
     ("--maximum",   int,                                                                         False, None,   "Content must have have a size in bytes less then or equal to this."),
-    ("--count",     int,                                                                         True,  None,   "The number of UUIDs returned per page."),
+    ("--count",     int,                                                                         False, 25,     "The number of UUIDs returned per page."),
     ("--loose",     bool,                                                                        False, False,  "If true, only require one filter to be true instead of all."),
     ("--order",     asyncclick.Choice(["asc", "dsc"], case_sensitive = False),                   False, "dsc",  "Sort UUIDs by ascending or descending order."),
     ("--page",      int,                                                                         False, None,   "Page offset."),
@@ -18,12 +20,17 @@ search_params = [
     ("--uuid",      str,                                                                         False, None,   "Filter by an exact UUID."),
     ("--mime",      str,                                                                         False, None,   "Filter by an exact mimetype."),
     ("--extension", str,                                                                         False, None,   "Filter by an exact extension, excluding the dot."),
-    ("--query",     bool,                                                                        True,  False,  "Show entire summaries instead of just UUIDs.")
+    ("--query",     bool,                                                                        True,  False,  "Show entire summaries instead of just UUIDs."),
+    ("--all",       bool,                                                                        True,  False,  "Keep fetching pages until the end of the results is reached."),
+    ("--limit",     int,                                                                         False, None,   "Maximum number of items returned when using --all."),
+    ("--local",     bool,                                                                        True,  False,  "Search the local mirror instead of the server.")
 ]
 
 generic_add = [
-    ("--token", str, False, None, "Token to use for uploading."),
-    ("--time",  int, False, None, "Millisecond based timestamp to use instead of the current time."),
+    ("--token",      str,  False, None,       "Token to use for uploading."),
+    ("--time",       int,  False, None,       "Millisecond based timestamp to use instead of the current time."),
+    ("--chunk-size", int,  False, CHUNK_SIZE, "Number of bytes sent per chunk while uploading."),
+    ("--mmap",       bool, True,  False,      "Read the file through a memory map instead of buffered reads."),
 ]
 
 # Handle attachment phase
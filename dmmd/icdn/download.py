@@ -0,0 +1,200 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import typing
+import asyncio
+from pathlib import Path
+from time import monotonic
+from dataclasses import dataclass, field
+
+from aiohttp import ClientError, ClientResponse
+
+from dmmd.client import CHUNK_SIZE
+from dmmd.transfer import Segment, TransferState, content_range, state_path, validator
+from dmmd.exceptions import DmmDException
+from dmmd.icdn._typing import UUID
+
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import iCDN
+
+SEGMENT_SIZE = 8 * 1024 ** 2
+SAVE_EVERY   = 4 * 1024 ** 2  # Bytes written to a segment between saves of the transfer state
+
+# Results
+@dataclass
+class DownloadResult:
+    downloaded:  dict[UUID, Path]           = field(default_factory = dict)
+    failed:      dict[UUID, DmmDException]  = field(default_factory = dict)
+    total:       int                        = 0  # Sizes of every file started so far
+    transferred: int                        = 0  # Bytes received during this run
+    resumed:     int                        = 0  # Bytes already on disk from an earlier run
+    started:     float                      = field(default_factory = monotonic)
+    finished:    typing.Optional[float]     = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or monotonic()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        return self.transferred / self.seconds if self.seconds else 0.0
+
+type DownloadCallback = typing.Callable[[DownloadResult], None]
+
+class Restart(Exception):
+    pass
+
+# Main routine
+async def download_many(
+    cdn:          "iCDN",
+    targets:      typing.Iterable[tuple[UUID, Path]],
+    connections:  int                               = 8,
+    segment_size: int                               = SEGMENT_SIZE,
+    chunk_size:   int                               = CHUNK_SIZE,
+    progress:     typing.Optional[DownloadCallback] = None
+) -> DownloadResult:
+    result, budget = DownloadResult(), asyncio.Semaphore(connections)
+
+    def report() -> None:
+        if progress is not None:
+            progress(result)
+
+    # Writes one response into its segment, which is saved periodically so a crash loses little
+    async def receive(response: ClientResponse, partial: Path, state: TransferState, state_file: Path, segment: Segment) -> None:
+        since_save = 0
+        with partial.open("r+b") as handle:
+            handle.seek(segment.offset)
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    chunk = chunk[:segment.end + 1 - segment.offset]
+                    handle.write(chunk)
+                    segment.offset += len(chunk)
+                    result.transferred += len(chunk)
+                    report()
+
+                    since_save += len(chunk)
+                    if since_save >= SAVE_EVERY:
+                        handle.flush()
+                        state.save(state_file)
+                        since_save = 0
+
+            finally:
+                handle.flush()
+                state.save(state_file)
+
+        if not segment.done:
+            raise DmmDException(f"Server closed the connection after {segment.offset - segment.start} bytes of a segment.")
+
+    def ranged(segment: Segment, state: typing.Optional[TransferState]) -> dict[str, str]:
+        headers = {"Range": f"bytes={segment.offset}-{segment.end}"}
+        if state is not None and state.validator:
+            headers["If-Range"] = state.validator
+
+        return headers
+
+    async def fetch_segment(endpoint: str, partial: Path, state: TransferState, state_file: Path, segment: Segment) -> None:
+        async with budget, cdn.client.response(endpoint, headers = ranged(segment, state)) as response:
+            if response.status != 206 or content_range(response) != (segment.offset, state.size):
+                raise Restart  # The file changed upstream since the transfer started
+
+            await receive(response, partial, state, state_file, segment)
+
+    # Streams the whole body when the server doesn't do ranges, no resuming is possible then
+    async def receive_whole(response: ClientResponse, partial: Path) -> None:
+        if response.content_length is not None:
+            result.total += response.content_length
+
+        with partial.open("wb") as handle:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                handle.write(chunk)
+                result.transferred += len(chunk)
+                report()
+
+    # The first request doubles as the probe: its Content-Range reveals the total size, and
+    # anything past the first segment is then fetched in parallel.
+    async def fetch(uuid: UUID, path: Path) -> None:
+        endpoint = f"/file/{uuid}"
+        partial = path.with_name(f"{path.name}.part")
+        state_file = state_path(partial)
+        path.parent.mkdir(parents = True, exist_ok = True)
+        state = TransferState.load(state_file) if partial.is_file() else None
+        if state is not None and partial.stat().st_size != state.size:
+            state = None
+
+        first = next((segment for segment in state.segments if not segment.done), None) if state else Segment(0, segment_size - 1, 0)
+        if first is not None:
+            async with budget, cdn.client.response(endpoint, headers = ranged(first, state)) as response:
+                start, size = content_range(response)
+                if response.status == 416:
+                    if size != 0:
+                        raise Restart
+
+                    state = None
+                    partial.write_bytes(b"")
+
+                elif response.status == 206 and size is not None and start == first.offset and (state is None or state.size == size):
+                    if state is None:
+                        state = TransferState.plan(size, validator(response), segment_size)
+                        with partial.open("wb") as handle:
+                            handle.truncate(size)
+
+                        first = state.segments[0]
+
+                    result.total += state.size
+                    result.resumed += state.received
+                    await receive(response, partial, state, state_file, first)
+
+                elif response.status == 200:
+                    state = None
+                    await receive_whole(response, partial)
+
+                else:
+                    raise Restart
+
+        elif state is not None:
+            result.total += state.size
+            result.resumed += state.received
+
+        if state is not None:
+            segments = [
+                asyncio.ensure_future(fetch_segment(endpoint, partial, state, state_file, segment))
+                for segment in state.segments if not segment.done
+            ]
+            try:
+                await asyncio.gather(*segments)
+
+            finally:
+                for task in segments:
+                    task.cancel()
+
+                await asyncio.gather(*segments, return_exceptions = True)  # Nothing may write to the file afterwards
+
+        partial.replace(path)
+        state_file.unlink(missing_ok = True)
+
+    # Files are started in order and only `connections` at a time, so the budget goes to
+    # finishing files rather than opening a partial transfer for every target at once.
+    files = asyncio.Semaphore(connections)
+
+    async def run(uuid: UUID, path: Path) -> None:
+        async with files:
+            try:
+                try:
+                    await fetch(uuid, path)
+
+                except Restart:
+                    for leftover in (partial := path.with_name(f"{path.name}.part"), state_path(partial)):
+                        leftover.unlink(missing_ok = True)
+
+                    await fetch(uuid, path)
+
+                result.downloaded[uuid] = path
+
+            except (Restart, DmmDException, OSError, ClientError, asyncio.TimeoutError) as e:
+                result.failed[uuid] = e if isinstance(e, DmmDException) else DmmDException(str(e) or "The file changed upstream during the download.")
+
+            report()
+
+    await asyncio.gather(*(run(uuid, path) for uuid, path in targets))
+    result.finished = monotonic()
+    return result
@@ -0,0 +1,193 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import typing
+import sqlite3
+from pathlib import Path
+
+from dmmd.icdn._typing import UUID, BuiltCallable, DataModel, DataRecord, SortOrder, SortType, extension_of
+
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import iCDN
+
+# Schema
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    uuid      TEXT    PRIMARY KEY,
+    name      TEXT    NOT NULL,
+    mime      TEXT    NOT NULL,
+    extension TEXT,
+    size      INTEGER NOT NULL,
+    time      INTEGER NOT NULL,
+    data      TEXT    NOT NULL,
+    tags      TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag  TEXT NOT NULL,
+    uuid TEXT NOT NULL REFERENCES items (uuid) ON DELETE CASCADE,
+    PRIMARY KEY (tag, uuid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_uuid       ON tags  (uuid);
+CREATE INDEX IF NOT EXISTS items_name      ON items (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS items_time      ON items (time);
+CREATE INDEX IF NOT EXISTS items_size      ON items (size);
+CREATE INDEX IF NOT EXISTS items_mime      ON items (mime);
+CREATE INDEX IF NOT EXISTS items_extension ON items (extension);
+"""
+
+COLUMNS = "uuid, name, mime, size, time, data, tags"
+
+# Local search backend
+class LocalCallable(BuiltCallable):
+    def __init__(self, mirror: "Mirror", params: dict) -> None:
+        self.mirror, self.endpoint, self.cache = mirror, "/search", None
+        self.params = {k: v for k, v in params.items() if v is not None}
+
+    async def _perform(self, query: bool, page: typing.Optional[int] = None, raw: bool = False) -> list[DataModel] | list[DataRecord] | list[UUID]:
+        return self.mirror.select(self.params | ({"page": page} if page is not None else {}), query, raw)
+
+    async def _stream(self, query: bool, page: typing.Optional[int] = None, raw: bool = False) -> typing.AsyncIterator[DataModel | DataRecord | UUID]:
+        for item in await self._perform(query, page, raw):
+            yield item
+
+class Mirror:
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents = True, exist_ok = True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread = False)  # Only ever used by one thread at a time
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+        self._tracking = False  # Set during a full refresh, so write-through stores count as seen
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _store(self, items: list[DataModel], track: bool = False) -> None:
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO items ({COLUMNS}, extension) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(
+                item.uuid, item.name, item.mime, item.size, round(item.time.timestamp() * 1000),
+                json.dumps(item.data), json.dumps(item.tags), extension_of(item.mime)
+            ) for item in items]
+        )
+        self.connection.executemany("DELETE FROM tags WHERE uuid = ?", [(item.uuid,) for item in items])
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO tags (tag, uuid) VALUES (?, ?)",
+            [(tag, item.uuid) for item in items for tag in item.tags]
+        )
+        if track:
+            self.connection.executemany("INSERT OR IGNORE INTO seen (uuid) VALUES (?)", [(item.uuid,) for item in items])
+
+    def store(self, items: list[DataModel]) -> None:
+        with self.connection:
+            self._store(items, self._tracking)
+
+    def forget(self, uuid: UUID) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM items WHERE uuid = ?", (uuid,))
+
+    # A full refresh walks the entire catalog and drops anything that no longer exists upstream,
+    # otherwise only items at or after the latest mirrored timestamp are pulled. Every page is
+    # written in its own transaction, so none is left open while waiting on the network.
+    async def refresh(self, cdn: "iCDN", full: bool = True, count: int = 500) -> tuple[int, int]:
+        stored, removed = 0, 0
+        if full:
+            with self.connection:
+                self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS seen (uuid TEXT PRIMARY KEY)")
+                self.connection.execute("DELETE FROM seen")
+
+            source = cdn.list(count).walk(query = True)
+
+        else:
+            latest = self.connection.execute("SELECT MAX(time) FROM items").fetchone()[0]
+            source = cdn.search(
+                begin = latest,
+                count = count,
+                order = SortOrder.ASCENDING,
+                sort = SortType.TIME,
+                remote = True
+            ).walk(query = True)
+
+        self._tracking = full
+        try:
+            batch = []
+            async for item in source:
+                batch.append(item)
+                if len(batch) == count:
+                    with self.connection:
+                        self._store(batch, full)
+
+                    stored, batch = stored + len(batch), []
+
+            with self.connection:
+                self._store(batch, full)
+
+            stored += len(batch)
+            if full:
+                with self.connection:
+                    removed = self.connection.execute("DELETE FROM items WHERE uuid NOT IN (SELECT uuid FROM seen)").rowcount
+
+        finally:
+            self._tracking = False
+
+        return stored, removed
+
+    def search(self, **params) -> LocalCallable:
+        return LocalCallable(self, params)
+
+    def select(self, params: dict, query: bool, raw: bool = False) -> list[DataModel] | list[DataRecord] | list[UUID]:
+        conditions, arguments = [], []
+        for key, condition in [
+            ("begin",     "time >= ?"),
+            ("end",       "time <= ?"),
+            ("minimum",   "size >= ?"),
+            ("maximum",   "size <= ?"),
+            ("uuid",      "uuid = ?"),
+            ("mime",      "mime = ?"),
+            ("extension", "extension = ?")
+        ]:
+            if params.get(key) is not None:
+                conditions.append(condition)
+                arguments.append(params[key])
+
+        if params.get("name"):
+            escaped = params["name"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            arguments.append(f"%{escaped}%")
+
+        for tag in (params.get("tags") or "").split(","):
+            if tag:
+                conditions.append("uuid IN (SELECT uuid FROM tags WHERE tag = ?)")
+                arguments.append(tag)
+
+        loose = params.get("loose") in (True, "true")
+        where = f"WHERE {(' OR ' if loose else ' AND ').join(conditions)}" if conditions else ""
+        column = SortType(params.get("sort", SortType.TIME.value)).value
+        direction = "ASC" if params.get("order") == SortOrder.ASCENDING.value else "DESC"
+        count, page = params.get("count", 25), params.get("page", 0)
+
+        rows = self.connection.execute(
+            f"SELECT {COLUMNS if query else 'uuid'} FROM items {where} " +
+            f"ORDER BY {column} {direction}, uuid {direction} LIMIT ? OFFSET ?",
+            [*arguments, count, count * page]
+        ).fetchall()
+        if not query:
+            return [row[0] for row in rows]
+
+        if raw:
+            return [
+                DataRecord(json.loads(data), mime, name, size, json.loads(tags), time, uuid)
+                for uuid, name, mime, size, time, data, tags in rows
+            ]
+
+        return [
+            DataModel(uuid = uuid, name = name, mime = mime, size = size, time = time, data = json.loads(data), tags = json.loads(tags))
+            for uuid, name, mime, size, time, data, tags in rows
+        ]
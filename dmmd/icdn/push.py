@@ -0,0 +1,209 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import csv
+import json
+import typing
+import asyncio
+import sqlite3
+from pathlib import Path
+from functools import partial
+from datetime import datetime
+from dataclasses import dataclass, field
+
+from aiohttp import ClientError
+
+from dmmd.client import gather_bounded
+from dmmd.exceptions import DmmDException, InvalidUUID, LargeSource, MissingContent
+from dmmd.icdn._typing import UUID
+from dmmd.icdn.sync import hash_file
+
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import iCDN
+
+# Batch items
+@dataclass
+class PushItem:
+    path: Path
+    name: str
+    tags: list[str]                 = field(default_factory = list)
+    data: dict[str, typing.Any]     = field(default_factory = dict)
+    time: typing.Optional[datetime] = None
+
+@dataclass
+class PushResult:
+    uploaded: dict[Path, UUID]           = field(default_factory = dict)
+    skipped:  dict[Path, UUID]           = field(default_factory = dict)  # Content that was already uploaded
+    failed:   dict[Path, DmmDException]  = field(default_factory = dict)
+
+type PushCallback = typing.Callable[[PushItem, str], None]
+
+# Sources are either a directory, a JSONL manifest with one object per line
+# or a CSV manifest with a header row; manifest paths are relative to the manifest.
+def _item(base: Path, entry: dict[str, typing.Any]) -> PushItem:
+    path = base / entry["file"]
+    tags = entry.get("tags") or []
+    time = entry.get("time")
+    return PushItem(
+        path,
+        entry.get("name") or path.name,
+        [tag.strip() for tag in tags.split(",") if tag.strip()] if isinstance(tags, str) else tags,
+        json.loads(entry["data"]) if isinstance(entry.get("data"), str) and entry["data"] else entry.get("data") or {},
+        datetime.fromtimestamp(int(time) / 1000) if time not in (None, "") else None
+    )
+
+def load_items(source: Path) -> typing.Iterator[PushItem]:
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.is_file():
+                yield PushItem(path, path.name)
+
+        return
+
+    with source.open(newline = "") as handle:
+        if source.suffix.lower() == ".csv":
+            for entry in csv.DictReader(handle):
+                yield _item(source.parent, entry)
+
+            return
+
+        for line in handle:
+            if line.strip():
+                yield _item(source.parent, json.loads(line))
+
+# Hash index
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    origin TEXT    NOT NULL,
+    hash   TEXT    NOT NULL,
+    uuid   TEXT    NOT NULL,
+    size   INTEGER NOT NULL,
+    PRIMARY KEY (origin, hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    path  TEXT    PRIMARY KEY,
+    size  INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    hash  TEXT    NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Tracks which content has been uploaded to which server, along with the hashes of
+# local files by size and mtime so unchanged files aren't hashed again on resume.
+class HashIndex:
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents = True, exist_ok = True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread = False)  # Only ever used by one thread at a time
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(INDEX_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    async def hash(self, path: Path) -> str:
+        stat = path.stat()
+        row = self.connection.execute("SELECT size, mtime, hash FROM files WHERE path = ?", (str(path.resolve()),)).fetchone()
+        if row is not None and row[:2] == (stat.st_size, stat.st_mtime_ns):
+            return row[2]
+
+        digest = await asyncio.to_thread(hash_file, path)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)",
+                (str(path.resolve()), stat.st_size, stat.st_mtime_ns, digest)
+            )
+
+        return digest
+
+    def lookup(self, origin: str, digest: str) -> typing.Optional[UUID]:
+        row = self.connection.execute("SELECT uuid FROM uploads WHERE origin = ? AND hash = ?", (origin, digest)).fetchone()
+        return row[0] if row else None
+
+    def record(self, origin: str, digest: str, uuid: UUID, size: int) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO uploads (origin, hash, uuid, size) VALUES (?, ?, ?, ?)",
+                (origin, digest, uuid, size)
+            )
+
+    def forget(self, origin: str, uuid: UUID) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM uploads WHERE origin = ? AND uuid = ?", (origin, uuid))
+
+# Main routine
+async def push(
+    cdn:         "iCDN",
+    items:       typing.Iterable[PushItem],
+    index:       typing.Optional[HashIndex]    = None,
+    concurrency: int                           = 4,
+    token:       typing.Optional[str]          = None,
+    progress:    typing.Optional[PushCallback] = None
+) -> PushResult:
+    result, origin = PushResult(), cdn.client.pool.origin(cdn.client.url("/"))
+    file_limit = (await cdn.details()).file_limit
+
+    # Identical files within one batch wait on the first upload instead of racing it,
+    # resolving to None if it failed so the next one in line can try instead.
+    in_flight: dict[str, asyncio.Future[typing.Optional[UUID]]] = {}
+
+    def report(item: PushItem, status: str) -> None:
+        if progress is not None:
+            progress(item, status)
+
+    # Content can be removed upstream after it was recorded, so a recorded upload only counts while it still exists
+    async def uploaded(index: HashIndex, digest: str) -> typing.Optional[UUID]:
+        if (uuid := index.lookup(origin, digest)) is None:
+            return None
+
+        try:
+            await cdn.query(uuid)
+
+        except (InvalidUUID, MissingContent):
+            index.forget(origin, uuid)
+            return None
+
+        return uuid
+
+    async def duplicate_of(index: HashIndex, digest: str) -> typing.Optional[UUID]:
+        while (uuid := await uploaded(index, digest)) is None and digest in in_flight:
+            uuid = await asyncio.shield(in_flight[digest])
+            if uuid is not None:
+                break
+
+        return uuid
+
+    async def upload(item: PushItem) -> None:
+        try:
+            size = item.path.stat().st_size
+            if size > file_limit:
+                raise LargeSource(f"{item.path} is {size} bytes, over the server's file limit of {file_limit} bytes.")
+
+            digest = await index.hash(item.path) if index is not None else None
+            if index is not None and digest is not None:
+                if (uuid := await duplicate_of(index, digest)) is not None:
+                    result.skipped[item.path] = uuid
+                    return report(item, "skipped")
+
+                in_flight[digest] = asyncio.get_running_loop().create_future()
+
+            uuid = None
+            try:
+                uuid = (await cdn.add(item.path, item.name, item.data, item.tags, item.time, token)).uuid
+                if index is not None and digest is not None:
+                    index.record(origin, digest, uuid, size)
+
+            finally:
+                if digest is not None:
+                    in_flight.pop(digest).set_result(uuid)
+
+            result.uploaded[item.path] = uuid
+            report(item, "uploaded")
+
+        except (DmmDException, OSError, ClientError, asyncio.TimeoutError) as e:
+            result.failed[item.path] = e if isinstance(e, DmmDException) else DmmDException(str(e))
+            report(item, "failed")
+
+    await gather_bounded([partial(upload, item) for item in items], concurrency)
+    return result
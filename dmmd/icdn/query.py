@@ -0,0 +1,393 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import re
+import typing
+import heapq
+import asyncio
+from itertools import product
+from abc import ABC, abstractmethod
+from datetime import datetime
+from contextlib import AsyncExitStack, aclosing
+from dataclasses import dataclass, field
+
+from dmmd.exceptions import InvalidQuery
+from dmmd.icdn._typing import UUID, DataModel, DataRecord, SortOrder, SortType, extension_of
+
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import iCDN
+
+type Item = DataModel | DataRecord
+
+def _millis(value: datetime | int) -> int:
+    return round(value.timestamp() * 1000) if isinstance(value, datetime) else value
+
+# Expressions, combined with &, | and ~ or parsed from text with parse()
+class Expression(ABC):
+    def __and__(self, other: "Expression") -> "Expression":
+        return And((self, other))
+
+    def __or__(self, other: "Expression") -> "Expression":
+        return Or((self, other))
+
+    def __invert__(self) -> "Expression":
+        return Not(self)
+
+    @abstractmethod
+    def matches(self, item: Item) -> bool:
+        ...
+
+@dataclass(frozen = True)
+class Tag(Expression):
+    value: str
+
+    def matches(self, item: Item) -> bool:
+        return self.value in item.tags
+
+@dataclass(frozen = True)
+class Name(Expression):
+    value: str
+
+    def matches(self, item: Item) -> bool:
+        return self.value.lower() in item.name.lower()
+
+@dataclass(frozen = True)
+class Mime(Expression):
+    value: str
+
+    def matches(self, item: Item) -> bool:
+        return item.mime == self.value
+
+@dataclass(frozen = True)
+class Extension(Expression):
+    value: str
+
+    def matches(self, item: Item) -> bool:
+        return extension_of(item.mime) == self.value
+
+@dataclass(frozen = True)
+class Uuid(Expression):
+    value: str
+
+    def matches(self, item: Item) -> bool:
+        return item.uuid == self.value
+
+@dataclass(frozen = True)
+class Range(Expression):
+    field: typing.Literal["time", "size"]
+    low:   typing.Optional[int] = None  # Both bounds are inclusive, like begin/end and minimum/maximum
+    high:  typing.Optional[int] = None
+
+    def matches(self, item: Item) -> bool:
+        value = _millis(item.time) if self.field == "time" else item.size
+        return (self.low is None or value >= self.low) and (self.high is None or value <= self.high)
+
+@dataclass(frozen = True)
+class And(Expression):
+    children: tuple[Expression, ...]
+
+    def matches(self, item: Item) -> bool:
+        return all(child.matches(item) for child in self.children)
+
+@dataclass(frozen = True)
+class Or(Expression):
+    children: tuple[Expression, ...]
+
+    def matches(self, item: Item) -> bool:
+        return any(child.matches(item) for child in self.children)
+
+@dataclass(frozen = True)
+class Not(Expression):
+    child: Expression
+
+    def matches(self, item: Item) -> bool:
+        return not self.child.matches(item)
+
+# Parsing, e.g. (anime AND 2024) OR (game AND NOT nsfw) or mime:image/png size>=1000.
+# Bare words are tags, words next to each other are ANDed and quotes keep a word literal.
+TOKENS      = re.compile(r'[()]|(?:[^\s()"]|"(?:[^"\\]|\\.)*")+')
+QUOTED      = re.compile(r'"((?:[^"\\]|\\.)*)"')
+COMPARISON  = re.compile(r"(size|time)(>=|<=|>|<|=)(\d+)")
+FIELDS      = {"tag": Tag, "name": Name, "mime": Mime, "ext": Extension, "extension": Extension, "uuid": Uuid}
+KEYWORDS    = {"AND", "OR", "NOT"}
+
+def _unquote(text: str) -> str:
+    return QUOTED.sub(lambda match: re.sub(r"\\(.)", r"\1", match[1]), text)
+
+def _atom(token: str) -> Expression:
+    if (match := COMPARISON.fullmatch(token)) is not None:
+        field, operator, value = match[1], match[2], int(match[3])
+        low, high = {
+            ">=": (value, None), ">": (value + 1, None),
+            "<=": (None, value), "<": (None, value - 1),
+            "=":  (value, value)
+        }[operator]
+        return Range(typing.cast(typing.Literal["time", "size"], field), low, high)
+
+    key, separator, value = token.partition(":")
+    if separator and '"' not in key and key.lower() in FIELDS:
+        if not value:
+            raise InvalidQuery(f"Missing a value after {key}:")
+
+        return FIELDS[key.lower()](_unquote(value))
+
+    return Tag(_unquote(token))
+
+def parse(text: str) -> Expression:
+    tokens, position = TOKENS.findall(text), 0
+
+    def peek() -> typing.Optional[str]:
+        return tokens[position] if position < len(tokens) else None
+
+    def keyword(token: typing.Optional[str]) -> typing.Optional[str]:
+        return token.upper() if token is not None and token.upper() in KEYWORDS else None
+
+    def take() -> str:
+        nonlocal position
+        if (token := peek()) is None:
+            raise InvalidQuery(f"Query {text!r} ended unexpectedly.")
+
+        position += 1
+        return token
+
+    def disjunction() -> Expression:
+        children = [conjunction()]
+        while keyword(peek()) == "OR":
+            take()
+            children.append(conjunction())
+
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def conjunction() -> Expression:
+        children = [negation()]
+        while (token := peek()) is not None and token != ")" and keyword(token) != "OR":
+            if keyword(token) == "AND":
+                take()
+
+            children.append(negation())
+
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def negation() -> Expression:
+        token = take()
+        if keyword(token) == "NOT":
+            return Not(negation())
+
+        if token == "(":
+            inner = disjunction()
+            if take() != ")":
+                raise InvalidQuery(f"Unbalanced parentheses in {text!r}.")
+
+            return inner
+
+        if token == ")" or keyword(token) is not None:
+            raise InvalidQuery(f"Unexpected {token!r} in {text!r}.")
+
+        return _atom(token)
+
+    if not tokens:
+        raise InvalidQuery("Query is empty.")
+
+    expression = disjunction()
+    if peek() is not None:
+        raise InvalidQuery(f"Unexpected {peek()!r} in {text!r}.")
+
+    return expression
+
+# Planning. Expressions are brought into disjunctive normal form, every conjunction becomes
+# one server search and whatever the server can't express (negations, a second name, ...)
+# is checked locally on the results.
+MAX_SEARCHES = 16
+
+type Literal = tuple[Expression, bool]  # A term, and whether it's required rather than excluded
+
+class TooComplex(Exception):
+    pass
+
+def _normal_form(expression: Expression, negated: bool = False) -> set[frozenset[Literal]]:
+    match expression:
+        case Not(child):
+            return _normal_form(child, not negated)
+
+        case And(children) | Or(children) if isinstance(expression, Or) == negated:
+            conjunctions = set()
+            for parts in product(*(_normal_form(child, negated) for child in children)):
+                conjunctions.add(frozenset().union(*parts))
+                if len(conjunctions) > MAX_SEARCHES:
+                    raise TooComplex
+
+            return conjunctions
+
+        case And(children) | Or(children):
+            conjunctions = set().union(*(_normal_form(child, negated) for child in children))
+            if len(conjunctions) > MAX_SEARCHES:
+                raise TooComplex
+
+            return conjunctions
+
+        case _:
+            return {frozenset({(expression, not negated)})}
+
+@dataclass
+class Branch:
+    search:   dict[str, typing.Any]                    # Keyword arguments for iCDN.search()
+    residual: tuple[Literal, ...] = field(default = ())  # Checked locally on every result
+
+    def matches(self, item: Item) -> bool:
+        return all(term.matches(item) == required for term, required in self.residual)
+
+PARAMETERS: dict[type[Expression], str] = {Name: "name", Mime: "mime", Extension: "extension", Uuid: "uuid"}
+BOUNDS = {"time": ("begin", "end"), "size": ("minimum", "maximum")}
+
+def _branch(conjunction: frozenset[Literal]) -> typing.Optional[Branch]:
+    if any((term, not required) in conjunction for term, required in conjunction):
+        return None  # Contradiction, nothing can match
+
+    search: dict[str, typing.Any] = {"tags": []}
+    residual: list[Literal] = []
+    ranges: dict[str, tuple[typing.Optional[int], typing.Optional[int]]] = {}
+    for term, required in sorted(conjunction, key = repr):
+        if not required:
+            residual.append((term, required))
+
+        elif isinstance(term, Tag):
+            search["tags"].append(term.value)
+
+        elif isinstance(term, Range):
+            low, high = ranges.get(term.field, (None, None))
+            ranges[term.field] = (
+                term.low if low is None else low if term.low is None else max(low, term.low),
+                term.high if high is None else high if term.high is None else min(high, term.high)
+            )
+
+        elif (parameter := PARAMETERS[type(term)]) not in search:
+            search[parameter] = term.value
+
+        else:
+            residual.append((term, required))
+
+    for name, (low, high) in ranges.items():
+        if low is not None and high is not None and low > high:
+            return None
+
+        search[BOUNDS[name][0]], search[BOUNDS[name][1]] = low, high
+
+    return Branch(search, tuple(residual))
+
+def plan(expression: Expression) -> list[Branch]:
+    try:
+        conjunctions = _normal_form(expression)
+
+    except TooComplex:
+        return [Branch({}, ((expression, True),))]  # One unfiltered search, checked locally
+
+    # A conjunction containing another one only matches a subset of it
+    minimal = [
+        conjunction for conjunction in conjunctions
+        if not any(other < conjunction for other in conjunctions)
+    ]
+    return [branch for conjunction in sorted(minimal, key = lambda conjunction: sorted(map(repr, conjunction))) if (branch := _branch(conjunction)) is not None]
+
+# Merging, each search is already sorted so a heap over their heads gives the combined order
+class Head[T]:
+    __slots__ = ("key", "index", "item", "reverse")
+
+    def __init__(self, key: typing.Any, index: int, item: T, reverse: bool) -> None:
+        self.key, self.index, self.item, self.reverse = key, index, item, reverse
+
+    def __lt__(self, other: "Head") -> bool:
+        if self.key != other.key:
+            return (self.key > other.key) if self.reverse else (self.key < other.key)
+
+        return self.index < other.index
+
+async def merge[T](streams: list[typing.AsyncIterator[T]], key: typing.Callable[[T], typing.Any], reverse: bool = False) -> typing.AsyncIterator[T]:
+    heads = await asyncio.gather(*(anext(stream, None) for stream in streams))
+    heap = [Head(key(item), index, item, reverse) for index, item in enumerate(heads) if item is not None]
+    heapq.heapify(heap)
+    while heap:
+        head = heap[0]
+        yield head.item
+        if (item := await anext(streams[head.index], None)) is None:
+            heapq.heappop(heap)
+
+        else:
+            heapq.heapreplace(heap, Head(key(item), head.index, item, reverse))
+
+SORT_KEYS: dict[SortType, typing.Callable[[Item], typing.Any]] = {
+    SortType.NAME: lambda item: (item.name, item.uuid),
+    SortType.TIME: lambda item: (_millis(item.time), item.uuid),
+    SortType.UUID: lambda item: item.uuid,
+    SortType.SIZE: lambda item: (item.size, item.uuid)
+}
+
+# Query results, paginated over the merged stream rather than any single search
+class PlannedCallable:
+    def __init__(
+        self,
+        cdn:        "iCDN",
+        expression: Expression,
+        count:      int       = 25,
+        page:       int       = 0,
+        order:      SortOrder = SortOrder.DESCENDING,
+        sort:       SortType  = SortType.TIME,
+        remote:     bool      = False
+    ) -> None:
+        self.cdn, self.expression, self.count, self.page = cdn, expression, count, page
+        self.order, self.sort, self.remote = order, sort, remote
+        self.plan = plan(expression)
+
+    def _search(self, branch: Branch, page: int = 0) -> typing.Any:
+        return self.cdn.search(**branch.search, count = self.count, page = page, order = self.order, sort = self.sort, remote = self.remote)
+
+    # Closed explicitly, so a page being prefetched is cancelled as soon as the merge stops early
+    async def _branch(self, branch: Branch, raw: bool, needed: typing.Optional[int]) -> typing.AsyncIterator[Item]:
+        async with aclosing(self._search(branch).walk(query = True, raw = raw, limit = None if branch.residual else needed)) as items:
+            async for item in items:
+                if branch.matches(item):
+                    yield item
+
+    # Merged searches need full items for sorting and local checks, UUIDs are taken from those
+    async def _items(self, query: bool, raw: bool, limit: typing.Optional[int]) -> typing.AsyncIterator[Item | UUID]:
+        if not self.plan:
+            return
+
+        # A single search without local checks is paginated by the server itself
+        if len(self.plan) == 1 and not self.plan[0].residual:
+            async with aclosing(self._search(self.plan[0], self.page).walk(query, limit, raw)) as items:
+                async for item in items:
+                    yield item
+
+            return
+
+        skip = self.page * self.count
+        needed = None if limit is None else skip + limit
+        seen: set[UUID] = set()
+        async with AsyncExitStack() as stack:
+            streams = [await stack.enter_async_context(aclosing(self._branch(branch, raw or not query, needed))) for branch in self.plan]
+            async for item in merge(streams, SORT_KEYS[self.sort], self.order == SortOrder.DESCENDING):
+                if item.uuid in seen:
+                    continue
+
+                seen.add(item.uuid)
+                if skip:
+                    skip -= 1
+                    continue
+
+                yield item if query else item.uuid
+                if limit is not None and (limit := limit - 1) == 0:
+                    return
+
+    async def fetch(self) -> list[UUID]:
+        return [item async for item in self._items(False, False, self.count)]  # type: ignore
+
+    async def query(self, raw: bool = False) -> list[DataModel] | list[DataRecord]:
+        return [item async for item in self._items(True, raw, self.count)]  # type: ignore
+
+    async def walk(self, query: bool = False, limit: typing.Optional[int] = None, raw: bool = False) -> typing.AsyncIterator[DataModel | DataRecord | UUID]:
+        async with aclosing(self._items(query, raw, limit)) as items:
+            async for item in items:
+                yield item
+
+    def __aiter__(self) -> typing.AsyncIterator[UUID]:
+        return self.walk()
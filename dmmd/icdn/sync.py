@@ -0,0 +1,166 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import os
+import json
+import typing
+import asyncio
+import hashlib
+import mimetypes
+from pathlib import Path
+from functools import partial
+from dataclasses import dataclass, field
+
+from dmmd.client import gather_bounded
+from dmmd.exceptions import DmmDException
+from dmmd.icdn._typing import UUID, DataModel, SortOrder, SortType
+
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import iCDN
+
+# Manifest handling
+MANIFEST = ".icdn-sync.json"
+
+@dataclass
+class SyncResult:
+    downloaded: list[UUID]                = field(default_factory = list)
+    skipped:    int                       = 0
+    pruned:     list[UUID]                = field(default_factory = list)
+    stale:      list[UUID]                = field(default_factory = list)
+    failed:     dict[UUID, DmmDException] = field(default_factory = dict)
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+# Anything missing or edited since it was downloaded has to be fetched again.
+# Files are only hashed when their modification time changed, so an untouched tree is checked with a stat per file.
+def verify(directory: Path, items: dict[UUID, dict[str, typing.Any]]) -> set[UUID]:
+    damaged = set()
+    for uuid, entry in items.items():
+        path = directory / entry["file"]
+        try:
+            stat = path.stat()
+
+        except FileNotFoundError:
+            damaged.add(uuid)
+            continue
+
+        if stat.st_mtime_ns != entry.get("mtime"):
+            if hash_file(path) != entry["hash"]:
+                damaged.add(uuid)
+
+            else:
+                entry["mtime"] = stat.st_mtime_ns
+
+    return damaged
+
+def as_error(error: BaseException) -> DmmDException:
+    return error if isinstance(error, DmmDException) else DmmDException(str(error))
+
+def filename(item: DataModel) -> str:
+    return f"{item.uuid}{mimetypes.guess_extension(item.mime) or ''}"
+
+def load_manifest(directory: Path) -> dict[str, typing.Any]:
+    path = directory / MANIFEST
+    return json.loads(path.read_text()) if path.is_file() else {"cursor": None, "items": {}}
+
+def save_manifest(directory: Path, manifest: dict[str, typing.Any]) -> None:
+    temporary = directory / f"{MANIFEST}.tmp"
+    temporary.write_text(json.dumps(manifest))
+    os.replace(temporary, directory / MANIFEST)
+
+# Main routine. Local files whose content was removed upstream are reported as stale,
+# and only deleted when pruning.
+async def sync(
+    cdn:         "iCDN",
+    directory:   Path,
+    concurrency: int  = 8,
+    count:       int  = 500,
+    prune:       bool = False
+) -> SyncResult:
+    directory.mkdir(parents = True, exist_ok = True)
+    manifest, result = load_manifest(directory), SyncResult()
+    items: dict[UUID, dict[str, typing.Any]] = manifest["items"]
+    damaged = await asyncio.to_thread(verify, directory, items)
+
+    # Only content at or after the last synced timestamp can be new or changed
+    changed: list[DataModel] = []
+    latest, seen = manifest["cursor"], set()
+    async for item in cdn.search(
+        begin = manifest["cursor"],
+        count = count,
+        order = SortOrder.ASCENDING,
+        sort = SortType.TIME,
+        remote = True
+    ).walk(query = True):
+        timestamp, known = round(item.time.timestamp() * 1000), items.get(item.uuid)
+        latest = timestamp if latest is None else max(latest, timestamp)
+        seen.add(item.uuid)
+        if known and known["size"] == item.size and known["time"] == timestamp and item.uuid not in damaged:
+            result.skipped += 1
+            continue
+
+        changed.append(item)
+
+    # A first run already walked everything, later ones only list UUIDs to find what was removed upstream
+    remote = seen if manifest["cursor"] is None else {uuid async for uuid in cdn.list(count)}
+    stale = [uuid for uuid in items if uuid not in remote]
+
+    # Damaged files from before the cursor weren't walked, so they're looked up on their own
+    older = [uuid for uuid in damaged if uuid in remote and uuid not in seen]
+    for uuid, outcome in zip(older, await cdn.query_many(older)):
+        if isinstance(outcome, DataModel):
+            changed.append(outcome)
+
+        else:
+            result.failed[uuid] = as_error(outcome)
+
+    # Every finished download goes straight into the manifest, so nothing is lost if the run is cut short
+    pending = {item.uuid: item for item in changed}
+
+    async def fetch(item: DataModel) -> None:
+        path = await cdn.download_to(item.uuid, directory / filename(item))
+        entry = {
+            "file":  path.name,
+            "name":  item.name,
+            "size":  item.size,
+            "time":  round(item.time.timestamp() * 1000),
+            "hash":  await asyncio.to_thread(hash_file, path),
+            "mtime": path.stat().st_mtime_ns
+        }
+        previous = items.get(item.uuid)
+        if previous and previous["file"] != entry["file"]:
+            (directory / previous["file"]).unlink(missing_ok = True)
+
+        items[item.uuid] = entry
+        result.downloaded.append(item.uuid)
+        del pending[item.uuid]
+
+    try:
+        for item, outcome in zip(changed, await gather_bounded([partial(fetch, item) for item in changed], concurrency)):
+            if isinstance(outcome, Exception):
+                result.failed[item.uuid] = as_error(outcome)
+
+        if prune:
+            for uuid in stale:
+                (directory / items.pop(uuid)["file"]).unlink(missing_ok = True)
+                result.pruned.append(uuid)
+
+        else:
+            result.stale = stale
+
+    finally:
+        # Walked items that failed or never finished have to be picked up again next run, so the cursor can't move past them.
+        # Older damaged files are found again by verifying, so they don't hold it back.
+        manifest["cursor"] = min(
+            (round(item.time.timestamp() * 1000) for item in pending.values() if item.uuid in seen),
+            default = latest
+        )
+        save_manifest(directory, manifest)
+
+    return result
@@ -0,0 +1,87 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import mmap
+import typing
+from time import perf_counter
+from pathlib import Path
+from dataclasses import dataclass
+
+from aiohttp import FormData
+from aiohttp.payload import Payload
+from aiohttp.abc import AbstractStreamWriter
+
+from dmmd.client import CHUNK_SIZE
+
+# Progress reporting
+@dataclass
+class Progress:
+    sent:    int
+    total:   int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> typing.Optional[float]:
+        return (self.total - self.sent) / self.rate if self.rate else None
+
+type ProgressCallback = typing.Callable[[Progress], typing.Awaitable[None]]
+
+# Payload
+class FilePayload(Payload):
+    def __init__(
+        self,
+        path:       Path,
+        chunk_size: int                               = CHUNK_SIZE,
+        progress:   typing.Optional[ProgressCallback] = None,
+        use_mmap:   bool                              = False
+    ) -> None:
+        super().__init__(path, filename = path.name)
+        self._size = path.stat().st_size
+        self.path, self.chunk_size, self.progress, self.use_mmap = path, chunk_size, progress, use_mmap
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self.path.read_bytes().decode(encoding, errors)
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(self, writer: AbstractStreamWriter, content_length: typing.Optional[int]) -> None:
+        total = self._size if content_length is None else min(self._size, content_length)
+        sent, start = 0, perf_counter()
+
+        with self.path.open("rb") as handle:
+            source = mmap.mmap(handle.fileno(), 0, access = mmap.ACCESS_READ) if self.use_mmap and total else None
+            try:
+                while sent < total:
+                    size = min(self.chunk_size, total - sent)
+                    chunk = source[sent:sent + size] if source is not None else handle.read(size)
+                    if not chunk:
+                        break
+
+                    await writer.write(chunk)
+                    sent += len(chunk)
+                    if self.progress is not None:
+                        await self.progress(Progress(sent, total, perf_counter() - start))
+
+            finally:
+                if source is not None:
+                    source.close()
+
+# Form handling
+def build_form(
+    json:       str,
+    file:       typing.Optional[Path]             = None,
+    chunk_size: int                               = CHUNK_SIZE,
+    progress:   typing.Optional[ProgressCallback] = None,
+    use_mmap:   bool                              = False
+) -> FormData:
+    form = FormData()
+    if file is not None:
+        form.add_field("file", FilePayload(file, chunk_size, progress, use_mmap), filename = file.name)
+
+    form.add_field("json", json)
+    return form
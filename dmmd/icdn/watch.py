@@ -0,0 +1,161 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import os
+import json
+import typing
+import asyncio
+from pathlib import Path
+from contextlib import aclosing
+from dataclasses import dataclass, field
+
+from aiohttp import ClientError
+
+from dmmd.exceptions import RETRYABLE_EXCEPTIONS, CircuitOpen
+from dmmd.icdn._typing import UUID, BuiltCallable, DataModel, SortOrder, SortType
+
+if typing.TYPE_CHECKING:
+    from dmmd.icdn import iCDN
+
+TRANSIENT = (*RETRYABLE_EXCEPTIONS, CircuitOpen, ClientError, asyncio.TimeoutError)
+
+def _millis(item: DataModel) -> int:
+    return round(item.time.timestamp() * 1000)
+
+def _fresh(callable: BuiltCallable) -> BuiltCallable:
+    callable.cache = None  # A cached page would hide exactly the changes being watched for
+    return callable
+
+# Events
+@dataclass
+class WatchEvent:
+    kind: typing.Literal["added", "updated", "removed"]
+    uuid: UUID
+    item: typing.Optional[DataModel] = None  # Not set for removals
+
+    def json(self) -> dict[str, typing.Any]:
+        return {
+            "event": self.kind,
+            "uuid":  self.uuid,
+            "item":  self.item.model_dump(mode = "json") | {"time": _millis(self.item)} if self.item else None
+        }
+
+# Cursor, updated before every event is yielded, so saving it after handling an event
+# means a restarted watcher continues right after that event. Only the high-water mark is
+# saved; `known` is rebuilt from the first full listing after a restart.
+@dataclass
+class WatchCursor:
+    time:     typing.Optional[int] = None                  # Highest item time seen, in milliseconds
+    boundary: set[UUID]            = field(default_factory = set)  # Items at exactly `time`, already reported
+    known:    set[UUID]            = field(default_factory = set)  # Everything seen, for telling updates from additions
+
+    @classmethod
+    def load(cls, path: Path) -> typing.Self:
+        if not path.is_file():
+            return cls()
+
+        state = json.loads(path.read_text())
+        return cls(state["time"], set(state["boundary"]), set(state["boundary"]))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents = True, exist_ok = True)
+        temporary = path.with_name(f"{path.name}.tmp")
+        temporary.write_text(json.dumps({"time": self.time, "boundary": [*self.boundary]}))
+        os.replace(temporary, path)
+
+    def advance(self, item: DataModel) -> WatchEvent:
+        timestamp = _millis(item)
+        if self.time is None or timestamp > self.time:
+            self.time, self.boundary = timestamp, set()
+
+        if timestamp == self.time:
+            self.boundary.add(item.uuid)
+
+        kind = "updated" if item.uuid in self.known else "added"
+        self.known.add(item.uuid)
+        return WatchEvent(kind, item.uuid, item)
+
+# Main routine. Each poll only asks for content at or after the high-water mark; a full
+# listing of UUIDs is only walked every `reconcile` seconds, to notice removals and content
+# added with a time older than the mark. With `checkpoint`, the cursor is saved there once
+# every event from a poll has been handled, or the poll failed partway through.
+async def watch(
+    cdn:          "iCDN",
+    cursor:       typing.Optional[WatchCursor] = None,
+    interval:     float                        = 5.0,
+    min_interval: float                        = 1.0,
+    max_interval: float                        = 60.0,
+    reconcile:    typing.Optional[float]       = 600.0,
+    replay:       bool                         = False,
+    count:        int                          = 100,
+    checkpoint:   typing.Optional[Path]        = None
+) -> typing.AsyncIterator[WatchEvent]:
+    cursor = cursor if cursor is not None else WatchCursor()
+    loop = asyncio.get_running_loop()
+
+    async def listed() -> set[UUID]:
+        return {uuid async for uuid in _fresh(cdn.list(500))}
+
+    # Starting fresh without a replay means only reporting what happens from now on
+    if cursor.time is None and not replay:
+        newest = await _fresh(cdn.search(count = 1, order = SortOrder.DESCENDING, sort = SortType.TIME, remote = True)).query()
+        if newest:
+            cursor.advance(newest[0])
+
+    # What's already there is learned from the first listing without being reported, which for a
+    # restored cursor happens after the first poll, so content added past the mark still counts as added
+    seeded, last_reconcile = reconcile is None, loop.time()
+    while True:
+        changed = failed = False
+        try:
+            # Closed explicitly, so a page being prefetched is cancelled as soon as the watch is closed
+            async with aclosing(_fresh(cdn.search(
+                begin = cursor.time,
+                count = count,
+                order = SortOrder.ASCENDING,
+                sort = SortType.TIME,
+                remote = True
+            )).walk(query = True)) as items:
+                async for item in items:
+                    if item.uuid in cursor.boundary and _millis(item) == cursor.time:
+                        continue
+
+                    changed = True
+                    yield cursor.advance(item)
+
+            if not seeded:
+                cursor.known |= await listed()
+                seeded, last_reconcile = True, loop.time()
+
+            elif reconcile is not None and loop.time() - last_reconcile >= reconcile:
+                known, current = set(cursor.known), await listed()
+                last_reconcile = loop.time()
+                for uuid in known - current:
+                    changed = True
+                    cursor.known.discard(uuid)
+                    cursor.boundary.discard(uuid)
+                    yield WatchEvent("removed", uuid)
+
+                # Anything at or past the mark is left to the next poll, which also moves the cursor past it
+                for item in await cdn.query_many(current - cursor.known):
+                    if isinstance(item, DataModel) and item.uuid not in cursor.known and (cursor.time is None or _millis(item) < cursor.time):
+                        changed = True
+                        cursor.known.add(item.uuid)
+                        yield WatchEvent("added", item.uuid, item)
+
+        except TRANSIENT:
+            failed = True
+
+        # Events yielded before an error were still handled, and the cursor is only ever as far as the last of them
+        if changed and checkpoint is not None:
+            cursor.save(checkpoint)
+
+        # Polling speeds up while content keeps changing and slows down while it's quiet,
+        # backing off fully while the server is struggling
+        if failed:
+            interval = max_interval
+
+        else:
+            interval = max(min_interval, interval / 2) if changed else min(max_interval, interval * 1.5)
+
+        await asyncio.sleep(interval)
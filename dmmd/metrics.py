@@ -0,0 +1,191 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import re
+import typing
+import asyncio
+from bisect import bisect_left
+from types import SimpleNamespace
+from dataclasses import dataclass
+from collections import Counter
+
+from aiohttp import ClientSession, TraceConfig
+from aiohttp.tracing import TraceRequestChunkSentParams, TraceRequestEndParams, TraceRequestStartParams
+
+# Events
+@dataclass
+class RequestEvent:
+    method:    str
+    endpoint:  str
+    route:     str
+    status:    typing.Optional[int]   = None
+    error:     typing.Optional[str]   = None  # Name of the exception the request failed with
+    attempts:  int                    = 0
+    scheduled: typing.Optional[float] = None  # Seconds queued by the client-side scheduler over every attempt, when there is one
+    duration:  float                  = 0.0   # Seconds from the first attempt until the response was released
+    dns:       float                  = 0.0   # The phases below only cover the final attempt
+    connect:   float                  = 0.0
+    queued:    float                  = 0.0   # Time spent waiting for a free connection in the pool
+    ttfb:      float                  = 0.0
+    sent:      int                    = 0
+    received:  int                    = 0
+
+type EventCallback = typing.Callable[[RequestEvent], None]
+
+# Endpoints embedding identifiers are folded into a single route, to keep label cardinality bounded
+ROUTES = [
+    (re.compile(r"^/(file|query)/[^/]+$"), r"/\1/{uuid}"),
+    (re.compile(r"^/(f|d)/.*$"), r"/\1/{path}")
+]
+
+def route_of(endpoint: str) -> str:
+    for pattern, replacement in ROUTES:
+        if pattern.match(endpoint):
+            return pattern.sub(replacement, endpoint)
+
+    return endpoint
+
+# Tracing, the per-request context is the RequestEvent being built by Client
+def _event(context: SimpleNamespace) -> typing.Optional[RequestEvent]:
+    return context.trace_request_ctx if isinstance(context.trace_request_ctx, RequestEvent) else None
+
+async def _on_request_start(session: ClientSession, context: SimpleNamespace, params: TraceRequestStartParams) -> None:
+    if event := _event(context):
+        event.attempts += 1
+        event.dns = event.connect = event.queued = 0.0
+        context.start = asyncio.get_running_loop().time()
+
+# Phases nest (DNS happens while connecting), so each keeps its own start time
+def _phase(field: str) -> tuple[typing.Callable[..., typing.Awaitable[None]], typing.Callable[..., typing.Awaitable[None]]]:
+    async def start(session: ClientSession, context: SimpleNamespace, params: typing.Any) -> None:
+        if _event(context):
+            setattr(context, field, asyncio.get_running_loop().time())
+
+    async def end(session: ClientSession, context: SimpleNamespace, params: typing.Any) -> None:
+        if (event := _event(context)) and hasattr(context, field):
+            setattr(event, field, getattr(event, field) + asyncio.get_running_loop().time() - getattr(context, field))
+
+    return start, end
+
+async def _on_request_end(session: ClientSession, context: SimpleNamespace, params: TraceRequestEndParams) -> None:
+    if event := _event(context):
+        event.ttfb = asyncio.get_running_loop().time() - context.start
+
+async def _on_chunk_sent(session: ClientSession, context: SimpleNamespace, params: TraceRequestChunkSentParams) -> None:
+    if event := _event(context):
+        event.sent += len(params.chunk)
+
+def build_trace_config() -> TraceConfig:
+    config = TraceConfig()
+    config.on_request_start.append(_on_request_start)
+    config.on_request_end.append(_on_request_end)
+    config.on_request_chunk_sent.append(_on_chunk_sent)
+    for start, end, field in [
+        (config.on_dns_resolvehost_start, config.on_dns_resolvehost_end, "dns"),
+        (config.on_connection_create_start, config.on_connection_create_end, "connect"),
+        (config.on_connection_queued_start, config.on_connection_queued_end, "queued")
+    ]:
+        on_start, on_end = _phase(field)
+        start.append(on_start)
+        end.append(on_end)
+
+    return config
+
+# Attached to the pooled sessions of clients with metrics
+TRACE_CONFIG = build_trace_config()
+
+# Aggregation
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum, self.count = 0.0, 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self) -> typing.Iterator[tuple[str, int]]:
+        total = 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += count
+            yield bound, total
+
+type Labels = tuple[tuple[str, str], ...]
+
+LABEL_ESCAPES = str.maketrans({"\\": "\\\\", "\"": "\\\"", "\n": "\\n"})
+
+# One sample in the Prometheus text exposition format, shared by every module exposing metrics
+def format_metric(name: str, labels: Labels, value: typing.Any) -> str:
+    rendered = "{" + ",".join(f"{k}=\"{v.translate(LABEL_ESCAPES)}\"" for k, v in labels) + "}" if labels else ""
+    return f"{name}{rendered} {value}"
+
+class Metrics:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, callbacks: typing.Optional[list[EventCallback]] = None) -> None:
+        self.buckets, self.callbacks = buckets, callbacks or []
+        self.in_flight = 0
+
+        self.histograms: dict[str, dict[Labels, Histogram]] = {phase: {} for phase in ["scheduled", "duration", "dns", "connect", "queued", "ttfb"]}
+        self.requests: Counter[Labels] = Counter()
+        self.retries: Counter[Labels] = Counter()
+        self.sent: Counter[Labels] = Counter()
+        self.received: Counter[Labels] = Counter()
+
+    def add_callback(self, callback: EventCallback) -> None:
+        self.callbacks.append(callback)
+
+    def _observe(self, phase: str, labels: Labels, value: float) -> None:
+        if labels not in self.histograms[phase]:
+            self.histograms[phase][labels] = Histogram(self.buckets)
+
+        self.histograms[phase][labels].observe(value)
+
+    def record(self, event: RequestEvent) -> None:
+        labels = (("route", event.route), ("method", event.method))
+        self._observe("duration", labels, event.duration)
+        if event.scheduled is not None:
+            self._observe("scheduled", labels, event.scheduled)
+
+        if event.ttfb:
+            for phase in ["dns", "connect", "queued", "ttfb"]:
+                self._observe(phase, labels, getattr(event, phase))
+
+        self.requests[(*labels, ("status", str(event.status or "")), ("error", event.error or ""))] += 1
+        self.retries[labels] += max(event.attempts - 1, 0)
+        self.sent[labels] += event.sent
+        self.received[labels] += event.received
+        for callback in self.callbacks:
+            callback(event)
+
+    # Prometheus text exposition
+    def prometheus(self, prefix: str = "dmmd") -> str:
+        lines = [
+            f"# HELP {prefix}_requests_in_flight Requests currently being processed.",
+            f"# TYPE {prefix}_requests_in_flight gauge",
+            f"{prefix}_requests_in_flight {self.in_flight}"
+        ]
+        for name, counter, description in [
+            ("requests_total", self.requests, "Completed requests by status and exception."),
+            ("retries_total", self.retries, "Extra attempts made after a failed one."),
+            ("request_bytes_total", self.sent, "Request body bytes sent."),
+            ("response_bytes_total", self.received, "Response body bytes received.")
+        ]:
+            lines += [f"# HELP {prefix}_{name} {description}", f"# TYPE {prefix}_{name} counter"]
+            lines += [format_metric(f"{prefix}_{name}", labels, value) for labels, value in counter.items()]
+
+        for phase, histograms in self.histograms.items():
+            name = f"{prefix}_request_{phase}_seconds"
+            lines += [f"# HELP {name} Request {phase} in seconds.", f"# TYPE {name} histogram"]
+            for labels, histogram in histograms.items():
+                lines += [format_metric(f"{name}_bucket", (*labels, ("le", bound)), count) for bound, count in histogram.cumulative()]
+                lines += [format_metric(f"{name}_sum", labels, histogram.sum), format_metric(f"{name}_count", labels, histogram.count)]
+
+        return "\n".join(lines) + "\n"
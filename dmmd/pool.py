@@ -0,0 +1,120 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import typing
+import atexit
+import asyncio
+from weakref import WeakSet
+from dataclasses import dataclass, field
+
+from yarl import URL
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig
+
+from dmmd.metrics import TRACE_CONFIG
+
+# Configuration
+@dataclass
+class PoolOptions:
+    limit:          int           = 100    # Total connections for this host
+    limit_per_host: int           = 0      # Connections per (host, port, ssl) triple, 0 = unlimited
+    keepalive:      float         = 30.0   # Seconds an idle connection is kept alive
+    dns_cache_ttl:  int           = 300    # Seconds DNS lookups are cached for
+    timeout:        ClientTimeout = field(default_factory = lambda: ClientTimeout(total = 300, sock_connect = 30))
+
+# Registry
+type SessionKey = tuple[str, asyncio.AbstractEventLoop, bool]
+
+# One shared session per (origin, event loop, instrumented); a session is closed once
+# the last client using it is closed, or when the pool itself is. Only clients with
+# metrics get traced sessions, so nobody else pays for the trace callbacks.
+class SessionPool:
+    def __init__(self, options: typing.Optional[PoolOptions] = None, hosts: typing.Optional[dict[str, PoolOptions]] = None) -> None:
+        self.options = options or PoolOptions()
+        self.hosts = hosts or {}
+
+        self.trace_configs: list[TraceConfig] = []
+
+        self._sessions: dict[SessionKey, ClientSession] = {}
+        self._owners: dict[SessionKey, WeakSet] = {}
+        atexit.register(self._shutdown)
+
+    @staticmethod
+    def origin(base_url: str) -> str:
+        return str(URL(base_url).origin())
+
+    def configure(self, host: str, options: PoolOptions) -> None:
+        self.hosts[host] = options
+
+    # Tracing can only be set up when a session is created, so this only affects new sessions
+    def trace(self, config: TraceConfig) -> None:
+        if config not in self.trace_configs:
+            self.trace_configs.append(config)
+
+    def options_for(self, base_url: str) -> PoolOptions:
+        return self.hosts.get(URL(base_url).host or "", self.options)
+
+    def _create(self, origin: str, instrumented: bool) -> ClientSession:
+        options = self.options_for(origin)
+        return ClientSession(
+            origin,
+            connector = TCPConnector(
+                limit = options.limit,
+                limit_per_host = options.limit_per_host,
+                keepalive_timeout = options.keepalive,
+                ttl_dns_cache = options.dns_cache_ttl
+            ),
+            timeout = options.timeout,
+            trace_configs = [*self.trace_configs, TRACE_CONFIG] if instrumented else self.trace_configs
+        )
+
+    def acquire(self, base_url: str, owner: typing.Any, instrumented: bool = False) -> ClientSession:
+        key = (self.origin(base_url), asyncio.get_running_loop(), instrumented)
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            self._drop_stale()
+            session = self._sessions[key] = self._create(key[0], instrumented)
+            self._owners[key] = WeakSet()
+
+        self._owners[key].add(owner)
+        return session
+
+    async def release(self, owner: typing.Any) -> None:
+        loop = asyncio.get_running_loop()
+        for key, owners in list(self._owners.items()):
+            if key[1] is not loop or owner not in owners:
+                continue
+
+            owners.discard(owner)
+            if not owners:
+                del self._owners[key]  # Before awaiting, a session acquired meanwhile gets a fresh entry
+                await self._sessions.pop(key).close()
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self._sessions if key[1] is loop]:
+            del self._owners[key]
+            await self._sessions.pop(key).close()
+
+    def _drop_stale(self) -> None:
+        for key in [key for key in self._sessions if key[1].is_closed()]:
+            del self._sessions[key], self._owners[key]
+
+    def _shutdown(self) -> None:
+
+        # Only loops that are still open and idle can be used to close their sessions,
+        # anything else was torn down along with its event loop already.
+        for (_, loop, _), session in self._sessions.items():
+            if not (loop.is_closed() or loop.is_running() or session.closed):
+                loop.run_until_complete(session.close())
+
+        self._sessions.clear()
+        self._owners.clear()
+
+    async def __aenter__(self) -> typing.Self:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+# Shared default
+DEFAULT_POOL = SessionPool()
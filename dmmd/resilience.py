@@ -0,0 +1,131 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import typing
+import random
+import asyncio
+from time import monotonic
+from dataclasses import dataclass, field
+
+from aiohttp import ClientConnectionError
+
+from dmmd.exceptions import RETRYABLE_EXCEPTIONS, CircuitOpen
+
+# Circuit breaking
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold, self.cooldown = threshold, cooldown
+        self.failures, self.opened_at = 0, None
+        self._probing = False
+
+    @property
+    def state(self) -> typing.Literal["closed", "open", "half-open"]:
+        if self.opened_at is None:
+            return "closed"
+
+        return "half-open" if monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def check(self, key: str) -> None:
+        match self.state:
+            case "open":
+                raise CircuitOpen(f"Circuit for {key} is open after {self.failures} consecutive failures, not sending request.")
+
+            case "half-open" if self._probing:
+                raise CircuitOpen(f"Circuit for {key} is half-open and already probing, not sending request.")
+
+            case "half-open":
+                self._probing = True  # Only let a single trial request through
+
+    def abandon(self) -> None:
+        self._probing = False
+
+    def success(self) -> None:
+        self.failures, self.opened_at, self._probing = 0, None, False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold or self._probing:
+            self.opened_at, self._probing = monotonic(), False
+
+# Policy
+@dataclass
+class ResiliencePolicy:
+    attempts:          int                    = 3     # Total attempts for idempotent requests
+    backoff:           float                  = 0.25  # Base delay, doubled every attempt
+    max_backoff:       float                  = 10.0
+    hedge_after:       typing.Optional[float] = None  # Send a duplicate GET if the first takes longer than this
+    breaker_threshold: int                    = 5     # Consecutive failures before a host's circuit opens
+    breaker_cooldown:  float                  = 30.0
+
+    breakers: dict[str, CircuitBreaker] = field(default_factory = dict, repr = False)
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        if key not in self.breakers:
+            self.breakers[key] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+
+        return self.breakers[key]
+
+    @staticmethod
+    def retryable(error: BaseException) -> bool:
+        return isinstance(error, (ClientConnectionError, asyncio.TimeoutError, *RETRYABLE_EXCEPTIONS))
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))  # Full jitter
+
+    async def call[T](self, key: str, attempt: typing.Callable[[], typing.Awaitable[T]], idempotent: bool = True) -> T:
+        breaker, attempts, number = self.breaker(key), self.attempts if idempotent else 1, 0
+        while True:
+            number += 1
+            breaker.check(key)
+            try:
+                result = await attempt()
+
+            except asyncio.CancelledError:
+                breaker.abandon()
+                raise
+
+            except Exception as e:
+                if not self.retryable(e):
+                    breaker.success()  # The server answered, just not with what we wanted
+                    raise
+
+                breaker.failure()
+                if number == attempts:
+                    raise
+
+                await asyncio.sleep(self.delay(number, e))
+                continue
+
+            breaker.success()
+            return result
+
+    async def hedge[T](self, call: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        pending = {asyncio.ensure_future(call())}
+        try:
+            done, pending = await asyncio.wait(pending, timeout = self.hedge_after)
+            if not done:
+                pending.add(asyncio.ensure_future(call()))
+
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+
+                    error = error or task.exception()
+
+                if not pending:
+                    raise typing.cast(BaseException, error)
+
+                done, pending = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+# Shared default
+DEFAULT_POLICY = ResiliencePolicy()
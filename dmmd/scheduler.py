@@ -0,0 +1,256 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import re
+import typing
+import asyncio
+from enum import IntEnum
+from time import monotonic
+from itertools import count
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager, contextmanager
+
+from yarl import URL
+
+from dmmd.metrics import Histogram, format_metric
+
+# Lanes, waiting requests are let through highest priority first and in arrival order within a lane
+class Priority(IntEnum):
+    HIGH   = 0  # Latency sensitive, interactive lookups
+    NORMAL = 1  # Metadata requests by default
+    LOW    = 2  # File transfers and batch helpers by default
+
+type RequestClass = typing.Literal["metadata", "bulk"]
+
+# Set around a block of calls (and inherited by tasks started inside it) to move them to another lane
+PRIORITY: ContextVar[typing.Optional[Priority]] = ContextVar("priority", default = None)
+
+@contextmanager
+def priority(lane: Priority) -> typing.Iterator[None]:
+    token = PRIORITY.set(lane)
+    try:
+        yield
+
+    finally:
+        PRIORITY.reset(token)
+
+BULK_ROUTES = re.compile(r"^/(file|f|add|update)(/|$)")
+
+def classify(endpoint: str) -> RequestClass:
+    return "bulk" if BULK_ROUTES.match(endpoint) else "metadata"
+
+# Configuration
+@dataclass
+class RateLimit:
+    rate:  float                          # Requests per second
+    burst: typing.Optional[float] = None  # Requests allowed back to back after being idle, defaults to one second's worth
+
+@dataclass
+class SchedulerOptions:
+    rate:        typing.Optional[RateLimit] = None  # Shared by every request to the host
+    metadata:    typing.Optional[RateLimit] = None
+    bulk:        typing.Optional[RateLimit] = None
+    concurrency: typing.Optional[int]       = None  # Requests in flight at once, held until the response is released
+
+# Token buckets
+class TokenBucket:
+    def __init__(self, limit: RateLimit) -> None:
+        self.rate, self.capacity = limit.rate, limit.burst or max(limit.rate, 1.0)
+        self.tokens, self.updated = self.capacity, monotonic()
+
+    # Seconds until a token is available, 0 when there's one right now
+    def delay(self) -> float:
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+# Per-host state
+@dataclass
+class LaneStats:
+    waiting: int       = 0  # Current queue depth
+    granted: int       = 0
+    waited:  Histogram = field(default_factory = Histogram)  # Seconds spent queued, immediate grants included
+
+@dataclass
+class Waiter:
+    lane:     Priority
+    kind:     RequestClass
+    sequence: int
+    future:   asyncio.Future[None]
+
+class HostScheduler:
+    def __init__(self, options: SchedulerOptions) -> None:
+        self.options, self.in_flight = options, 0
+        self.buckets = {
+            name: TokenBucket(limit)
+            for name, limit in [("host", options.rate), ("metadata", options.metadata), ("bulk", options.bulk)]
+            if limit is not None
+        }
+        self.queues: dict[tuple[Priority, RequestClass], deque[Waiter]] = {
+            (lane, kind): deque() for lane in Priority for kind in ("metadata", "bulk")
+        }
+        self.lanes = {lane: LaneStats() for lane in Priority}
+
+        self._sequence = count()
+        self._timer: typing.Optional[asyncio.TimerHandle] = None
+
+    def _delay(self, name: str) -> float:
+        return self.buckets[name].delay() if name in self.buckets else 0.0
+
+    def _grant(self, kind: RequestClass) -> None:
+        for name in ("host", kind):
+            if name in self.buckets:
+                self.buckets[name].take()
+
+        self.in_flight += 1
+
+    # Hands out slots to the front of the highest priority lanes. A request held up by its own
+    # class's bucket doesn't stop the other class, but one held up by the host's bucket or the
+    # concurrency limit does, so lower lanes can't take what a higher one is waiting for.
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        blocked: set[RequestClass] = set()
+        wait: typing.Optional[float] = None
+        while True:
+            heads = []
+            for (_, kind), queue in self.queues.items():
+                while queue and queue[0].future.done():
+                    queue.popleft()  # Cancelled while waiting
+
+                if queue and kind not in blocked:
+                    heads.append(queue[0])
+
+            if not heads or (self.options.concurrency is not None and self.in_flight >= self.options.concurrency):
+                break  # Releasing a slot dispatches again
+
+            waiter = min(heads, key = lambda waiter: (waiter.lane, waiter.sequence))
+            if delay := self._delay("host"):
+                wait = delay
+                break
+
+            if delay := self._delay(waiter.kind):
+                blocked.add(waiter.kind)
+                wait = delay if wait is None else min(wait, delay)
+                continue
+
+            self.queues[(waiter.lane, waiter.kind)].popleft()
+            self._grant(waiter.kind)
+            waiter.future.set_result(None)
+
+        if wait is not None:
+            self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+
+    async def acquire(self, kind: RequestClass, lane: Priority) -> float:
+        stats, start = self.lanes[lane], monotonic()
+        idle = not any(self.queues.values())
+        if idle and (self.options.concurrency is None or self.in_flight < self.options.concurrency) \
+            and not self._delay("host") and not self._delay(kind):
+            self._grant(kind)
+
+        else:
+            waiter = Waiter(lane, kind, next(self._sequence), asyncio.get_running_loop().create_future())
+            self.queues[(lane, kind)].append(waiter)
+            stats.waiting += 1
+            try:
+                self._dispatch()
+                await waiter.future
+
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self.release()  # Granted just as the caller gave up
+
+                raise
+
+            finally:
+                stats.waiting -= 1
+
+        waited = monotonic() - start
+        stats.granted += 1
+        stats.waited.observe(waited)
+        return waited
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        if any(self.queues.values()):
+            self._dispatch()
+
+# Scheduler, shared between clients to have them draw from the same limits. Waiting
+# requests are woken by their own event loop, so hosts get separate state per loop.
+type SchedulerKey = tuple[str, asyncio.AbstractEventLoop]
+
+class Scheduler:
+    def __init__(self, options: typing.Optional[SchedulerOptions] = None, hosts: typing.Optional[dict[str, SchedulerOptions]] = None) -> None:
+        self.options = options or SchedulerOptions()
+        self.hosts = hosts or {}
+        self.schedulers: dict[SchedulerKey, HostScheduler] = {}
+
+    def configure(self, host: str, options: SchedulerOptions) -> None:
+        self.hosts[host] = options
+
+    def scheduler(self, base_url: str) -> HostScheduler:
+        url = URL(base_url)
+        key = (str(url.origin()), asyncio.get_running_loop())
+        if key not in self.schedulers:
+            self._drop_stale()
+            self.schedulers[key] = HostScheduler(self.hosts.get(url.host or "", self.options))
+
+        return self.schedulers[key]
+
+    def _drop_stale(self) -> None:
+        for key in [key for key in self.schedulers if key[1].is_closed()]:
+            del self.schedulers[key]
+
+    # Returns the seconds spent waiting and the callable that gives the slot back
+    async def acquire(self, base_url: str, kind: RequestClass, lane: typing.Optional[Priority] = None) -> tuple[float, typing.Callable[[], None]]:
+        host = self.scheduler(base_url)
+        lane = lane if lane is not None else PRIORITY.get()
+        return await host.acquire(kind, lane if lane is not None else Priority.LOW if kind == "bulk" else Priority.NORMAL), host.release
+
+    # Yields the seconds spent waiting, the slot is held until the block exits
+    @asynccontextmanager
+    async def slot(self, base_url: str, kind: RequestClass, lane: typing.Optional[Priority] = None) -> typing.AsyncIterator[float]:
+        waited, release = await self.acquire(base_url, kind, lane)
+        try:
+            yield waited
+
+        finally:
+            release()
+
+    def stats(self) -> dict[str, dict[Priority, LaneStats]]:
+        merged: dict[str, dict[Priority, LaneStats]] = {}
+        for (origin, _), host in self.schedulers.items():
+            lanes = merged.setdefault(origin, {lane: LaneStats() for lane in Priority})
+            for lane, stats in host.lanes.items():
+                lanes[lane].waiting += stats.waiting
+                lanes[lane].granted += stats.granted
+                lanes[lane].waited.merge(stats.waited)
+
+        return merged
+
+    def prometheus(self, prefix: str = "dmmd") -> str:
+        lines = [
+            f"# HELP {prefix}_scheduler_waiting Requests currently queued by the client-side scheduler.",
+            f"# TYPE {prefix}_scheduler_waiting gauge"
+        ]
+        hosts = self.stats()
+        for origin, lanes in hosts.items():
+            lines += [format_metric(f"{prefix}_scheduler_waiting", (("host", origin), ("lane", lane.name.lower())), stats.waiting) for lane, stats in lanes.items()]
+
+        name = f"{prefix}_scheduler_wait_seconds"
+        lines += [f"# HELP {name} Time requests spent queued by the client-side scheduler.", f"# TYPE {name} histogram"]
+        for origin, lanes in hosts.items():
+            for lane, stats in lanes.items():
+                labels = (("host", origin), ("lane", lane.name.lower()))
+                lines += [format_metric(f"{name}_bucket", (*labels, ("le", bound)), total) for bound, total in stats.waited.cumulative()]
+                lines += [format_metric(f"{name}_sum", labels, stats.waited.sum), format_metric(f"{name}_count", labels, stats.waited.count)]
+
+        return "\n".join(lines) + "\n"
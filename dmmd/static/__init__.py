@@ -1,16 +1,53 @@
 # Copyright (c) 2025 iiPython
 
 # Modules
-from dmmd.client import Client
+import typing
+from pathlib import Path
+from urllib.parse import quote
+
+from dmmd.pool import SessionPool
+from dmmd.endpoints import FailoverPolicy
+from dmmd.scheduler import Scheduler
+from dmmd.metrics import Metrics
+from dmmd.resilience import ResiliencePolicy
+from dmmd.cache import ContentCache
+from dmmd.client import CHUNK_SIZE, Client, Service
+from dmmd.static.mirror import ErrorCallback, MirrorResult, mirror, walk
 
 # Main class
-class Static:
-    def __init__(self, base_url: str = "https://static.dmmdgm.dev") -> None:
-        self.client = Client(base_url)
+class Static(Service):
+    def __init__(
+        self,
+        base_url:      str | typing.Sequence[str]        = "https://static.dmmdgm.dev",
+        pool:          typing.Optional[SessionPool]      = None,
+        policy:        typing.Optional[ResiliencePolicy] = None,
+        content_cache: typing.Optional[ContentCache]     = None,
+        metrics:       typing.Optional[Metrics]          = None,
+        failover:      typing.Optional[FailoverPolicy]   = None,
+        scheduler:     typing.Optional[Scheduler]        = None
+    ) -> None:
+        self.client = Client(base_url, pool, policy, metrics = metrics, failover = failover, scheduler = scheduler)
+        self.content_cache = content_cache
 
-    # Endpoint handlers
+    # Endpoint handlers, each path segment is percent-encoded
     async def directory(self, path: str = "") -> list[str]:
-        return await self.client.request(f"/d/{path}")
+        return await self.client.request(f"/d/{quote(path)}")
 
     async def file(self, path: str) -> bytes:
-        return await self.client.request(f"/f/{path}")
+        if self.content_cache is not None:
+            return await self.client.cached_request(f"/f/{quote(path)}", self.content_cache)
+
+        return await self.client.request(f"/f/{quote(path)}")
+
+    def stream(self, path: str, chunk_size: int = CHUNK_SIZE) -> typing.AsyncIterator[bytes]:
+        return self.client.stream(f"/f/{quote(path)}", chunk_size)
+
+    async def download_to(self, path: str, destination: Path, chunk_size: int = CHUNK_SIZE) -> Path:
+        return await self.client.download(f"/f/{quote(path)}", destination, chunk_size)
+
+    # Crawling
+    def walk(self, root: str = "", concurrency: int = 8, on_error: typing.Optional[ErrorCallback] = None) -> typing.AsyncIterator[str]:
+        return walk(self, root, concurrency, on_error)
+
+    async def mirror(self, root: str, destination: Path, concurrency: int = 8, chunk_size: int = CHUNK_SIZE) -> MirrorResult:
+        return await mirror(self, root, destination, concurrency, chunk_size)
@@ -0,0 +1,165 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import os
+import json
+import typing
+import asyncio
+from pathlib import Path
+from collections import deque
+from urllib.parse import quote
+from dataclasses import dataclass, field
+
+from aiohttp import ClientError
+
+from dmmd.client import CHUNK_SIZE
+from dmmd.exceptions import DmmDException
+
+if typing.TYPE_CHECKING:
+    from dmmd.static import Static
+
+# Crawling
+type ErrorCallback = typing.Callable[[str, DmmDException], None]
+
+# Listings mark subdirectories with a trailing slash. Directories are listed in the order
+# they're discovered, with up to `concurrency` listings in flight at any time.
+async def walk(
+    static:      "Static",
+    root:        str                            = "",
+    concurrency: int                            = 8,
+    on_error:    typing.Optional[ErrorCallback] = None
+) -> typing.AsyncIterator[str]:
+    queue, running = deque([root.strip("/")]), set()
+    directories: dict[asyncio.Future, str] = {}
+    try:
+        while queue or running:
+            while queue and len(running) < concurrency:
+                directory = queue.popleft()
+                task = asyncio.ensure_future(static.directory(directory))
+                directories[task] = directory
+                running.add(task)
+
+            done, running = await asyncio.wait(running, return_when = asyncio.FIRST_COMPLETED)
+            for task in done:
+                directory = directories.pop(task)
+                try:
+                    entries = task.result()
+
+                except (DmmDException, OSError, ClientError, asyncio.TimeoutError) as e:
+                    if on_error is None:
+                        raise
+
+                    on_error(directory, e if isinstance(e, DmmDException) else DmmDException(str(e)))
+                    continue
+
+                for entry in entries:
+                    path = f"{directory}/{entry}" if directory else entry
+                    if entry.endswith("/"):
+                        queue.append(path.rstrip("/"))
+
+                    else:
+                        yield path
+
+    finally:
+        for task in running:
+            task.cancel()
+
+# Mirroring
+MANIFEST = ".static-mirror.json"
+
+@dataclass
+class MirrorResult:
+    downloaded: list[str]                = field(default_factory = list)
+    skipped:    list[str]                = field(default_factory = list)
+    failed:     dict[str, DmmDException] = field(default_factory = dict)
+
+def load_manifest(destination: Path) -> dict[str, dict[str, typing.Any]]:
+    path = destination / MANIFEST
+    return json.loads(path.read_text()) if path.is_file() else {}
+
+def save_manifest(destination: Path, manifest: dict[str, dict[str, typing.Any]]) -> None:
+    temporary = destination / f"{MANIFEST}.tmp"
+    temporary.write_text(json.dumps(manifest))
+    os.replace(temporary, destination / MANIFEST)
+
+async def mirror(
+    static:      "Static",
+    root:        str,
+    destination: Path,
+    concurrency: int = 8,
+    chunk_size:  int = CHUNK_SIZE
+) -> MirrorResult:
+    destination.mkdir(parents = True, exist_ok = True)
+    manifest, result = load_manifest(destination), MirrorResult()
+    base = destination.resolve()
+
+    async def fetch(path: str) -> None:
+        target = (destination / path.removeprefix(root.strip("/")).lstrip("/")).resolve()
+        if not target.is_relative_to(base):
+            result.failed[path] = DmmDException(f"{path} resolves outside of {destination}, refusing to write it.")
+            return
+
+        # Files seen before are revalidated with the validators they were stored with. Anything else
+        # already on disk is checked with a HEAD first, and kept as long as its size matches the
+        # server's Content-Length, so bodies are only ever fetched when they're needed.
+        known, size = manifest.get(path), target.stat().st_size if target.is_file() else None
+        endpoint, validators, unchanged = f"/f/{quote(path)}", {}, False
+        if known is not None and known["size"] == size:
+            validators = ({"If-None-Match": known["etag"]} if known.get("etag") else {}) | \
+                ({"If-Modified-Since": known["last_modified"]} if known.get("last_modified") else {})
+
+        try:
+            if size is not None and not validators:
+                async with static.client.response(endpoint, method = "HEAD") as response:
+                    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+                    unchanged = response.content_length == size
+
+            if not unchanged:
+                async with static.client.response(endpoint, headers = validators) as response:
+                    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+                    unchanged = response.status == 304
+                    if not unchanged:
+                        target.parent.mkdir(parents = True, exist_ok = True)
+                        partial = target.with_name(f"{target.name}.part")
+                        with partial.open("wb") as handle:
+                            async for chunk in response.content.iter_chunked(chunk_size):
+                                handle.write(chunk)
+
+                        partial.replace(target)
+
+            manifest[path] = {
+                "size": target.stat().st_size,
+                "etag": etag or (known or {}).get("etag"),
+                "last_modified": last_modified or (known or {}).get("last_modified")
+            }
+            (result.skipped if unchanged else result.downloaded).append(path)
+
+        except (DmmDException, OSError, ClientError, asyncio.TimeoutError) as e:
+            result.failed[path] = e if isinstance(e, DmmDException) else DmmDException(str(e))
+
+    # Downloads start while the crawl is still listing directories
+    semaphore, tasks = asyncio.Semaphore(concurrency), set()
+
+    def finished(task: asyncio.Task) -> None:
+        tasks.discard(task)
+        semaphore.release()
+
+    def listing_failed(directory: str, error: DmmDException) -> None:
+        result.failed[f"{directory}/"] = error
+
+    try:
+        async for path in walk(static, root, concurrency, listing_failed):
+            await semaphore.acquire()
+            task = asyncio.ensure_future(fetch(path))
+            task.add_done_callback(finished)
+            tasks.add(task)
+
+        await asyncio.gather(*tasks)
+
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        save_manifest(destination, manifest)
+
+    return result
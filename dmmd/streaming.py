@@ -0,0 +1,77 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import re
+import json
+import codecs
+import typing
+from enum import Enum
+
+# Incremental JSON array decoding. Each element is handed to the C accelerated scanner
+# behind json.loads once it has fully arrived, so only the element currently being
+# received is ever buffered.
+SCAN       = json.JSONDecoder().scan_once
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class State(Enum):
+    START     = 0  # Before the opening bracket
+    FIRST     = 1  # Expecting the first element, or the end of an empty array
+    VALUE     = 2  # Expecting an element after a comma
+    SEPARATOR = 3  # Expecting a comma or the closing bracket
+    DONE      = 4
+
+class ArrayScanner:
+    def __init__(self) -> None:
+        self.text, self.position, self.state = "", 0, State.START
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, chunk: bytes) -> list[typing.Any]:
+        text, position, elements = self.text[self.position:] + self.decoder.decode(chunk), 0, []
+        state, length = self.state, len(text)
+        while position < length:
+            character = text[position]
+            if character in " \t\n\r":
+                position = WHITESPACE.match(text, position).end()  # type: ignore
+                continue
+
+            if state is State.VALUE or (state is State.FIRST and character != "]"):
+                try:
+                    element, end = SCAN(text, position)
+
+                except (StopIteration, json.JSONDecodeError):
+                    break  # Not fully received yet
+
+                # A number could still continue in the next chunk; the scanner stops at a trailing
+                # "." or exponent marker ("-2500." or "1e") and returns the part before it.
+                if end == length or text[end] in ".eE":
+                    break
+
+                elements.append(element)
+                state, position = State.SEPARATOR, end
+
+            elif state is State.SEPARATOR and character == ",":
+                state, position = State.VALUE, position + 1
+
+            elif (state is State.SEPARATOR or state is State.FIRST) and character == "]":
+                state, position = State.DONE, position + 1
+
+            elif state is State.START and character == "[":
+                state, position = State.FIRST, position + 1
+
+            else:
+                raise ValueError(f"Unexpected {character!r} in JSON array.")
+
+        self.text, self.position, self.state = text, position, state
+        return elements
+
+    def close(self) -> None:
+        if self.state is not State.DONE:
+            raise ValueError("Response body ended before the JSON array was complete, or holds a malformed element.")
+
+async def iter_array(chunks: typing.AsyncIterable[bytes]) -> typing.AsyncIterator[typing.Any]:
+    scanner = ArrayScanner()
+    async for chunk in chunks:
+        for element in scanner.feed(chunk):
+            yield element
+
+    scanner.close()
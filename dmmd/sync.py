@@ -0,0 +1,176 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import typing
+import atexit
+import asyncio
+import inspect
+import threading
+from weakref import WeakSet
+
+from dmmd.client import Service
+from dmmd.icdn import iCDN as AsyncCDN
+from dmmd.data import Data as AsyncData
+from dmmd.static import Static as AsyncStatic
+from dmmd.icdn.query import PlannedCallable
+from dmmd.icdn._typing import BuiltCallable
+
+# Background loop
+class LoopThread:
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.services: WeakSet[Service] = WeakSet()
+
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target = self.loop.run_forever, name = "dmmd-sync", daemon = True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self.loop.is_closed()
+
+    def run[T](self, coroutine: typing.Coroutine[typing.Any, typing.Any, T]) -> T:
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("dmmd.sync can't be called from inside its own event loop!")
+
+        with self._lock:
+            if self.closed:
+                coroutine.close()
+                raise RuntimeError("This dmmd.sync loop has already been closed!")
+
+            future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+        return future.result()
+
+    def track(self, service: Service) -> None:
+        with self._lock:
+            self.services.add(service)
+
+    async def _shutdown(self) -> None:
+        for service in [*self.services]:
+            await service.close()
+
+        await self.loop.shutdown_asyncgens()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+
+_default: typing.Optional[LoopThread] = None
+_default_lock = threading.Lock()
+
+def default_loop() -> LoopThread:
+    global _default
+    with _default_lock:
+        if _default is None or _default.closed:
+            _default = LoopThread()
+            atexit.register(_default.close)
+
+        return _default
+
+# Iteration
+class SyncIterator[T]:
+    def __init__(self, runner: LoopThread, iterator: typing.AsyncIterator[T]) -> None:
+        self.runner, self.iterator = runner, iterator
+
+    def __iter__(self) -> typing.Self:
+        return self
+
+    def __next__(self) -> T:
+        try:
+            return self.runner.run(anext(self.iterator))  # type: ignore
+
+        except StopAsyncIteration:
+            raise StopIteration
+
+    def close(self) -> None:
+        if isinstance(self.iterator, typing.AsyncGenerator) and not self.runner.closed:
+            self.runner.run(self.iterator.aclose())
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+# Searches and find() expressions share fetch/query/walk, only searches can be streamed page by page
+class SyncCallable:
+    def __init__(self, runner: LoopThread, callable: BuiltCallable | PlannedCallable) -> None:
+        self.runner, self.callable = runner, callable
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.callable, name)
+
+    def fetch(self) -> list:
+        return self.runner.run(self.callable.fetch())
+
+    def query(self, raw: bool = False) -> list:
+        return self.runner.run(self.callable.query(raw))
+
+    def stream(self, query: bool = True, page: typing.Optional[int] = None, raw: bool = False) -> SyncIterator:
+        return SyncIterator(self.runner, self.callable.stream(query, page, raw))  # type: ignore
+
+    def walk(self, query: bool = False, limit: typing.Optional[int] = None, raw: bool = False, stream: bool = False) -> SyncIterator:
+        if isinstance(self.callable, PlannedCallable):
+            return SyncIterator(self.runner, self.callable.walk(query, limit, raw))
+
+        return SyncIterator(self.runner, self.callable.walk(query, limit, raw, stream))  # type: ignore
+
+    def __iter__(self) -> SyncIterator:
+        return self.walk()
+
+# Service wrappers
+class SyncService[S: Service]:
+    service: type[S]
+
+    def __init__(self, *args, runner: typing.Optional[LoopThread] = None, **kwargs) -> None:
+        self.runner = runner or default_loop()
+        self.wrapped: S = self.service(*args, **kwargs)
+        self.runner.track(self.wrapped)
+
+    def _wrap(self, value: typing.Any) -> typing.Any:
+        if isinstance(value, BuiltCallable | PlannedCallable):
+            return SyncCallable(self.runner, value)
+
+        if isinstance(value, typing.AsyncIterator):
+            return SyncIterator(self.runner, value)
+
+        return value
+
+    def __getattr__(self, name: str) -> typing.Any:
+        attribute = getattr(self.wrapped, name)
+        if not callable(attribute):
+            return attribute
+
+        if inspect.iscoroutinefunction(attribute):
+            return lambda *args, **kwargs: self._wrap(self.runner.run(attribute(*args, **kwargs)))
+
+        return lambda *args, **kwargs: self._wrap(attribute(*args, **kwargs))
+
+    def close(self) -> None:
+        if not self.runner.closed:
+            self.runner.run(self.wrapped.close())
+
+        self.runner.services.discard(self.wrapped)
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class iCDN(SyncService[AsyncCDN]):
+    service = AsyncCDN
+
+class Static(SyncService[AsyncStatic]):
+    service = AsyncStatic
+
+class Data(SyncService[AsyncData]):
+    service = AsyncData
@@ -0,0 +1,72 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import os
+import json
+import typing
+from pathlib import Path
+from dataclasses import asdict, dataclass
+
+if typing.TYPE_CHECKING:
+    from aiohttp import ClientResponse
+
+# Streaming defaults, kept free of heavy imports so the CLI can use them at startup
+CHUNK_SIZE = 64 * 1024
+
+# Transfer state, kept next to a partial file so an interrupted download resumes from
+# where it stopped, and only while the file upstream is still the same one.
+@dataclass
+class Segment:
+    start:  int
+    end:    int  # Inclusive, like the Range header
+    offset: int  # Next byte to fetch
+
+    @property
+    def done(self) -> bool:
+        return self.offset > self.end
+
+@dataclass
+class TransferState:
+    size:      int
+    validator: typing.Optional[str]  # ETag or Last-Modified, sent back as If-Range when resuming
+    segments:  list[Segment]
+
+    @classmethod
+    def plan(cls, size: int, validator: typing.Optional[str], segment_size: int) -> typing.Self:
+        return cls(size, validator, [
+            Segment(start, min(start + segment_size, size) - 1, start)
+            for start in range(0, size, segment_size)
+        ])
+
+    @classmethod
+    def load(cls, path: Path) -> typing.Optional[typing.Self]:
+        try:
+            state = json.loads(path.read_text())
+            return cls(state["size"], state["validator"], [Segment(**segment) for segment in state["segments"]])
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        temporary = path.with_name(f"{path.name}.tmp")
+        temporary.write_text(json.dumps(asdict(self)))
+        os.replace(temporary, path)
+
+    @property
+    def received(self) -> int:
+        return sum(segment.offset - segment.start for segment in self.segments)
+
+def state_path(partial: Path) -> Path:
+    return partial.with_name(f"{partial.name}.json")
+
+def validator(response: "ClientResponse") -> typing.Optional[str]:
+    return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+def content_range(response: "ClientResponse") -> tuple[typing.Optional[int], typing.Optional[int]]:
+    unit, _, value = response.headers.get("Content-Range", "").partition(" ")
+    window, _, size = value.partition("/")
+    if unit != "bytes" or not size.isdigit():
+        return None, None
+
+    start = window.partition("-")[0]
+    return int(start) if start.isdigit() else None, int(size)
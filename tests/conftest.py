@@ -0,0 +1,81 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import socket
+import typing
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+
+from benchmarks.server import build_app
+
+# Servers run on their own event loop in a background thread, so tests can drive the
+# library with asyncio.run() while the server keeps answering.
+class Server:
+    def __init__(self, app: web.Application) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target = self.loop.run_forever, daemon = True)
+        self.thread.start()
+
+        self.runner = web.AppRunner(app, access_log = None)
+        self.url = asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    async def _start(self) -> str:
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        host, port = self.runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+type Serve = typing.Callable[[web.Application], str]
+
+@pytest.fixture
+def serve() -> typing.Iterator[Serve]:
+    servers: list[Server] = []
+
+    def start(app: web.Application) -> str:
+        servers.append(server := Server(app))
+        return server.url
+
+    yield start
+    for server in servers:
+        server.close()
+
+# The benchmark stand-in, 30 items with a 200 KB body behind every file
+ITEMS     = 30
+FILE_SIZE = 200_000
+
+@pytest.fixture
+def stand_in(serve: Serve) -> str:
+    return serve(build_app(items = ITEMS, file_size = FILE_SIZE))
+
+# Answers with the scripted statuses in order, then with success from there on
+class Scripted:
+    def __init__(self, *statuses: int, retry_after: str = "0") -> None:
+        self.statuses, self.retry_after, self.hits = [*statuses], retry_after, 0
+        self.app = web.Application()
+        self.app.router.add_route("*", "/{path:.*}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        match self.statuses.pop(0) if self.statuses else 200:
+            case 200:
+                return web.json_response({"ok": True})
+
+            case 400:
+                return web.json_response({"code": "INVALID_UUID", "message": "The specified UUID does not exist."}, status = 400)
+
+            case status:
+                return web.Response(status = status, headers = {"Retry-After": self.retry_after})
+
+def unused_url() -> str:
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{listener.getsockname()[1]}"
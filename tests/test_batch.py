@@ -0,0 +1,77 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+
+from aiohttp import ClientConnectorError
+
+from dmmd.icdn import iCDN
+from dmmd.exceptions import InvalidUUID
+from dmmd.resilience import ResiliencePolicy
+from dmmd.client import Client, gather_bounded
+from dmmd.scheduler import PRIORITY, Priority, priority
+
+from tests.conftest import Scripted, Serve, unused_url
+
+# Helpers
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+# Tests
+def test_gather_bounded_limits_concurrency() -> None:
+    running, peak = 0, 0
+
+    async def call(index: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return index
+
+    async def main() -> list:
+        return await gather_bounded([lambda index = index: call(index) for index in range(10)], concurrency = 3)
+
+    assert asyncio.run(main()) == [*range(10)] and peak == 3
+
+def test_gather_bounded_lanes() -> None:
+    async def lane() -> Priority | None:
+        return PRIORITY.get()
+
+    async def main() -> list:
+        with priority(Priority.HIGH):
+            chosen = await gather_bounded([lane])
+
+        return [*await gather_bounded([lane]), *chosen]
+
+    assert asyncio.run(main()) == [Priority.LOW, Priority.HIGH]  # Batches default to the low lane
+
+def test_gather_bounded_reports_errors(serve: Serve) -> None:
+    url = serve(Scripted(400).app)
+
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 1)) as client, \
+            Client(unused_url(), policy = ResiliencePolicy(attempts = 1)) as dead:
+            results = await gather_bounded([
+                lambda: client.request("/a"),
+                lambda: client.request("/b"),
+                lambda: dead.request("/")
+            ], concurrency = 1)
+
+        assert isinstance(results[0], InvalidUUID)
+        assert results[1] == {"ok": True}
+        assert isinstance(results[2], ClientConnectorError)
+
+    asyncio.run(main())
+
+def test_query_and_remove_many(stand_in: str) -> None:
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            results = await cdn.query_many([uuid(1), "missing", uuid(2)])
+            assert [getattr(result, "uuid", None) for result in results] == [uuid(1), None, uuid(2)]
+            assert isinstance(results[1], InvalidUUID)
+
+            removed = await cdn.remove_many([uuid(1), uuid(1)], concurrency = 1)
+            assert getattr(removed[0], "uuid", None) == uuid(1) and isinstance(removed[1], InvalidUUID)
+
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import random
+import asyncio
+from pathlib import Path
+
+from dmmd.icdn import iCDN
+from dmmd.static import Static
+from dmmd.metrics import Metrics
+from dmmd.cache import ContentCache, MetadataCache
+
+from tests.conftest import FILE_SIZE
+
+# Helpers
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+# Metadata cache
+def test_metadata_cache_lru_and_ttl() -> None:
+    cache = MetadataCache(maxsize = 2, ttl = 60.0, ttls = {"page": 0})
+    cache.set(("query", "a"), 1)
+    cache.set(("query", "b"), 2)
+    assert cache.get(("query", "a")) == 1  # Now the most recently used
+    cache.set(("query", "c"), 3)
+    assert cache.get(("query", "b")) is None
+    assert (cache.get(("query", "a")), cache.get(("query", "c"))) == (1, 3)
+    assert cache.stats.evictions == 1
+
+    cache.set(("page", 0), [1, 2])  # A TTL of 0 disables caching for the kind
+    assert cache.get(("page", 0)) is None
+
+    cache.set(("query", "d"), 4, ttl = -1)
+    cache.invalidate_kind("query")
+    assert len(cache) == 0
+
+def test_metadata_cache_write_through(stand_in: str) -> None:
+    cache, events = MetadataCache(), []
+
+    async def main() -> None:
+        async with iCDN(stand_in, cache = cache, metrics = Metrics(callbacks = [events.append])) as cdn:
+            first = await cdn.query(uuid(1))
+            assert await cdn.query(uuid(1)) == first
+            assert await cdn.list(5).fetch() == await cdn.list(5).fetch()
+            assert [event.endpoint for event in events] == [f"/query/{uuid(1)}", "/list"]
+
+            # Writes update the item in place and drop every cached page
+            updated = await cdn.update(uuid(1), name = "renamed")
+            assert (await cdn.query(uuid(1))).name == "renamed" == updated.name
+            await cdn.list(5).fetch()
+            assert [event.endpoint for event in events[2:]] == ["/update", "/list"]
+
+            await cdn.remove(uuid(1))
+            assert cache.get(("query", uuid(1))) is None
+
+    asyncio.run(main())
+
+# Content cache
+def test_content_cache_eviction(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path, max_size = 25)
+    for key in "abc":
+        cache.put(key, key.encode() * 10, "text/plain")
+
+    assert cache.get("a") is None
+    assert cache.size == 20 and cache.stats.evictions == 1
+    assert cache.read(cache.get("b")) == b"b" * 10  # type: ignore
+
+    cache.put("d", b"d" * 10, "text/plain")  # "b" was just used, so "c" goes
+    assert cache.get("c") is None and cache.get("b") is not None
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        name for key in "bd" for name in (ContentCache._digest(key), f"{ContentCache._digest(key)}.json")
+    )
+
+def test_content_cache_size(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path, max_size = 25)
+    cache.put("a", b"a" * 10, "text/plain")
+    cache.put("b", b"b" * 10, "text/plain")
+    cache.put("a", b"a" * 5, "text/plain")  # Replacing an entry only counts the new body
+    assert cache.size == 15 and ContentCache(tmp_path).size == 15
+
+    cache.invalidate("b")
+    assert cache.size == 5
+    cache.clear()
+    assert cache.size == 0
+
+def test_content_cache_oversized_body(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path, max_size = 5)
+    cache.put("big", b"123456", "text/plain")
+    assert cache.get("big") is None and not [*tmp_path.iterdir()]
+
+def test_content_cache_reload(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path)
+    cache.put("kept", b"body", "text/plain", etag = '"1"')
+    cache.put("orphaned", b"body", "text/plain")
+    cache.put("missing", b"body", "text/plain")
+
+    # As left behind by a crash: a body without metadata, metadata without a body, a temporary file
+    (tmp_path / f"{ContentCache._digest('orphaned')}.json").unlink()
+    (tmp_path / ContentCache._digest("missing")).unlink()
+    (tmp_path / ".tmp-leftover").write_bytes(b"")
+    (tmp_path / "unrelated.txt").write_text("left alone")
+
+    cache = ContentCache(tmp_path)
+    entry = cache.get("kept")
+    assert entry is not None and entry.etag == '"1"' and cache.read(entry) == b"body"
+    assert cache.get("orphaned") is None and cache.get("missing") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted([
+        ContentCache._digest("kept"), f"{ContentCache._digest('kept')}.json", "unrelated.txt"
+    ])
+    assert json.loads((tmp_path / f"{ContentCache._digest('kept')}.json").read_text())["key"] == "kept"
+
+def test_content_cache_revalidation(stand_in: str, tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path)
+
+    async def main() -> list[bytes]:
+        async with Static(stand_in, content_cache = cache) as static:
+            return [await static.file("a.bin") for _ in range(3)]
+
+    bodies = asyncio.run(main())
+    assert bodies == [random.Random(0).randbytes(FILE_SIZE)] * 3
+    assert cache.stats.revalidations == 2  # Answered with 304 Not Modified after the first fetch
+    assert cache.stats.hits == 2 and cache.stats.misses == 1
@@ -0,0 +1,110 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from dmmd.client import Client
+from dmmd.exceptions import InvalidUUID
+from dmmd.resilience import ResiliencePolicy
+
+from tests.conftest import Serve
+
+# Answers slowly enough for identical requests to overlap, counting what actually arrived
+class Slow:
+    def __init__(self, delay: float = 0.1) -> None:
+        self.delay, self.hits = delay, []
+        self.app = web.Application()
+        self.app.router.add_route("*", "/{path:.*}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits.append(request.path_qs)
+        await asyncio.sleep(self.delay)
+        if request.path == "/missing":
+            return web.json_response({"code": "INVALID_UUID", "message": "The specified UUID does not exist."}, status = 400)
+
+        if request.path == "/raw":
+            return web.Response(body = b"raw")
+
+        return web.json_response({"path": request.path_qs, "items": [1, 2]})
+
+# Coalescing
+def test_identical_gets_share_a_call(serve: Serve) -> None:
+    slow = Slow()
+    url = serve(slow.app)
+
+    async def main() -> None:
+        async with Client(url) as client:
+            results = await asyncio.gather(*(client.request("/a", params = {"x": 1}) for _ in range(5)))
+            assert all(result == {"path": "/a?x=1", "items": [1, 2]} for result in results)
+
+            # Every caller gets its own copy to change
+            results[0]["items"].append(3)
+            assert results[1]["items"] == [1, 2]
+
+            assert await asyncio.gather(client.request_bytes("/raw"), client.request_bytes("/raw")) == [b"raw", b"raw"]
+            assert (client.coalescing.requests, client.coalescing.coalesced) == (7, 5)
+
+    asyncio.run(main())
+    assert slow.hits == ["/a?x=1", "/raw"]
+
+def test_distinct_requests_go_out_alone(serve: Serve) -> None:
+    slow = Slow()
+    url = serve(slow.app)
+
+    async def main() -> None:
+        async with Client(url) as client:
+            await asyncio.gather(
+                client.request("/a", params = {"x": 1}),
+                client.request("/a", params = {"x": 2}),
+                client.request("/a", data = {"json": "{}"}),  # Has a body
+                client.request("/a", data = {"json": "{}"})
+            )
+
+        async with Client(url, coalesce = False) as client:
+            await asyncio.gather(client.request("/b"), client.request("/b"))
+            assert client.coalescing.requests == 0
+
+    asyncio.run(main())
+    assert sorted(slow.hits) == ["/a", "/a", "/a?x=1", "/a?x=2", "/b", "/b"]
+
+def test_shared_errors(serve: Serve) -> None:
+    slow = Slow()
+    url = serve(slow.app)
+
+    async def main() -> None:
+        async with Client(url) as client:
+            results = await asyncio.gather(*(client.request("/missing") for _ in range(3)), return_exceptions = True)
+            assert all(isinstance(result, InvalidUUID) for result in results)
+
+    asyncio.run(main())
+    assert slow.hits == ["/missing"]
+
+def test_cancelled_waiters(serve: Serve) -> None:
+    slow = Slow(delay = 0.2)
+    url = serve(slow.app)
+
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 1)) as client:
+            first, second = (asyncio.ensure_future(client.request("/a")) for _ in range(2))
+            await asyncio.sleep(0.05)
+
+            # One caller leaving doesn't affect the other
+            first.cancel()
+            assert await second == {"path": "/a", "items": [1, 2]}
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+            # Once nobody is left, the call itself is cancelled and a new one starts
+            third = asyncio.ensure_future(client.request("/b"))
+            await asyncio.sleep(0.05)
+            third.cancel()
+            await asyncio.gather(third, return_exceptions = True)
+            await asyncio.sleep(0)
+            assert client._flights == {}
+            assert await client.request("/b") == {"path": "/b", "items": [1, 2]}
+
+    asyncio.run(main())
+    assert slow.hits == ["/a", "/b", "/b"]
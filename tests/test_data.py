@@ -0,0 +1,117 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import re
+import json
+import asyncio
+import hashlib
+
+import pytest
+from aiohttp import web
+
+from benchmarks.server import make_data
+from dmmd.data import Data
+from dmmd.data.store import DataStore
+from dmmd.exceptions import DmmDException
+from dmmd.resilience import ResiliencePolicy
+
+from tests.conftest import Serve
+
+# Datasets the test can change between refreshes, served with an ETag (or without one, to
+# exercise the body hash comparison) and sent in pieces that end right after every ".", "e"
+# and "E", where a number cut off looks like a complete, shorter one.
+class Datasets:
+    def __init__(self, etags: bool = True, pause: float = 0.0) -> None:
+        self.values, self.etags, self.pause, self.failing = make_data(12), etags, pause, False
+        self.app = web.Application()
+        self.app.router.add_get("/api/data/{name:tags|anime|games}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        name = request.match_info["name"]
+        if self.failing:
+            return web.Response(status = 500)
+
+        body = json.dumps(self.values[name]).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.etags and request.headers.get("If-None-Match") == etag:
+            return web.Response(status = 304, headers = {"ETag": etag})
+
+        response = web.StreamResponse(headers = {"Content-Type": "application/json"} | ({"ETag": etag} if self.etags else {}))
+        await response.prepare(request)
+        for piece in re.split(rb"(?<=[.eE])", body):
+            await response.write(piece)
+            if self.pause:
+                await asyncio.sleep(self.pause)  # Keeps the pieces from being read as one
+
+        await response.write_eof()
+        return response
+
+# Tests
+@pytest.mark.parametrize("etags", [True, False])
+def test_store_refresh(serve: Serve, etags: bool) -> None:
+    datasets = Datasets(etags)
+    url = serve(datasets.app)
+
+    async def main() -> None:
+        async with Data(url) as data, DataStore(data, ttl = None) as store:
+            first = store.snapshot
+            assert store.anime("a3") is not None and store.anime("a3").title == "Anime 3"  # type: ignore
+            assert [item.rating for item in store.top_anime(3)] == sorted((item["rating"] for item in datasets.values["anime"]), reverse = True)[:3]
+
+            # Nothing changed, so the snapshot is kept as it is
+            assert await store.refresh() is False
+            assert store.snapshot is first
+
+            # A change rebuilds the snapshot, while the old one stays as it was for whoever holds it
+            datasets.values["anime"][3] |= {"title": "Renamed", "rating": 10.0, "tags": ["t99"]}
+            assert await store.refresh() is True
+            assert store.snapshot is not first
+            assert store.anime("a3").title == "Renamed" and store.top_anime(1)[0].id == "a3"  # type: ignore
+            assert [item.id for item in store.anime_with_tag("t99")] == ["a3"]
+            assert first.anime["a3"].title == "Anime 3"
+
+            # A failed refresh keeps serving the previous snapshot
+            current, datasets.failing = store.snapshot, True
+            with pytest.raises(DmmDException):
+                await store.refresh()
+
+            assert store.snapshot is current
+
+    asyncio.run(main())
+
+def test_store_background_refresh(serve: Serve) -> None:
+    datasets = Datasets()
+    url = serve(datasets.app)
+
+    async def main() -> None:
+        async with Data(url, policy = ResiliencePolicy(attempts = 1)) as data, DataStore(data, ttl = 0.05) as store:
+            datasets.values["tags"].append({"id": "t99", "name": "new tag"})
+            for _ in range(100):
+                if store.tag("t99") is not None:
+                    break
+
+                await asyncio.sleep(0.02)
+
+            assert store.tag("t99") is not None and store.tag_names(["t99", "unknown"]) == ["new tag", "unknown"]
+
+            datasets.failing = True
+            await asyncio.sleep(0.2)
+            assert store.error is not None and store.tag("t99") is not None
+
+    asyncio.run(main())
+
+def test_stream_split_body(serve: Serve) -> None:
+    datasets = Datasets(pause = 0.001)
+    datasets.values["anime"] = datasets.values["anime"][:6]
+    for index, item in enumerate(datasets.values["anime"]):
+        item["rating"] = -2500.0 - index / 8 if index % 2 else float(index) * 1e-7
+
+    url = serve(datasets.app)
+
+    async def main() -> None:
+        async with Data(url) as data:
+            streamed = [item.rating async for item in data.stream_anime()]
+            assert streamed == [item["rating"] for item in datasets.values["anime"]]
+            assert [item.id async for item in data.stream_tags()] == [item["id"] for item in datasets.values["tags"]]
+
+    asyncio.run(main())
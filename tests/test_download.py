@@ -0,0 +1,149 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import random
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from asyncclick.testing import CliRunner
+
+from dmmd.icdn import iCDN
+from dmmd.client import Client
+from dmmd.icdn.cli.__main__ import icdn
+from dmmd.metrics import Metrics, RequestEvent
+from dmmd.transfer import Segment, TransferState, state_path
+
+from tests.conftest import FILE_SIZE, Serve
+
+# Helpers
+BODY = random.Random(0).randbytes(FILE_SIZE)
+ETAG = f'"0-{FILE_SIZE}"'  # As sent by the stand-in for seed 0
+
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+def leftovers(directory: Path) -> list[str]:
+    return sorted(path.name for path in directory.iterdir() if path.suffix in (".part", ".json"))
+
+# A file that's replaced upstream right after its first request, so segments asked for
+# with the old validator in If-Range get the whole new body back instead.
+class Replaced:
+    def __init__(self) -> None:
+        self.bodies, self.version, self.full = [random.Random(seed).randbytes(FILE_SIZE) for seed in (1, 2)], 0, 0
+        self.app = web.Application()
+        self.app.router.add_get("/file/{uuid}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body, etag = self.bodies[self.version], f'"{self.version}"'
+        self.version = 1
+        headers = {"Accept-Ranges": "bytes", "ETag": etag}
+        if request.headers.get("If-Range", etag) != etag:
+            self.full += 1
+            return web.Response(body = body, content_type = "application/octet-stream", headers = headers)
+
+        start, stop, _ = request.http_range.indices(len(body))
+        return web.Response(
+            status = 206, body = body[start:stop], content_type = "application/octet-stream",
+            headers = headers | {"Content-Range": f"bytes {start}-{stop - 1}/{len(body)}"}
+        )
+
+# Single stream downloads
+def test_download_resumes_through_if_range(stand_in: str, tmp_path: Path) -> None:
+    path, partial = tmp_path / "file.bin", tmp_path / "file.bin.part"
+
+    async def main(validator: str, contents: bytes) -> RequestEvent:
+        events: list[RequestEvent] = []
+        partial.write_bytes(contents)
+        TransferState(FILE_SIZE, validator, [Segment(0, FILE_SIZE - 1, 0)]).save(state_path(partial))
+        async with Client(stand_in, metrics = Metrics(callbacks = [events.append])) as client:
+            assert await client.download(f"/file/{uuid(0)}", path) == path
+
+        assert path.read_bytes() == BODY and leftovers(tmp_path) == []
+        [event] = events
+        return event
+
+    # Still the same file, so only the rest is fetched
+    event = asyncio.run(main(ETAG, BODY[:50_000]))
+    assert (event.status, event.received) == (206, FILE_SIZE - 50_000)
+
+    # Started from another file, which the server sees through If-Range and answers with the whole body
+    event = asyncio.run(main('"1-200000"', random.Random(1).randbytes(FILE_SIZE)[:50_000]))
+    assert (event.status, event.received) == (200, FILE_SIZE)
+
+def test_stream_in_chunks(stand_in: str) -> None:
+    async def main() -> list[bytes]:
+        async with Client(stand_in) as client:
+            return [chunk async for chunk in client.stream(f"/file/{uuid(0)}", chunk_size = 4096)]
+
+    chunks = asyncio.run(main())
+    assert b"".join(chunks) == BODY and max(map(len, chunks)) <= 4096
+
+# Segmented downloads
+def test_download_many(stand_in: str, tmp_path: Path) -> None:
+    targets = {uuid(index): tmp_path / f"{index}.bin" for index in range(4)}
+
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            result = await cdn.download_many(targets, connections = 4, segment_size = 32 * 1024, chunk_size = 8 * 1024)
+
+        assert not result.failed and result.downloaded == targets
+        assert result.total == result.transferred == 4 * FILE_SIZE and result.resumed == 0
+
+    asyncio.run(main())
+    assert all(path.read_bytes() == BODY for path in targets.values())
+    assert leftovers(tmp_path) == []
+
+def test_download_many_resumes(stand_in: str, tmp_path: Path) -> None:
+    path, segment_size, received = tmp_path / "file.bin", 64 * 1024, 10_000
+
+    # Every segment got partway through before the previous run stopped, the rest of the file is zeroes
+    state = TransferState.plan(FILE_SIZE, ETAG, segment_size)
+    partial, contents = path.with_name("file.bin.part"), bytearray(FILE_SIZE)
+    for segment in state.segments:
+        segment.offset = min(segment.start + received, segment.end + 1)
+        contents[segment.start:segment.offset] = BODY[segment.start:segment.offset]
+
+    partial.write_bytes(contents)
+    state.save(state_path(partial))
+
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            result = await cdn.download_many({uuid(0): path}, segment_size = segment_size)
+
+        assert not result.failed
+        assert result.resumed == state.received
+        assert result.transferred == FILE_SIZE - result.resumed and result.total == FILE_SIZE
+
+    asyncio.run(main())
+    assert path.read_bytes() == BODY and leftovers(tmp_path) == []
+
+def test_download_many_restarts(serve: Serve, tmp_path: Path) -> None:
+    replaced = Replaced()
+    url, path = serve(replaced.app), tmp_path / "file.bin"
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            result = await cdn.download_many({uuid(0): path}, segment_size = 64 * 1024)
+
+        assert not result.failed and uuid(0) in result.downloaded
+
+    asyncio.run(main())
+    assert replaced.full and path.read_bytes() == replaced.bodies[1]
+    assert leftovers(tmp_path) == []
+
+# Command line
+def test_cli_download_forms(stand_in: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ICDN_URL", stand_in)
+
+    async def main() -> None:
+        runner = CliRunner()
+        legacy = await runner.invoke(icdn, ["download", uuid(1), str(tmp_path / "legacy.bin")])  # Same as --output
+        assert legacy.exit_code == 0, legacy.output
+
+        rejected = await runner.invoke(icdn, ["download", uuid(1), uuid(2), "stray.bin"])
+        assert rejected.exit_code == 2 and "stray.bin isn't a UUID" in rejected.output
+
+    asyncio.run(main())
+    assert (tmp_path / "legacy.bin").read_bytes() == BODY and leftovers(tmp_path) == []
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+
+from dmmd.client import Client
+from dmmd.endpoints import Endpoints, FailoverPolicy
+
+from tests.conftest import Scripted, Serve, unused_url
+
+# Helpers
+async def reachable(url: str) -> None:
+    pass
+
+def urls(endpoints: Endpoints) -> list[str]:
+    return [endpoint.url for endpoint in endpoints.candidates()]
+
+# Ordering
+def test_candidates_by_latency() -> None:
+    async def main() -> None:
+        endpoints = Endpoints(["a", "b", "c"], FailoverPolicy(), reachable)
+        a, b, _ = endpoints.endpoints
+        endpoints.success(a, 0.2)
+        endpoints.success(b, 0.01)
+        assert urls(endpoints) == ["c", "b", "a"]  # Unmeasured first, so it gets measured
+
+        # Errors count against an endpoint as well (0.3s after one), without taking it out of rotation yet
+        endpoints.policy.down_after = 3
+        endpoints.failure(b)
+        assert urls(endpoints) == ["c", "a", "b"] and b.healthy
+        await endpoints.close()
+
+    asyncio.run(main())
+
+def test_failure_moves_endpoint_last() -> None:
+    async def main() -> None:
+        endpoints = Endpoints(["a", "b", "c"], FailoverPolicy(probe_interval = 60.0), reachable)
+        a, b, c = endpoints.endpoints
+        for endpoint in (a, b, c):
+            endpoints.success(endpoint, 0.1)
+
+        endpoints.failure(b)
+        endpoints.failure(a)
+        assert not a.healthy and not b.healthy
+        assert urls(endpoints) == ["c", "b", "a"]  # Longest down first among the ones that are down
+        assert set(endpoints._probes) == {"a", "b"}
+
+        await endpoints.close()
+        assert endpoints._probes == {}
+
+    asyncio.run(main())
+
+def test_single_endpoint_never_goes_down() -> None:
+    async def main() -> None:
+        endpoints = Endpoints(["a"], FailoverPolicy(), reachable)
+        endpoints.failure(endpoints.endpoints[0])
+        assert endpoints.endpoints[0].healthy and endpoints._probes == {}
+
+    asyncio.run(main())
+
+# Recovery
+def test_probe_recovers_endpoint() -> None:
+    attempts = []
+
+    async def probe(url: str) -> None:
+        attempts.append(url)
+        if len(attempts) < 2:
+            raise ConnectionError
+
+    async def main() -> None:
+        endpoints = Endpoints(["a", "b"], FailoverPolicy(probe_interval = 0.01), probe)
+        a, _ = endpoints.endpoints
+        endpoints.failure(a)
+        assert urls(endpoints) == ["b", "a"]
+
+        for _ in range(100):
+            if a.healthy:
+                break
+
+            await asyncio.sleep(0.01)
+
+        assert a.healthy and a.probes == 2 and a.latency is not None
+        assert endpoints._probes == {}
+
+    asyncio.run(main())
+    assert attempts == ["a", "a"]
+
+# Against real servers
+def test_client_fails_over(serve: Serve) -> None:
+    scripted = Scripted()
+    url, dead = serve(scripted.app), unused_url()
+
+    async def main() -> None:
+        async with Client([dead, url], failover = FailoverPolicy(probe_interval = 60.0)) as client:
+            assert client.url("/x") == f"{dead}/x"  # Cache keys keep using the first URL
+            assert await client.request("/a") == {"ok": True}
+            assert await client.request("/b") == {"ok": True}
+
+            down, up = client.endpoints.stats()
+            assert not down.healthy and down.requests == 1  # Skipped once it was known to be down
+            assert up.healthy and up.requests == 2 and up.latency is not None
+
+    asyncio.run(main())
+    assert scripted.hits == 2
+
+def test_client_probes_endpoint_back(serve: Serve) -> None:
+    scripted = Scripted(503)
+    url = serve(scripted.app)
+
+    async def main() -> None:
+        async with Client([url, unused_url()], failover = FailoverPolicy(probe_interval = 0.01, probe_path = "/health")) as client:
+            endpoint = client.endpoints.endpoints[0]
+            client.endpoints.failure(endpoint)
+            for _ in range(100):
+                if endpoint.healthy:
+                    break
+
+                await asyncio.sleep(0.01)
+
+            assert endpoint.healthy and endpoint.probes == 2  # The first probe was answered with a 503
+
+    asyncio.run(main())
+    assert scripted.hits == 2
@@ -0,0 +1,130 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import os
+import random
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from benchmarks.server import build_app
+from dmmd.icdn import iCDN
+from dmmd.resilience import ResiliencePolicy
+from dmmd.icdn.sync import MANIFEST, load_manifest
+
+from tests.conftest import FILE_SIZE, ITEMS, Serve
+
+# Helpers
+BODY = random.Random(0).randbytes(FILE_SIZE)
+
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+# The stand-in, with downloads of chosen files failing or stalling until they're let through
+class Faulty:
+    def __init__(self) -> None:
+        self.failing: set[str] = set()
+        self.stalled: set[str] = set()
+        self.app = build_app(items = ITEMS, file_size = FILE_SIZE)
+        self.app.middlewares.append(self.fault)
+
+    @web.middleware
+    async def fault(self, request: web.Request, handler) -> web.StreamResponse:
+        if request.path.startswith("/file/"):
+            if request.match_info.get("uuid") in self.failing:
+                return web.Response(status = 500)
+
+            if request.match_info.get("uuid") in self.stalled:
+                await asyncio.sleep(1)
+
+        return await handler(request)
+
+# Syncing
+def test_sync_rerun_is_noop(stand_in: str, tmp_path: Path) -> None:
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            first = await cdn.sync(tmp_path)
+            assert len(first.downloaded) == ITEMS and not first.failed and not first.skipped
+
+            # Only the newest item is at the cursor, and it's already there
+            second = await cdn.sync(tmp_path)
+            assert second.downloaded == [] and second.skipped == 1 and not second.failed
+
+    asyncio.run(main())
+    files = [path for path in tmp_path.iterdir() if path.name != MANIFEST]
+    assert len(files) == ITEMS and all(path.read_bytes() == BODY for path in files)
+    assert load_manifest(tmp_path)["cursor"] == 1_700_000_000_000 + (ITEMS - 1) * 1000
+
+def test_sync_picks_up_failures(serve: Serve, tmp_path: Path) -> None:
+    faulty = Faulty()
+    faulty.failing = {uuid(10), uuid(20)}
+    url = serve(faulty.app)
+
+    async def main() -> None:
+        async with iCDN(url, policy = ResiliencePolicy(attempts = 1)) as cdn:
+            first = await cdn.sync(tmp_path)
+            assert set(first.failed) == faulty.failing and len(first.downloaded) == ITEMS - 2
+
+            # The cursor stays at the first failure, so both are fetched next time and nothing else is
+            assert load_manifest(tmp_path)["cursor"] == 1_700_000_000_000 + 10 * 1000
+            faulty.failing = set()
+            second = await cdn.sync(tmp_path)
+            assert sorted(second.downloaded) == [uuid(10), uuid(20)] and not second.failed
+
+            assert (await cdn.sync(tmp_path)).downloaded == []
+
+    asyncio.run(main())
+    assert len(load_manifest(tmp_path)["items"]) == ITEMS
+
+def test_sync_cut_short(serve: Serve, tmp_path: Path) -> None:
+    faulty = Faulty()
+    faulty.stalled = {uuid(5)}
+    url = serve(faulty.app)
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(cdn.sync(tmp_path, concurrency = 4), 0.5)
+
+            # Everything that finished was kept, and the cursor waits at what didn't
+            manifest = load_manifest(tmp_path)
+            assert uuid(5) not in manifest["items"] and len(manifest["items"]) == ITEMS - 1
+            assert manifest["cursor"] == 1_700_000_000_000 + 5 * 1000
+
+            faulty.stalled = set()
+            assert (await cdn.sync(tmp_path)).downloaded == [uuid(5)]
+
+    asyncio.run(main())
+
+def test_sync_prune(stand_in: str, tmp_path: Path) -> None:
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            await cdn.sync(tmp_path)
+            await cdn.remove(uuid(3))
+            kept = await cdn.sync(tmp_path)
+            assert kept.pruned == [] and kept.stale == [uuid(3)]  # Only reported unless asked for
+            assert (await cdn.sync(tmp_path, prune = True)).pruned == [uuid(3)]
+
+    asyncio.run(main())
+    assert uuid(3) not in load_manifest(tmp_path)["items"]
+    assert not [path for path in tmp_path.iterdir() if path.name.startswith(uuid(3))]
+
+def test_sync_repairs_local_files(stand_in: str, tmp_path: Path) -> None:
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            await cdn.sync(tmp_path)
+            items = load_manifest(tmp_path)["items"]
+            edited, missing, touched = (tmp_path / items[uuid(index)]["file"] for index in (1, 2, 3))
+            edited.write_bytes(b"x" + BODY[1:])
+            missing.unlink()
+            os.utime(touched, ns = (0, 0))  # Same content, so only the hash tells it apart
+
+            # Both are from before the cursor, so they're looked up rather than walked
+            repaired = await cdn.sync(tmp_path)
+            assert sorted(repaired.downloaded) == [uuid(1), uuid(2)] and not repaired.failed
+            assert (await cdn.sync(tmp_path)).downloaded == []
+
+    asyncio.run(main())
+    assert all(path.read_bytes() == BODY for path in tmp_path.iterdir() if path.name != MANIFEST)
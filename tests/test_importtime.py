@@ -0,0 +1,9 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+from benchmarks.importtime import check
+
+# The CLI's startup budget as enforced by `python -m benchmarks.importtime`, which also
+# fails when aiohttp, pydantic and the like are imported before a command needs them
+def test_cli_import_budget() -> None:
+    assert check("dmmd.icdn.cli.__main__", budget = 75.0, runs = 3)
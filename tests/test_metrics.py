@@ -0,0 +1,87 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+
+from dmmd.icdn import iCDN
+from dmmd.client import Client
+from dmmd.pool import SessionPool
+from dmmd.resilience import ResiliencePolicy
+from dmmd.metrics import TRACE_CONFIG, Histogram, Metrics, RequestEvent, route_of
+
+from tests.conftest import FILE_SIZE, Scripted, Serve
+
+# Helpers
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+# Aggregation
+def test_routes_are_folded() -> None:
+    assert route_of(f"/file/{uuid(1)}") == "/file/{uuid}" == route_of(f"/file/{uuid(2)}")
+    assert route_of("/f/some/deep/path.png") == "/f/{path}"
+    assert route_of("/list") == "/list"
+
+def test_histogram_buckets() -> None:
+    histogram = Histogram((0.1, 1.0))
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+
+    assert [*histogram.cumulative()] == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.count == 4 and histogram.sum == 2.65
+
+def test_prometheus_output() -> None:
+    metrics = Metrics(buckets = (0.1,))
+    metrics.record(RequestEvent("GET", "/list", "/list", status = 200, attempts = 2, duration = 0.05, received = 10))
+    metrics.record(RequestEvent("GET", "/list", "/list", error = "Quoted\"Error", attempts = 1, duration = 0.5))
+    text = metrics.prometheus()
+    assert 'dmmd_requests_total{route="/list",method="GET",status="200",error=""} 1' in text
+    assert 'dmmd_requests_total{route="/list",method="GET",status="",error="Quoted\\"Error"} 1' in text
+    assert 'dmmd_retries_total{route="/list",method="GET"} 1' in text
+    assert 'dmmd_request_duration_seconds_bucket{route="/list",method="GET",le="+Inf"} 2' in text
+    assert 'dmmd_response_bytes_total{route="/list",method="GET"} 10' in text
+    assert text.endswith("\n")
+
+# Instrumentation
+def test_requests_are_recorded(stand_in: str) -> None:
+    events: list[RequestEvent] = []
+    metrics = Metrics(callbacks = [events.append])
+
+    async def main() -> None:
+        async with iCDN(stand_in, metrics = metrics) as cdn:
+            await cdn.query(uuid(1))
+            await cdn.file(uuid(1))
+            await cdn.update(uuid(1), name = "renamed")
+
+    asyncio.run(main())
+    query, file, update = events
+    assert (query.route, query.status, query.attempts, file.route) == ("/query/{uuid}", 200, 1, "/file/{uuid}")
+    assert query.connect > 0 and file.connect == 0  # The connection was reused
+    assert all(event.ttfb > 0 and event.duration >= event.ttfb for event in events)
+    assert file.received == FILE_SIZE and update.sent > 0 and update.method == "POST"
+    assert metrics.in_flight == 0
+
+def test_retries_and_errors(serve: Serve) -> None:
+    events: list[RequestEvent] = []
+    url = serve(Scripted(503, 200, 400).app)
+
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 2, backoff = 0.0), metrics = Metrics(callbacks = [events.append])) as client:
+            await client.request("/a")
+            await asyncio.gather(client.request("/b"), return_exceptions = True)
+
+    asyncio.run(main())
+    assert [(event.status, event.attempts, event.error) for event in events] == [(200, 2, None), (400, 1, "InvalidUUID")]
+
+# Only clients with metrics get sessions with the trace callbacks
+def test_tracing_is_opt_in(serve: Serve) -> None:
+    url = serve(Scripted().app)
+
+    async def main() -> None:
+        async with SessionPool() as pool, Client(url, pool = pool) as plain, Client(url, pool = pool, metrics = Metrics()) as traced:
+            await plain.request("/")
+            await traced.request("/")
+            assert TRACE_CONFIG not in plain._session(url).trace_configs
+            assert TRACE_CONFIG in traced._session(url).trace_configs
+            assert len(pool._sessions) == 2
+
+    asyncio.run(main())
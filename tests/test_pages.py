@@ -0,0 +1,98 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import gc
+import asyncio
+
+from aiohttp import web
+
+from benchmarks.server import build_app, make_items
+from dmmd.icdn import iCDN
+from dmmd.resilience import ResiliencePolicy
+
+from tests.conftest import ITEMS, Serve
+
+# The stand-in, noting every page of the listing asked for and failing the ones chosen
+class Listing:
+    def __init__(self) -> None:
+        self.pages: list[int] = []
+        self.failing: set[int] = set()
+        self.app = build_app(items = ITEMS, file_size = 1)
+        self.app.middlewares.append(self.note)
+
+    @web.middleware
+    async def note(self, request: web.Request, handler) -> web.StreamResponse:
+        if request.path == "/list":
+            self.pages.append(page := int(request.query.get("page", 0)))
+            if page in self.failing:
+                return web.Response(status = 500)
+
+        return await handler(request)
+
+UUIDS = [item["uuid"] for item in make_items(ITEMS)]
+
+# Tests
+def test_walk_stops_at_short_page(serve: Serve) -> None:
+    listing = Listing()
+    url = serve(listing.app)
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            for stream in (False, True):
+                listing.pages = []
+                assert [uuid async for uuid in cdn.list(7).walk(stream = stream)] == UUIDS
+                assert listing.pages == [0, 1, 2, 3, 4]  # The last page has 2 items, so there's no sixth request
+
+            # A full last page needs one more (empty) page to know it was the last
+            listing.pages = []
+            assert [uuid async for uuid in cdn.list(10).walk()] == UUIDS
+            assert listing.pages == [0, 1, 2, 3]
+
+    asyncio.run(main())
+
+def test_walk_limit(serve: Serve) -> None:
+    listing = Listing()
+    url = serve(listing.app)
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            for stream in (False, True):
+                listing.pages = []
+                assert [uuid async for uuid in cdn.list(7, page = 1).walk(limit = 10, stream = stream)] == UUIDS[7:17]
+                assert listing.pages == [1, 2]
+
+    asyncio.run(main())
+
+def test_walk_prefetches_next_page(serve: Serve) -> None:
+    listing = Listing()
+    url = serve(listing.app)
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            walker = cdn.list(10).walk()
+            assert await anext(walker) == UUIDS[0]
+            await asyncio.sleep(0.05)
+            assert listing.pages == [0, 1]  # Requested while the first page is still being consumed
+            await walker.aclose()
+
+    asyncio.run(main())
+
+# Stopping early after the prefetched page failed must not leave its error unretrieved
+def test_walk_stopped_after_failed_prefetch(serve: Serve) -> None:
+    listing, errors = Listing(), []
+    listing.failing = {1}
+    url = serve(listing.app)
+
+    async def main() -> None:
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        async with iCDN(url, policy = ResiliencePolicy(attempts = 1)) as cdn:
+            walker = cdn.list(10).walk()
+            assert await anext(walker) == UUIDS[0]
+            await asyncio.sleep(0.05)
+            await walker.aclose()
+            del walker
+            await asyncio.sleep(0)
+            gc.collect()
+
+    asyncio.run(main())
+    assert listing.pages == [0, 1] and errors == []
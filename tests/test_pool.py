@@ -0,0 +1,86 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+
+from dmmd.client import Client
+from dmmd.pool import PoolOptions, SessionPool
+
+from tests.conftest import Scripted, Serve
+
+# Owners only need to be weakly referenceable
+class Owner:
+    pass
+
+# Sharing
+def test_sessions_shared_per_origin() -> None:
+    async def main() -> None:
+        async with SessionPool() as pool:
+            first, second = Owner(), Owner()
+            session = pool.acquire("http://host:1/a", first)
+            assert pool.acquire("http://host:1/b/c", second) is session
+            assert pool.acquire("http://host:2", first) is not session
+            assert len(pool._sessions) == 2
+
+            # Closed once the last owner is released
+            await pool.release(first)
+            assert not session.closed and len(pool._sessions) == 1
+            await pool.release(second)
+            assert session.closed and pool._sessions == {} and pool._owners == {}
+
+            # And a fresh one is opened when needed again
+            assert pool.acquire("http://host:1", first) is not session
+
+    asyncio.run(main())
+
+def test_pool_close() -> None:
+    async def main() -> None:
+        pool = SessionPool()
+        async with pool:
+            sessions = [pool.acquire(f"http://host:{port}", Owner()) for port in (1, 2)]
+
+        assert all(session.closed for session in sessions) and pool._sessions == {}
+
+    asyncio.run(main())
+
+def test_host_options() -> None:
+    async def main() -> None:
+        async with SessionPool(PoolOptions(limit = 10), {"special": PoolOptions(limit = 3)}) as pool:
+            pool.configure("other", PoolOptions(limit = 5))
+            limits = [pool.acquire(url, Owner()).connector.limit for url in ["http://host", "http://special", "http://other:8080"]]  # type: ignore
+            assert limits == [10, 3, 5]
+
+    asyncio.run(main())
+
+# Every event loop gets its own sessions, and those of closed loops are dropped
+def test_sessions_per_loop() -> None:
+    pool, owner, sessions = SessionPool(), Owner(), []
+
+    async def main() -> None:
+        sessions.append(session := pool.acquire("http://host", owner))
+        assert len(pool._sessions) == 1  # The previous loop's entry was dropped
+        await session.close()
+
+    asyncio.run(main())
+    asyncio.run(main())
+    assert sessions[0] is not sessions[1]
+
+# Releasing while another client acquires the same session must leave that client its own entry
+def test_release_races_acquire(serve: Serve) -> None:
+    url = serve(Scripted().app)
+
+    async def main() -> None:
+        async with SessionPool() as pool:
+            first = Client(url, pool = pool)
+            await first.request("/")
+            closing = asyncio.ensure_future(first.close())
+            await asyncio.sleep(0)
+
+            async with Client(url, pool = pool) as second:
+                assert await second.request("/") == {"ok": True}
+                await closing
+                assert await second.request("/") == {"ok": True}
+
+            assert pool._sessions == {}
+
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+from pathlib import Path
+from datetime import datetime
+
+from dmmd.icdn import iCDN
+from dmmd.exceptions import LargeSource
+from dmmd.icdn.push import HashIndex, PushItem, load_items
+
+# Sources
+def test_load_manifests(tmp_path: Path) -> None:
+    (tmp_path / "items.jsonl").write_text(
+        '{"file": "a.png", "name": "First", "tags": ["x", "y"], "data": {"k": 1}, "time": 1700000000000}\n\n' +
+        '{"file": "sub/b.png"}\n'
+    )
+    (tmp_path / "items.csv").write_text("file,name,tags,data,time\na.png,First,\"x, y\",\"{\"\"k\"\": 1}\",1700000000000\nsub/b.png,,,,\n")
+    expected = [
+        PushItem(tmp_path / "a.png", "First", ["x", "y"], {"k": 1}, datetime.fromtimestamp(1_700_000_000)),
+        PushItem(tmp_path / "sub/b.png", "b.png")
+    ]
+    assert [*load_items(tmp_path / "items.jsonl")] == expected == [*load_items(tmp_path / "items.csv")]
+
+    # Directories are walked in order, with every file named after itself
+    (tmp_path / "tree/nested").mkdir(parents = True)
+    for name in ["tree/b.txt", "tree/nested/a.txt", "tree/a.txt"]:
+        (tmp_path / name).write_text(name)
+
+    assert [item.name for item in load_items(tmp_path / "tree")] == ["a.txt", "b.txt", "a.txt"]
+
+# Pushing
+def test_push_rerun_skips(stand_in: str, tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    for name, body in [("a.txt", b"first"), ("b.txt", b"second"), ("c.txt", b"first")]:
+        (source / name).write_bytes(body)
+
+    index = HashIndex(tmp_path / "index.db")
+
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            first = await cdn.push(source, index)
+            assert set(first.uploaded) == {source / "a.txt", source / "b.txt"} and not first.failed
+            assert first.skipped == {source / "c.txt": first.uploaded[source / "a.txt"]}  # Waited on the identical upload
+
+            second = await cdn.push(source, index)
+            assert second.uploaded == {} and len(second.skipped) == 3
+
+            # Content removed upstream since is uploaded again
+            await cdn.remove(first.uploaded[source / "b.txt"])
+            third = await cdn.push(source, index)
+            assert set(third.uploaded) == {source / "b.txt"} and len(third.skipped) == 2
+            assert third.uploaded[source / "b.txt"] != first.uploaded[source / "b.txt"]
+
+    try:
+        asyncio.run(main())
+
+    finally:
+        index.close()
+
+def test_push_failures(stand_in: str, tmp_path: Path) -> None:
+    large, missing, fine = tmp_path / "large.bin", tmp_path / "missing.bin", tmp_path / "fine.txt"
+    with large.open("wb") as handle:
+        handle.truncate(1024 ** 3 + 1)  # Sparse, one byte over the stand-in's limit
+
+    fine.write_text("fine")
+    reports = []
+
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            items = [PushItem(path, path.name) for path in (large, missing, fine)]
+            result = await cdn.push(items, progress = lambda item, status: reports.append((item.path.name, status)))
+            assert [*result.uploaded] == [fine] and set(result.failed) == {large, missing}
+            assert isinstance(result.failed[large], LargeSource)
+
+    asyncio.run(main())
+    assert sorted(reports) == [("fine.txt", "uploaded"), ("large.bin", "failed"), ("missing.bin", "failed")]
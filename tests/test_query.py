@@ -0,0 +1,98 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+
+import pytest
+
+from benchmarks.server import make_items
+from dmmd.icdn import DataRecord, iCDN
+from dmmd.sync import LoopThread, SyncCallable, iCDN as SyncCDN
+from dmmd.exceptions import InvalidQuery
+from dmmd.icdn.query import MAX_SEARCHES, And, Mime, Name, Not, Or, Range, Tag, parse, plan
+
+from tests.conftest import ITEMS
+
+# Parsing
+def test_parse_precedence() -> None:
+    assert parse("(anime AND 2024) OR (game AND NOT nsfw)") == Or((
+        And((Tag("anime"), Tag("2024"))),
+        And((Tag("game"), Not(Tag("nsfw"))))
+    ))
+    assert parse("anime game OR art") == Or((And((Tag("anime"), Tag("game"))), Tag("art")))
+    assert parse('name:"two words" size>=10 size<20') == And((Name("two words"), Range("size", 10, None), Range("size", None, 19)))
+
+@pytest.mark.parametrize("text", ["", "(anime", "anime)", "AND", "name:"])
+def test_parse_errors(text: str) -> None:
+    with pytest.raises(InvalidQuery):
+        parse(text)
+
+# Planning
+def test_plan_distributes_into_searches() -> None:
+    branches = plan(parse("(anime OR game) AND (2024 OR 2025)"))
+    assert sorted(sorted(branch.search["tags"]) for branch in branches) == [
+        ["2024", "anime"], ["2024", "game"], ["2025", "anime"], ["2025", "game"]
+    ]
+    assert all(not branch.residual for branch in branches)
+
+def test_plan_negations_become_residual() -> None:
+    [branch] = plan(parse("game AND NOT nsfw"))
+    assert branch.search["tags"] == ["game"]
+    assert branch.residual == ((Tag("nsfw"), False),)
+
+def test_plan_de_morgan() -> None:
+    branches = plan(~(Tag("a") & Tag("b")))
+    assert sorted((branch.residual for branch in branches), key = repr) == [((Tag("a"), False),), ((Tag("b"), False),)]
+
+def test_plan_drops_subsumed_and_contradictions() -> None:
+    assert [branch.search["tags"] for branch in plan(parse("anime OR (anime AND game)"))] == [["anime"]]
+    assert plan(parse("anime AND NOT anime")) == []
+    assert plan(parse("size>100 size<50")) == []
+
+def test_plan_merges_ranges_and_parameters() -> None:
+    [branch] = plan(parse("size>=10 size<=100 size>=20 mime:image/png mime:text/plain"))
+    assert (branch.search["minimum"], branch.search["maximum"]) == (20, 100)
+    assert branch.search["mime"] in ("image/png", "text/plain")
+    assert len(branch.residual) == 1 and isinstance(branch.residual[0][0], Mime)
+
+def test_plan_too_complex_falls_back_to_one_search() -> None:
+    expression = And(tuple(Or((Tag(f"a{index}"), Tag(f"b{index}"))) for index in range(5)))
+    assert 2 ** 5 > MAX_SEARCHES
+    [branch] = plan(expression)
+    assert branch.search == {} and branch.residual == ((expression, True),)
+
+# Merging against the stand-in, compared to filtering the whole dataset locally
+@pytest.mark.parametrize("text", ["anime OR game", "(anime AND 2024) OR (game AND NOT nsfw)", "NOT art AND (music OR 2025)"])
+def test_find_merges_and_dedupes(stand_in: str, text: str) -> None:
+    expression = parse(text)
+    records = [DataRecord(**item) for item in make_items(ITEMS)]
+    expected = [record.uuid for record in sorted(records, key = lambda record: record.time, reverse = True) if expression.matches(record)]
+
+    async def main() -> tuple[list[str], list[str]]:
+        async with iCDN(stand_in) as cdn:
+            walked = [uuid async for uuid in cdn.find(expression, 4, remote = True).walk()]
+            second = await cdn.find(expression, 4, 1, remote = True).fetch()
+            return walked, second
+
+    walked, second = asyncio.run(main())
+    assert expected and walked == expected
+    assert len(set(walked)) == len(walked)
+    assert second == expected[4:8]
+
+# The blocking wrapper runs every part of a find on its own loop
+def test_find_through_sync_facade(stand_in: str) -> None:
+    expression = parse("anime OR game")
+    records = [DataRecord(**item) for item in make_items(ITEMS)]
+    expected = [record.uuid for record in sorted(records, key = lambda record: record.time, reverse = True) if expression.matches(record)]
+
+    runner = LoopThread()
+    try:
+        with SyncCDN(stand_in, runner = runner) as cdn:
+            found = cdn.find(expression, 4, remote = True)
+            assert isinstance(found, SyncCallable) and len(found.plan) == 2
+            assert found.fetch() == expected[:4]
+            assert [item.uuid for item in found.query()] == expected[:4]
+            assert [*found.walk()] == expected and [item.uuid for item in found.walk(query = True, limit = 5)] == expected[:5]
+
+    finally:
+        runner.close()
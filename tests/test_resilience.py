@@ -0,0 +1,136 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+from time import perf_counter
+from types import SimpleNamespace
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+
+from dmmd.client import Client
+from dmmd.resilience import CircuitBreaker, ResiliencePolicy
+from dmmd.exceptions import CircuitOpen, DmmDException, InvalidUUID, ServerException
+
+from tests.conftest import Scripted, Serve
+
+# Circuit breaking
+def test_breaker_states() -> None:
+    async def main() -> None:
+        breaker = CircuitBreaker(threshold = 2, cooldown = 0.05)
+        breaker.failure()
+        assert breaker.state == "closed"
+        breaker.failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpen):
+            breaker.check("host")
+
+        # After the cooldown a single probe goes through, and its failure opens the circuit straight away
+        await asyncio.sleep(0.06)
+        assert breaker.state == "half-open"
+        breaker.check("host")
+        with pytest.raises(CircuitOpen):
+            breaker.check("host")
+
+        breaker.failure()
+        assert breaker.state == "open"
+
+        # A successful probe closes it again
+        await asyncio.sleep(0.06)
+        breaker.check("host")
+        breaker.success()
+        assert breaker.state == "closed" and breaker.failures == 0
+        breaker.check("host")
+
+    asyncio.run(main())
+
+def test_breaker_opens_through_client(serve: Serve) -> None:
+    scripted = Scripted(500, 500, 500)
+    url = serve(scripted.app)
+
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 1, breaker_threshold = 2)) as client:
+            for _ in range(2):
+                with pytest.raises(ServerException):
+                    await client.request("/")
+
+            with pytest.raises(CircuitOpen):
+                await client.request("/")
+
+    asyncio.run(main())
+    assert scripted.hits == 2
+
+# Retries
+def test_delay_honours_retry_after() -> None:
+    policy, error = ResiliencePolicy(backoff = 1.0, max_backoff = 5.0), ServerException()
+    assert all(0 <= policy.delay(3, error) <= 4.0 for _ in range(50))
+
+    setattr(error, "retry_after", 2.0)
+    assert policy.delay(1, error) == 2.0
+    setattr(error, "retry_after", 60.0)
+    assert policy.delay(1, error) == 5.0
+
+def test_retry_after_forms() -> None:
+    def parse(header: str) -> float | None:
+        response = SimpleNamespace(headers = {"Retry-After": header})
+        return getattr(Client._with_retry_after(ServerException(), response), "retry_after", None)  # type: ignore
+
+    soon = format_datetime(datetime.now(timezone.utc) + timedelta(seconds = 30), usegmt = True)
+    assert parse("12") == 12.0 and 28.0 <= parse(soon) <= 30.0  # type: ignore
+    assert parse("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # Already passed
+    assert parse("soon") is None and parse("") is None
+
+def test_retries_after_throttling(serve: Serve) -> None:
+    scripted = Scripted(429, 503)
+    url = serve(scripted.app)
+
+    # Backoff alone would wait seconds, a Retry-After of 0 retries straight away
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 3, backoff = 30.0, max_backoff = 30.0)) as client:
+            start = perf_counter()
+            assert await client.request("/") == {"ok": True}
+            assert perf_counter() - start < 1.0
+
+    asyncio.run(main())
+    assert scripted.hits == 3
+
+@pytest.mark.parametrize(("statuses", "post", "error"), [
+    ((400,), False, InvalidUUID),      # The server rejected the request itself
+    ((503,), True, ServerException)    # It may have been received, so it's not sent again
+])
+def test_not_retried(serve: Serve, statuses: tuple[int, ...], post: bool, error: type[Exception]) -> None:
+    scripted = Scripted(*statuses)
+    url = serve(scripted.app)
+
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 3, backoff = 0.0)) as client:
+            with pytest.raises(error):
+                await client.request("/", **({"data": {"json": "{}"}} if post else {}))
+
+    asyncio.run(main())
+    assert scripted.hits == 1
+
+# Codes the client doesn't know are only retried when the status says the server failed
+@pytest.mark.parametrize(("status", "error", "hits"), [(418, DmmDException, 1), (502, ServerException, 2)])
+def test_unknown_code_retries(serve: Serve, status: int, error: type[Exception], hits: int) -> None:
+    received = []
+
+    async def handle(request: web.Request) -> web.Response:
+        received.append(request)
+        return web.json_response({"code": "NEW_CODE", "message": "Something new."}, status = status)
+
+    app = web.Application()
+    app.router.add_get("/", handle)
+    url = serve(app)
+
+    async def main() -> None:
+        async with Client(url, policy = ResiliencePolicy(attempts = 2, backoff = 0.0)) as client:
+            with pytest.raises(error) as caught:
+                await client.request("/")
+
+            assert type(caught.value) is error and "NEW_CODE" in str(caught.value)
+
+    asyncio.run(main())
+    assert len(received) == hits
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+from time import perf_counter
+
+import pytest
+
+from dmmd.sync import LoopThread
+from dmmd.client import Client
+from dmmd.resilience import ResiliencePolicy
+from dmmd.scheduler import Priority, RateLimit, Scheduler, SchedulerOptions, TokenBucket, classify, priority
+
+from tests.conftest import Scripted, Serve
+
+# Token buckets
+def test_token_bucket() -> None:
+    bucket = TokenBucket(RateLimit(10, burst = 2))
+    for _ in range(2):
+        assert bucket.delay() == 0.0
+        bucket.take()
+
+    assert bucket.delay() == pytest.approx(0.1, abs = 0.01)
+    assert TokenBucket(RateLimit(0.5)).capacity == 1.0  # At least one request goes through when idle
+
+def test_classify() -> None:
+    assert [classify(endpoint) for endpoint in ["/file/abc", "/f/a.bin", "/add", "/list", "/query/abc", "/files"]] == [
+        "bulk", "bulk", "bulk", "metadata", "metadata", "metadata"
+    ]
+
+# Lanes
+def test_lane_order() -> None:
+    scheduler, order = Scheduler(SchedulerOptions(concurrency = 1)), []
+
+    async def request(name: str, lane: Priority) -> None:
+        async with scheduler.slot("http://host", "metadata", lane):
+            order.append(name)
+
+    async def main() -> None:
+        async with scheduler.slot("http://host", "metadata"):
+            tasks = [
+                asyncio.ensure_future(request(name, lane))
+                for name, lane in [("low", Priority.LOW), ("normal 1", Priority.NORMAL), ("high", Priority.HIGH), ("normal 2", Priority.NORMAL)]
+            ]
+            await asyncio.sleep(0.01)
+            assert order == [] and scheduler.stats()["http://host"][Priority.NORMAL].waiting == 2
+
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ["high", "normal 1", "normal 2", "low"]
+
+def test_default_lanes() -> None:
+    scheduler = Scheduler()
+
+    async def main() -> None:
+        for kind in ("metadata", "bulk"):
+            async with scheduler.slot("http://host", kind):
+                pass
+
+        with priority(Priority.HIGH):
+            async with scheduler.slot("http://host", "bulk"):
+                pass
+
+    asyncio.run(main())
+    assert {lane: stats.granted for lane, stats in scheduler.stats()["http://host"].items()} == {
+        Priority.HIGH: 1, Priority.NORMAL: 1, Priority.LOW: 1
+    }
+
+# Rate limits, against a real server
+def test_rate_limit_spaces_requests(serve: Serve) -> None:
+    url = serve(Scripted().app)
+    scheduler = Scheduler(SchedulerOptions(rate = RateLimit(20, burst = 1)))
+
+    async def main() -> float:
+        async with Client(url, scheduler = scheduler, coalesce = False) as client:
+            start = perf_counter()
+            await asyncio.gather(*(client.request(f"/{index}") for index in range(5)))
+            return perf_counter() - start
+
+    assert asyncio.run(main()) >= 0.19  # Four gaps of 50ms after the first request
+    [host] = scheduler.schedulers.values()
+    assert host.in_flight == 0
+
+def test_retries_take_tokens(serve: Serve) -> None:
+    scripted = Scripted(503, 503)
+    url = serve(scripted.app)
+    scheduler = Scheduler(SchedulerOptions(rate = RateLimit(10, burst = 1), concurrency = 1))
+
+    async def main() -> float:
+        async with Client(url, policy = ResiliencePolicy(attempts = 3, backoff = 0.0), scheduler = scheduler) as client:
+            start = perf_counter()
+            assert await client.request("/") == {"ok": True}
+            return perf_counter() - start
+
+    assert asyncio.run(main()) >= 0.19
+    assert scripted.hits == 3
+    assert scheduler.stats()[url][Priority.NORMAL].granted == 3
+    [host] = scheduler.schedulers.values()
+    assert host.in_flight == 0
+
+# A scheduler shared between event loops keeps separate state for each, reported together
+# while they're running and dropped once their loop is closed
+def test_stats_across_loops() -> None:
+    scheduler, runner = Scheduler(), LoopThread()
+
+    async def main() -> None:
+        async with scheduler.slot("http://host/a", "metadata"):
+            pass
+
+    try:
+        runner.run(main())
+        asyncio.run(main())
+        stats = scheduler.stats()["http://host"][Priority.NORMAL]
+        assert len(scheduler.schedulers) == 2
+        assert stats.granted == 2 and stats.waited.count == 2
+        assert 'dmmd_scheduler_wait_seconds_count{host="http://host",lane="normal"} 2' in scheduler.prometheus()
+
+    finally:
+        runner.close()
+
+    asyncio.run(main())
+    assert len(scheduler.schedulers) == 1
@@ -0,0 +1,140 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import asyncio
+import hashlib
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from dmmd.static import Static
+from dmmd.exceptions import DmmDException
+from dmmd.resilience import ResiliencePolicy
+from dmmd.static.mirror import MANIFEST
+
+from tests.conftest import Serve
+
+# A small static tree, recording every request it answers
+FILES = {
+    "a.txt":           b"first",
+    "docs/b c#?%.txt": b"needs quoting",
+    "docs/deep/d.txt": b"nested",
+    "other/e.txt":     b"elsewhere"
+}
+
+class Tree:
+    def __init__(self) -> None:
+        self.files, self.failing = dict(FILES), set()
+        self.requests: list[tuple[str, str]] = []
+        self.app = web.Application()
+        self.app.router.add_get("/d/{path:.*}", self.directory)
+        self.app.router.add_get("/f/{path:.*}", self.file)
+
+    async def directory(self, request: web.Request) -> web.Response:
+        path = request.match_info["path"].strip("/")
+        if path in self.failing:
+            return web.Response(status = 500)
+
+        prefix, entries = f"{path}/" if path else "", set()
+        for name in self.files:
+            if name.startswith(prefix):
+                head, _, rest = name.removeprefix(prefix).partition("/")
+                entries.add(f"{head}/" if rest else head)
+
+        return web.json_response(sorted(entries))
+
+    async def file(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.match_info["path"]))
+        body = self.files[request.match_info["path"]]
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status = 304, headers = {"ETag": etag})
+
+        return web.Response(body = body, headers = {"ETag": etag})
+
+# Crawling
+def test_walk(serve: Serve) -> None:
+    tree = Tree()
+    tree.failing = {"docs/deep"}
+    url, errors = serve(tree.app), []
+
+    async def main() -> None:
+        async with Static(url, policy = ResiliencePolicy(attempts = 1)) as static:
+            found = [path async for path in static.walk(on_error = lambda directory, error: errors.append(directory))]
+            assert sorted(found) == ["a.txt", "docs/b c#?%.txt", "other/e.txt"]
+
+            with pytest.raises(DmmDException):
+                [path async for path in static.walk("docs")]
+
+            assert await static.file("docs/b c#?%.txt") == b"needs quoting"
+
+    asyncio.run(main())
+    assert errors == ["docs/deep"]
+
+# Mirroring
+def test_mirror_revalidates(serve: Serve, tmp_path: Path) -> None:
+    tree = Tree()
+    url = serve(tree.app)
+
+    async def main() -> None:
+        async with Static(url) as static:
+            first = await static.mirror("docs", tmp_path)
+            assert sorted(first.downloaded) == ["docs/b c#?%.txt", "docs/deep/d.txt"] and not first.failed
+            assert (tmp_path / "b c#?%.txt").read_bytes() == b"needs quoting"
+            assert (tmp_path / "deep/d.txt").read_bytes() == b"nested"
+
+            # Stored validators are sent along, so nothing is downloaded twice
+            tree.requests.clear()
+            second = await static.mirror("docs", tmp_path)
+            assert second.downloaded == [] and len(second.skipped) == 2
+            assert sorted(tree.requests) == [("GET", "docs/b c#?%.txt"), ("GET", "docs/deep/d.txt")]
+
+            # A changed file is fetched again
+            tree.files["docs/deep/d.txt"] = b"changed!"
+            assert (await static.mirror("docs", tmp_path)).downloaded == ["docs/deep/d.txt"]
+            assert (tmp_path / "deep/d.txt").read_bytes() == b"changed!"
+
+    asyncio.run(main())
+
+def test_mirror_adopts_existing_files(serve: Serve, tmp_path: Path) -> None:
+    tree = Tree()
+    url = serve(tree.app)
+    for name, body in FILES.items():
+        (tmp_path / name).parent.mkdir(parents = True, exist_ok = True)
+        (tmp_path / name).write_bytes(body)
+
+    (tmp_path / "other/e.txt").write_bytes(b"stale")
+
+    # Without a manifest, only a HEAD is sent for each file, and only the one that differs is fetched
+    async def main() -> None:
+        async with Static(url) as static:
+            result = await static.mirror("", tmp_path)
+            assert result.downloaded == ["other/e.txt"] and len(result.skipped) == 3
+
+    asyncio.run(main())
+    assert sorted(tree.requests) == sorted([("HEAD", name) for name in FILES] + [("GET", "other/e.txt")])
+    assert (tmp_path / "other/e.txt").read_bytes() == b"elsewhere" and (tmp_path / MANIFEST).is_file()
+
+def test_mirror_stays_inside_destination(serve: Serve, tmp_path: Path) -> None:
+    requests = []
+
+    async def listing(request: web.Request) -> web.Response:
+        return web.json_response(["../escape.txt"])
+
+    async def file(request: web.Request) -> web.Response:
+        requests.append(request.path)
+        return web.Response(body = b"nope")
+
+    app = web.Application()
+    app.router.add_get("/d/{path:.*}", listing)
+    app.router.add_get("/f/{path:.*}", file)
+    url = serve(app)
+
+    async def main() -> None:
+        async with Static(url) as static:
+            result = await static.mirror("", tmp_path / "out")
+            assert [*result.failed] == ["../escape.txt"] and not result.downloaded
+
+    asyncio.run(main())
+    assert not (tmp_path / "escape.txt").exists() and requests == []
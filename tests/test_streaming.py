@@ -0,0 +1,79 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import re
+import json
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from dmmd.client import Client
+from dmmd.streaming import ArrayScanner
+
+from tests.conftest import Serve
+
+# Helpers
+def scan(chunks: list[bytes]) -> list:
+    scanner, elements = ArrayScanner(), []
+    for chunk in chunks:
+        elements += scanner.feed(chunk)
+
+    scanner.close()
+    return elements
+
+BODY = json.dumps([
+    -2500.0, 1e-07, 3.25e+20, -0.5, 0, 12, 8.125, -1.5E3, 100.0,
+    {"rating": 7.5, "name": "Café ☕", "tags": ["a", "b"], "nested": [1.0, -2e5]},
+    "plain string", True, False, None, [], {}, [[2.5], [3.75e-3]]
+], ensure_ascii = False).encode()
+
+# Tests
+def test_every_split_position() -> None:
+    expected = json.loads(BODY)
+    for index in range(len(BODY) + 1):
+        assert scan([BODY[:index], BODY[index:]]) == expected, f"split at byte {index}"
+
+def test_byte_at_a_time() -> None:
+    assert scan([BODY[index:index + 1] for index in range(len(BODY))]) == json.loads(BODY)
+
+@pytest.mark.parametrize("body", [b"[-2500.", b"[1e", b"[1.5E+", b"[-"])
+def test_unfinished_number_waits(body: bytes) -> None:
+    assert ArrayScanner().feed(body) == []
+
+def test_empty_and_whitespace() -> None:
+    assert scan([b" [ ", b" ] "]) == []
+
+def test_truncated_body() -> None:
+    scanner = ArrayScanner()
+    assert scanner.feed(b"[1, 2, 3") == [1, 2]
+    with pytest.raises(ValueError):
+        scanner.close()
+
+def test_malformed_body() -> None:
+    with pytest.raises(ValueError):
+        ArrayScanner().feed(b"[1 2]")
+
+# Over the network, with the body sent in pieces ending right after every "." and exponent marker
+def test_stream_array_split_numbers(serve: Serve) -> None:
+    values = [-2500.0 - index / 8 if index % 2 else index * 1e-7 for index in range(40)]
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers = {"Content-Type": "application/json"})
+        await response.prepare(request)
+        for piece in re.split(rb"(?<=[.eE])", json.dumps(values).encode()):
+            await response.write(piece)
+            await asyncio.sleep(0.001)
+
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/values", handle)
+    url = serve(app)
+
+    async def main() -> list[float]:
+        async with Client(url) as client:
+            return [value async for value in client.stream_array("/values")]
+
+    assert asyncio.run(main()) == values
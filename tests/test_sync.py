@@ -0,0 +1,84 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dmmd.sync import LoopThread, SyncCallable, SyncIterator, iCDN
+
+from tests.conftest import FILE_SIZE, ITEMS
+
+# Helpers
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+# Facade
+def test_blocking_calls(stand_in: str) -> None:
+    runner = LoopThread()
+    try:
+        with iCDN(stand_in, runner = runner) as cdn:
+            assert cdn.query(uuid(1)).uuid == uuid(1)
+            assert isinstance(cdn.list(5), SyncCallable) and len(cdn.list(5).fetch()) == 5
+            assert len([*cdn.list(7).walk()]) == ITEMS
+            assert [item.uuid for item in cdn.list(5).walk(query = True, limit = 3)] == cdn.list(5).fetch()[:3]
+
+            # Streams come back as plain iterators of their chunks
+            stream = cdn.stream(uuid(1))
+            assert isinstance(stream, SyncIterator)
+            assert b"".join(stream) == random.Random(0).randbytes(FILE_SIZE)
+
+        assert cdn.wrapped.client.pool._sessions == {}  # Released by leaving the block
+
+    finally:
+        runner.close()
+
+def test_threads_share_an_instance(stand_in: str) -> None:
+    runner = LoopThread()
+    try:
+        cdn, threads = iCDN(stand_in, runner = runner), set()
+
+        def query(index: int) -> str:
+            threads.add(threading.current_thread())
+            return cdn.query(uuid(index)).uuid
+
+        with ThreadPoolExecutor(4) as executor:
+            assert [*executor.map(query, range(ITEMS))] == [uuid(index) for index in range(ITEMS)]
+
+        assert len(threads) > 1
+
+    finally:
+        runner.close()
+
+def test_early_exit_closes_the_walk(stand_in: str) -> None:
+    runner = LoopThread()
+    try:
+        with iCDN(stand_in, runner = runner) as cdn, cdn.list(5).walk() as walk:
+            assert next(walk) == uuid(0)
+
+        with pytest.raises(StopAsyncIteration):
+            runner.run(anext(walk.iterator))  # type: ignore
+
+    finally:
+        runner.close()
+
+def test_loop_misuse(stand_in: str) -> None:
+    runner = LoopThread()
+    cdn = iCDN(stand_in, runner = runner)
+
+    # Blocking on the loop from inside it would deadlock
+    async def nested() -> None:
+        cdn.details()
+
+    with pytest.raises(RuntimeError, match = "inside its own event loop"):
+        runner.run(nested())
+
+    # Closing the loop closes what it was running, and later calls fail instead of hanging
+    runner.close()
+    assert runner.closed and cdn.wrapped.client.pool._sessions == {}
+    with pytest.raises(RuntimeError, match = "already been closed"):
+        cdn.details()
+
+    cdn.close()
@@ -0,0 +1,86 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import random
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from dmmd.icdn import iCDN
+from dmmd.icdn.upload import Progress
+
+from tests.conftest import Serve
+
+# Keeps what was uploaded, answering like the iCDN would
+class Receiver:
+    def __init__(self) -> None:
+        self.files: list[bytes] = []
+        self.fields: list[dict] = []
+        self.app = web.Application(client_max_size = 1024 ** 3)
+        self.app.router.add_post("/{route:add|update}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        received = b""
+        if request.content_type != "multipart/form-data":
+            self.fields.append(json.loads((await request.post())["json"]))  # type: ignore  # Forms without a file aren't multipart
+
+        else:
+            async for part in await request.multipart():
+                if part.name == "file":
+                    received = await part.read()  # type: ignore
+
+                else:
+                    self.fields.append(json.loads(await part.text()))  # type: ignore
+
+        self.files.append(received)
+        return web.json_response({
+            "data": {}, "mime": "application/octet-stream", "name": "upload", "size": len(received), "tags": [],
+            "time": 1_700_000_000_000, "uuid": "00000000-0000-4000-8000-000000000000"
+        })
+
+# Tests
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("size", [0, 1, 10_000, 65_536, 200_001])
+def test_upload_streams_file(serve: Serve, tmp_path: Path, use_mmap: bool, size: int) -> None:
+    receiver, path = Receiver(), tmp_path / "upload.bin"
+    path.write_bytes(body := random.Random(size).randbytes(size))
+    url, reports = serve(receiver.app), []
+
+    async def progress(report: Progress) -> None:
+        reports.append(report)
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            item = await cdn.add(path, "upload", tags = ["a"], chunk_size = 16_384, progress = progress, use_mmap = use_mmap)
+            assert item.size == size
+
+    asyncio.run(main())
+    assert receiver.files == [body]
+    assert receiver.fields[0]["name"] == "upload" and receiver.fields[0]["tags"] == ["a"]
+    assert [report.sent for report in reports] == [min(sent, size) for sent in range(16_384, size + 16_384, 16_384)]
+    assert all(report.total == size for report in reports)
+
+def test_update_with_file(serve: Serve, tmp_path: Path) -> None:
+    receiver, path = Receiver(), tmp_path / "upload.bin"
+    path.write_bytes(b"replacement")
+    url = serve(receiver.app)
+
+    async def main() -> None:
+        async with iCDN(url) as cdn:
+            await cdn.update("00000000-0000-4000-8000-000000000000", path, name = "renamed")
+            await cdn.update("00000000-0000-4000-8000-000000000000", tags = ["b"])
+
+    asyncio.run(main())
+    assert receiver.files == [b"replacement", b""]
+    assert receiver.fields == [
+        {"uuid": "00000000-0000-4000-8000-000000000000", "name": "renamed"},
+        {"uuid": "00000000-0000-4000-8000-000000000000", "tags": ["b"]}
+    ]
+
+def test_progress_rate() -> None:
+    report = Progress(sent = 50, total = 200, elapsed = 2.0)
+    assert report.rate == 25.0 and report.eta == 6.0
+    assert Progress(0, 10, 0.0).eta is None
@@ -0,0 +1,144 @@
+# Copyright (c) 2025 iiPython
+
+# Modules
+import json
+import typing
+import asyncio
+from pathlib import Path
+from datetime import datetime
+from contextlib import aclosing
+
+from aiohttp import web
+
+from benchmarks.server import build_app
+from dmmd.icdn import WatchCursor, WatchEvent, iCDN
+from dmmd.resilience import ResiliencePolicy
+
+from tests.conftest import FILE_SIZE, ITEMS, Serve
+
+# Helpers
+def uuid(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+# Runs a watcher in the background, collecting what it reports
+class Watcher:
+    def __init__(self, cdn: iCDN, checkpoint: Path, reconcile: typing.Optional[float] = 0.05) -> None:
+        self.cdn, self.checkpoint, self.reconcile = cdn, checkpoint, reconcile
+        self.events: list[WatchEvent] = []
+        self.task: asyncio.Task[None]
+
+    async def _run(self) -> None:
+        watcher = self.cdn.watch(
+            WatchCursor.load(self.checkpoint), interval = 0.01, min_interval = 0.01, max_interval = 0.05,
+            reconcile = self.reconcile, checkpoint = self.checkpoint
+        )
+        async with aclosing(watcher):
+            async for event in watcher:
+                self.events.append(event)
+
+    async def __aenter__(self) -> typing.Self:
+        self.task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions = True)
+
+    async def settle(self, count: int, quiet: float = 0.3) -> list[tuple[str, str]]:
+        for _ in range(200):
+            if len(self.events) >= count:
+                break
+
+            await asyncio.sleep(0.01)
+
+        await asyncio.sleep(quiet)  # Long enough for several polls and reconciles to report anything extra
+        return [(event.kind, event.uuid) for event in self.events]
+
+async def add(cdn: iCDN, directory: Path, name: str) -> str:
+    path = directory / f"{name}.txt"
+    path.write_text(name)
+    return (await cdn.add(path, name)).uuid
+
+# Tests
+def test_watch_reports_changes(stand_in: str, tmp_path: Path) -> None:
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn, Watcher(cdn, tmp_path / "cursor.json") as watcher:
+            assert await watcher.settle(0) == []  # Existing content isn't reported without a replay
+
+            added = await add(cdn, tmp_path, "new")
+            await cdn.remove(uuid(3))
+            assert sorted(await watcher.settle(2)) == sorted([("added", added), ("removed", uuid(3))])  # Polls and reconciles can report in either order
+
+    asyncio.run(main())
+
+def test_watch_restart_from_checkpoint(stand_in: str, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "cursor.json"
+
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn:
+            async with Watcher(cdn, checkpoint) as watcher:
+                await watcher.settle(0)
+                first = await add(cdn, tmp_path, "first")
+                assert await watcher.settle(1) == [("added", first)]
+
+            # Only the high-water mark is kept, not every UUID seen
+            state = json.loads(checkpoint.read_text())
+            assert state == {"time": state["time"], "boundary": [first]}
+
+            # Content added while stopped is reported on restart, and nothing else is
+            second = await add(cdn, tmp_path, "second")
+            async with Watcher(cdn, checkpoint) as watcher:
+                assert await watcher.settle(1) == [("added", second)]
+
+            assert json.loads(checkpoint.read_text())["boundary"] == [second]
+
+    asyncio.run(main())
+
+def test_watch_without_reconcile(stand_in: str, tmp_path: Path) -> None:
+    async def main() -> None:
+        async with iCDN(stand_in) as cdn, Watcher(cdn, tmp_path / "cursor.json", reconcile = None) as watcher:
+            await watcher.settle(0)
+            added = await add(cdn, tmp_path, "new")
+            await cdn.remove(uuid(ITEMS - 1))
+            assert await watcher.settle(1) == [("added", added)]  # Removals are only noticed by reconciling
+
+    asyncio.run(main())
+
+# A poll that fails partway through still saves the cursor as of the last event it reported
+def test_watch_error_mid_poll(serve: Serve, tmp_path: Path) -> None:
+    failing, checkpoint, start = False, tmp_path / "cursor.json", 1_700_000_000_000 + (ITEMS - 1) * 1000
+
+    @web.middleware
+    async def fail_later_pages(request: web.Request, handler) -> web.StreamResponse:
+        if failing and request.path == "/search" and int(request.query.get("page", 0)) > 0:
+            return web.Response(status = 500)
+
+        return await handler(request)
+
+    app = build_app(items = ITEMS, file_size = FILE_SIZE)
+    app.middlewares.append(fail_later_pages)
+    url = serve(app)
+
+    async def main() -> None:
+        nonlocal failing
+        async with iCDN(url, policy = ResiliencePolicy(attempts = 1)) as cdn:
+            added = []
+            for offset in range(1, 4):
+                path = tmp_path / f"{offset}.txt"
+                path.write_text(str(offset))
+                added.append((await cdn.add(path, path.name, time = datetime.fromtimestamp((start + offset * 1000) / 1000))).uuid)
+
+            # Only two items fit on the first page, the second page fails
+            failing = True
+            watcher = cdn.watch(
+                WatchCursor(start, {uuid(ITEMS - 1)}), interval = 0.01, min_interval = 0.01, max_interval = 0.05,
+                reconcile = None, count = 2, checkpoint = checkpoint
+            )
+            async with aclosing(watcher):
+                assert [(await anext(watcher)).uuid for _ in range(2)] == added[:2]
+
+                # The next poll picks up from there, so the third is still reported
+                assert (await asyncio.wait_for(anext(watcher), 1)).uuid == added[2]
+                assert json.loads(checkpoint.read_text()) == {"time": start + 2000, "boundary": [added[1]]}
+
+    asyncio.run(main())